@@ -0,0 +1,67 @@
+"""
+Builders of in-memory ODT documents and converter configurations shared by the tests.
+"""
+
+import io
+import zipfile
+from pathlib import Path
+from typing import Optional
+from xml.etree import ElementTree as ET
+
+from odt_to_html import NAMESPACES, OdtToHtmlConverterConfig
+
+
+DATA_DIR = Path(__file__).parent / 'test' / 'data'
+
+XMLNS = " ".join(f'xmlns:{prefix}="{uri}"' for prefix, uri in NAMESPACES.items())
+
+
+def make_config(**kwargs) -> OdtToHtmlConverterConfig:
+    return OdtToHtmlConverterConfig(
+        show_page_breaks=False,
+        title_from_metadata=True,
+        title_from_styled_title=True,
+        title_from_h1=True,
+        title_from_filename=False,
+        **kwargs,
+    )
+
+
+def make_odt(body: str, automatic_styles: str = "", styles: str = "", files: Optional[dict[str, bytes]] = None) -> bytes:
+    """Build a minimal in-memory ODT from body XML, style definitions and other zip members."""
+    content_xml = (
+        f'<office:document-content {XMLNS}>'
+        f'<office:automatic-styles>{automatic_styles}</office:automatic-styles>'
+        f'<office:body><office:text>{body}</office:text></office:body>'
+        f'</office:document-content>'
+    )
+    styles_xml = (
+        f'<office:document-styles {XMLNS}>'
+        f'<office:styles>{styles}</office:styles>'
+        f'</office:document-styles>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as odt:
+        odt.writestr('mimetype', 'application/vnd.oasis.opendocument.text')
+        odt.writestr('content.xml', content_xml)
+        odt.writestr('styles.xml', styles_xml)
+        for name, data in (files or {}).items():
+            odt.writestr(name, data)
+    return buffer.getvalue()
+
+
+CUSTOM_SHAPE_XML = (
+    '<draw:custom-shape draw:style-name="gr1" text:anchor-type="as-char" svg:width="2cm" svg:height="1cm">'
+    '<draw:enhanced-geometry svg:viewBox="0 0 21600 21600" draw:type="rectangle" '
+    'draw:enhanced-path="M 0 0 L 21600 0 21600 21600 0 21600 0 0 Z N"/>'
+    '</draw:custom-shape>'
+)
+
+
+def load_geometries(*names: str) -> list[ET.Element]:
+    geometries = []
+    for name in names:
+        with zipfile.ZipFile(DATA_DIR / name) as odt:
+            root = ET.fromstring(odt.read('content.xml'))
+        geometries.extend(root.iter(f"{{{NAMESPACES['draw']}}}enhanced-geometry"))
+    return geometries
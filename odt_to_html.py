@@ -7,7 +7,7 @@ All images and media are embedded as base64 data URIs for single-file portabilit
 
 positional arguments:
   input                 Path to the input ODT file
-  output                Path for the output HTML file
+  output                Path for the output HTML file, - for the standard output
 
 options:
   -h, --help            show this help message and exit
@@ -24,29 +24,84 @@ options:
                         Fallback title if no other title found
   --title-from-filename [TITLE_FROM_FILENAME]
                         Use filename as title if no other title found (default: False). Use --title-from-filename=1 to enable.
+  --css-inherit-elimination [CSS_INHERIT_ELIMINATION]
+                        Omit inline CSS declarations already inherited from the enclosing element (default: False).
+  --svg-symbols [SVG_SYMBOLS]
+                        Define shape geometry once as SVG symbols referenced by <use> (default: False).
+  --path-simplify-tolerance PATH_SIMPLIFY_TOLERANCE
+                        Simplify custom shape lines, dropping points closer than this in viewBox units (default: 0, disabled).
+  --parallel-pages-threshold PARALLEL_PAGES_THRESHOLD
+                        Render the pages of documents with at least this many pages in worker processes (default: 0, disabled).
+
+Batch mode (python odt_to_html.py batch --help):
+  inputs                ODT files, directories (searched recursively) or glob patterns
+  -o, --output-dir      Directory for the output HTML files, mirroring the input tree
+  -j, --jobs            Number of worker processes or threads (default: number of CPUs)
+  --executor            Convert on worker processes or threads (default: threads when the GIL is disabled)
+  --report              Write a JSON-lines report with the status, duration and output size of each file
+
+Serve mode (python odt_to_html.py serve --help):
+  --host, --port        Address to listen on (default: 127.0.0.1:8000)
+  -j, --jobs            Number of worker processes or threads kept warm (default: number of CPUs)
+  --queue-depth         Requests waiting for a worker before answering 503 (default: 2 per worker)
+  POST /convert         ODT document as the request body (optional ?title=...), HTML in the response
+  GET /health           Queue state and runtime metrics as JSON
+
+Daemon mode (python odt_to_html.py daemon --help), for odt_to_html_client.py:
+  --socket              Unix socket path (default: $ODT_TO_HTML_SOCKET or odt_to_html-<uid>.sock in $XDG_RUNTIME_DIR or the temp directory)
+  -j, --jobs            Number of worker processes or threads kept warm (default: number of CPUs)
 
 Examples:
     python odt_to_html.py document.odt output.html
     python odt_to_html.py document.odt output.html --no-page-breaks
     python odt_to_html.py "path/to/input document.odt" "path/to/output.html"
+    python odt_to_html.py batch docs/ -o html/ --jobs 8 --report report.jsonl
+    python odt_to_html.py serve --port 8000 --jobs 4
+    python odt_to_html.py daemon & python odt_to_html_client.py document.odt output.html
 """
 
 import argparse
+import asyncio
 import base64
+import concurrent.futures
+import contextlib
+import contextvars
+import functools
+import glob
+import hashlib
+import http.server
+import itertools
+import json
 import mimetypes
 import math
+import os
 import re
+import signal
+import socket
+import socketserver
 import sys
 import string
+import threading
+import time
+import urllib.parse
 import zipfile
 from html import escape
 from pathlib import Path
 from xml.etree import ElementTree as ET
 import traceback
-from typing import Callable, Optional, Union, IO
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Hashable, Iterable, Iterator, NamedTuple, Optional, Union, IO
 from io import BytesIO
 from pathlib import Path
 
+from odt_to_html_client import DAEMON_FRAME_HEADER, default_socket_path
+
+try:
+    import numpy
+except ImportError: # optional, vectorizes the layout of paragraphs with many anchored boxes
+    numpy = None
+
 
 StrPath = Union[str, Path]
 SeekableIO = IO[bytes]
@@ -66,7 +121,22 @@ def str_to_bool(s: str):
 
 # For processing paragraph anchored objects
 
-class Length:
+class Length(float):
+    """An immutable length, backed by a float in meters.
+
+    The unit a length was written with is only kept to print it (and the results of its
+    arithmetic, in the unit of the left operand): every unit has its own Length subclass,
+    so creating a length is a single float allocation. Lengths compare and hash by their
+    value in meters.
+
+    Every operator giving a length returns one of the unit of the left operand; the others,
+    and adding or subtracting a plain number, raise TypeError. A length is never equal to a
+    plain number, and orders against one by its value in its own unit (Length(5, 'cm') < 6).
+    Only float(), math functions and the float attributes (like ``real``) give plain
+    floats, in meters.
+    """
+    __slots__ = ()
+
     # conversion factors to meter
     _UNIT_TO_M = {
         "mm": 0.001,
@@ -80,108 +150,289 @@ class Length:
         "pt": 0.0254 / 72,      # 1 pt = 1/72 inch
         "pc": 12 * (0.0254 / 72) # 1 pica = 12 pt
     }
+    # Per unit subclasses, filled below
+    _TYPES: dict[str, type] = {}
+    unit = "m"
+    _factor = 1.0
 
     @staticmethod
     def from_str(text) -> 'Length':
         """
-        Extracts the first number (integer or float) and its unit from a string.
-        
-        Returns a tuple (number_as_float, unit_string) or (None, None) if no match.
+        Parse a number followed by an optional unit, like '0.5cm', into a Length.
+
+        Raises ValueError if the text doesn't start with a number or the unit is unsupported.
         """
-        # Regex pattern explanation:
-        # (?P<number>[-+]*\\d*\\.?\\d+) : Captures the number part (float or int) into a group named 'number'.
-        # \\s?                      : Matches an optional space.
-        # (?P<unit>[a-zA-Z]+)       : Captures the unit part (letters only) into a group named 'unit'.
-        pattern = re.compile(r'(?P<number>[-+]*\d*\.?\d+)\s*(?P<unit>[a-zA-Z]*)')
-        match = pattern.match(text.strip())
-        if match:
-            # Access the named groups
-            number_str = match.group('number')
-            unit_str = match.group('unit')
-            # Convert the number string to a float
-            return Length(float(number_str), unit_str)
-        else:
+        length = parse_odf_length(text)
+        if length is None:
             raise ValueError(f'Cannot parse {repr(text)} to Length.')
+        return Length(length.value, length.unit)
 
-    def __init__(self, value, unit="m"):
-        if unit not in self._UNIT_TO_M:
+    def __new__(cls, value, unit="m"):
+        length_type = Length._TYPES.get(unit)
+        if length_type is None:
             raise ValueError(f"Unsupported unit: {unit}")
-        self.value = float(value)
-        self.unit = unit
-        self._meters = self.value * self._UNIT_TO_M[unit]
+        return float.__new__(length_type, float(value) * length_type._factor)
+
+    def __reduce__(self):
+        return (Length, (self.value, self.unit))
+
+    @property
+    def value(self) -> float:
+        return float(self) / self._factor
 
     # Representations
     def __repr__(self):
         return f"Length({self.value}, '{self.unit}')"
 
     def __str__(self):
-        return f"{self.value} {self.unit}"
+        return f'{float(self) / self._factor:.6g}{self.unit}'
+
+    def __format__(self, format_spec):
+        return format(str(self), format_spec)
 
     # Arithmetic operations
     def __add__(self, other):
         if not isinstance(other, Length):
-            return NotImplemented
-        return Length(self.value + other.to(self.unit), self.unit)
+            return self._unsupported(other)
+        return _new_float(type(self), float.__add__(self, other))
 
     def __sub__(self, other):
         if not isinstance(other, Length):
-            return NotImplemented
-        return Length(self.value - other.to(self.unit), self.unit)
+            return self._unsupported(other)
+        return _new_float(type(self), float.__sub__(self, other))
 
     def __mul__(self, factor):
-        if not isinstance(factor, (int, float)):
+        if isinstance(factor, Length) or not isinstance(factor, (int, float)):
             return NotImplemented
-        return Length(self.value * factor, self.unit)
+        return _new_float(type(self), float.__mul__(self, factor))
 
     def __rmul__(self, factor):
         return self.__mul__(factor)
 
     def __truediv__(self, factor):
-        if not isinstance(factor, (int, float)):
+        if isinstance(factor, Length) or not isinstance(factor, (int, float)):
             return NotImplemented
-        return Length(self.value / factor, self.unit)
+        return _new_float(type(self), float.__truediv__(self, factor))
 
-    # Negation
-    def __neg__(self):
-        return Length(-self.value , self.unit)
+    def _unsupported(self, other, *args):
+        # Raise instead of returning NotImplemented: float would take over and drop the unit
+        raise TypeError(f"unsupported operand types for Length: '{type(self).__name__}' and '{type(other).__name__}'")
 
-    def __abs__(self):
-        return Length(abs(self.value), self.unit)
+    __radd__ = __rsub__ = __rtruediv__ = __floordiv__ = __rfloordiv__ = __mod__ = __rmod__ = _unsupported
+    __pow__ = __rpow__ = __divmod__ = __rdivmod__ = _unsupported
 
     # Comparison
     def __eq__(self, other):
-        if not isinstance(other, Length):
-            return NotImplemented
-        return self._meters == other._meters
+        return isinstance(other, Length) and float.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
 
     def __lt__(self, other):
         if isinstance(other, Length):
-            return self._meters < other._meters
-        elif isinstance(other,(int,float)):
-            return self.value < other
-        else:
-            return NotImplemented
+            return float.__lt__(self, other)
+        if isinstance(other, (int, float)):
+            return float(self) / self._factor < other
+        return NotImplemented
 
     def __le__(self, other):
-        return self == other or self < other
+        if isinstance(other, Length):
+            return float.__le__(self, other)
+        if isinstance(other, (int, float)):
+            return float(self) / self._factor <= other
+        return NotImplemented
 
     def __gt__(self, other):
-        return not self <= other
+        if isinstance(other, Length):
+            return float.__gt__(self, other)
+        if isinstance(other, (int, float)):
+            return float(self) / self._factor > other
+        return NotImplemented
 
     def __ge__(self, other):
-        return not self < other
+        if isinstance(other, Length):
+            return float.__ge__(self, other)
+        if isinstance(other, (int, float)):
+            return float(self) / self._factor >= other
+        return NotImplemented
+
+    __hash__ = float.__hash__
+
+    # Negation
+    def __neg__(self):
+        return _new_float(type(self), -float(self))
+
+    def __pos__(self):
+        return self
+
+    def __round__(self, ndigits=None):
+        """Round in the unit of the length, e.g. round(Length(1.26, 'cm'), 1) is 1.3cm."""
+        return _new_float(type(self), round(float(self) / self._factor, ndigits) * self._factor)
 
-    # Hash (so it can be used in sets or as dict keys)
-    def __hash__(self):
-        return hash(self._meters)
+    def __abs__(self):
+        return _new_float(type(self), abs(float(self)))
 
     # Convert to different unit
     def to(self, unit):
-        if unit not in self._UNIT_TO_M:
+        factor = self._UNIT_TO_M.get(unit)
+        if factor is None:
             raise ValueError(f"Unsupported unit: {unit}")
-        return self._meters / self._UNIT_TO_M[unit]
-    def __str__(self):
-        return f'{self.value:.6g}{self.unit}'
+        return float(self) / factor
+
+
+_new_float = float.__new__
+for _unit, _factor in Length._UNIT_TO_M.items():
+    Length._TYPES[_unit] = type('Length', (Length,), {'__slots__': (), 'unit': _unit, '_factor': _factor})
+del _unit, _factor
+
+
+# For parsing ODF length attributes (svg:x, svg:width, ...)
+#
+# Every length string is parsed once into its signed value, unit and conversions;
+# the same strings repeat across frames and documents, so parses are memoized.
+
+_ODF_LENGTH_PATTERN = re.compile(r'\s*(?P<sign>[-+]*)(?P<number>\d*\.?\d+)\s*(?P<unit>[a-zA-Z]*)\s*')
+
+# conversion factors to CSS pixel, as used for SVG sizes
+_UNIT_TO_PX = {
+    "cm": 37.795275591, # 1cm = 37.8px
+    "mm": 3.7795275591, # 1mm = 3.78px
+    "in": 96,           # 1in = 96px
+    "pt": 1.333,        # 1pt = 1.33px
+    "px": 1,
+    "": 1,
+}
+
+
+class OdfLength(NamedTuple):
+    """A parsed ODF length, like '-0.5cm'."""
+    value: float                # signed number, in unit
+    unit: str
+    magnitude: str              # unsigned number and unit, as written (e.g. '0.5cm')
+    meters: Optional[float]     # None for units without a physical size
+    px: Optional[float]         # None for units without a pixel conversion
+
+    @property
+    def negative(self) -> bool:
+        return math.copysign(1.0, self.value) < 0
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_odf_length(text: str) -> Optional[OdfLength]:
+    """Parse an ODF length string, or return None if it isn't a number followed by a unit."""
+    match = _ODF_LENGTH_PATTERN.fullmatch(text)
+    if match is None:
+        return None
+    sign, number, unit = match.group('sign', 'number', 'unit')
+    value = float(number)
+    # the sign is negative for an odd count of minus signs
+    if sign.count('-') % 2 == 1:
+        value = -value
+    meter_factor = Length._UNIT_TO_M.get(unit)
+    px_factor = _UNIT_TO_PX.get(unit)
+    return OdfLength(
+        value, unit, number + unit,
+        value * meter_factor if meter_factor is not None else None,
+        value * px_factor if px_factor is not None else None,
+    )
+
+
+# For parsing draw:transform attributes
+#
+# A transform is a sequence of rotate, translate, scale, skewX, skewY and matrix
+# operations, applied from left to right. Angles are in radians, counter-clockwise
+# (so negated for CSS), and translations are lengths. The sequence is folded into
+# one affine matrix, emitted as a single CSS matrix(); transforms are memoized since
+# the same strings repeat across shapes.
+
+_ODF_TRANSFORM_PATTERN = re.compile(r'\s*([a-zA-Z]+)\s*\(([^()]*)\)\s*,?')
+_ODF_TRANSFORM_ARGUMENT_COUNTS = {
+    'rotate': (1,),
+    'translate': (1, 2),
+    'scale': (1, 2),
+    'skewX': (1,),
+    'skewY': (1,),
+    'matrix': (6,),
+}
+_IDENTITY_MATRIX = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+class OdfTransform(NamedTuple):
+    """A parsed draw:transform, like 'rotate (0.5) translate (1cm 2cm)'."""
+    matrix: tuple[float, float, float, float, float, float]  # CSS matrix(a, b, c, d, e, f), translation in px
+    css: str                    # the CSS transform value, 'none' for the identity
+    translated: bool            # True if the transform has a translate or a matrix operation
+
+    @property
+    def identity(self) -> bool:
+        return self.matrix == _IDENTITY_MATRIX
+
+
+def _transform_px(text: str) -> float:
+    length = parse_odf_length(text)
+    if length is None or length.px is None:
+        raise ValueError(f"invalid transform length: {text!r}")
+    return length.px
+
+
+def _multiply_matrices(left: tuple, right: tuple) -> tuple:
+    """Return the matrix applying right, then left."""
+    la, lb, lc, ld, le, lf = left
+    ra, rb, rc, rd, re_, rf = right
+    return (
+        la * ra + lc * rb, lb * ra + ld * rb,
+        la * rc + lc * rd, lb * rc + ld * rd,
+        la * re_ + lc * rf + le, lb * re_ + ld * rf + lf,
+    )
+
+
+def _format_matrix_value(val: float) -> str:
+    text = f"{val:.6g}"
+    return "0" if text == "-0" else text
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_odf_transform(text: str) -> Optional[OdfTransform]:
+    """Parse a draw:transform string, or return None if it doesn't follow the grammar."""
+    matrix = _IDENTITY_MATRIX
+    translated = False
+    end = 0
+    try:
+        for match in _ODF_TRANSFORM_PATTERN.finditer(text):
+            if match.start() != end:
+                return None
+            end = match.end()
+            name = match.group(1)
+            args = match.group(2).replace(',', ' ').split()
+            if len(args) not in _ODF_TRANSFORM_ARGUMENT_COUNTS.get(name, ()):
+                return None
+            if name == 'rotate':
+                angle = -float(args[0])
+                cos, sin = math.cos(angle), math.sin(angle)
+                operation = (cos, sin, -sin, cos, 0.0, 0.0)
+            elif name == 'translate':
+                translated = True
+                operation = (1.0, 0.0, 0.0, 1.0, _transform_px(args[0]), _transform_px(args[1]) if len(args) > 1 else 0.0)
+            elif name == 'scale':
+                sx = float(args[0])
+                operation = (sx, 0.0, 0.0, float(args[1]) if len(args) > 1 else sx, 0.0, 0.0)
+            elif name == 'skewX':
+                operation = (1.0, 0.0, math.tan(-float(args[0])), 1.0, 0.0, 0.0)
+            elif name == 'skewY':
+                operation = (1.0, math.tan(-float(args[0])), 0.0, 1.0, 0.0, 0.0)
+            else:
+                translated = True
+                operation = (*map(float, args[:4]), _transform_px(args[4]), _transform_px(args[5]))
+            matrix = _multiply_matrices(operation, matrix)
+    except ValueError:
+        return None
+    if end != len(text) or not end:
+        return None
+    if matrix == _IDENTITY_MATRIX:
+        css = 'none'
+    else:
+        css = f"matrix({', '.join(map(_format_matrix_value, matrix))})"
+    return OdfTransform(matrix, css, translated)
 
 def merge_intervals(intervals):
     '''
@@ -197,7 +448,7 @@ def merge_intervals(intervals):
     if not intervals:
         return [],[]
     # sort by starting position
-    intervals.sort(key=lambda x: x[0])
+    intervals.sort(key=lambda x: float(x[0]))
     merged = [intervals[0]]
     indices_group = [[0]]
     for i,current in enumerate(intervals[1:],1):
@@ -222,7 +473,7 @@ def skyline_paths(boxes):
         events.append((x, 1, y, y + h))
         events.append((x + w, -1, y, y + h))
 
-    events.sort(key=lambda e: (e[0], -e[1]))
+    events.sort(key=lambda e: (float(e[0]), -e[1]))
 
     bottoms, tops = [], []
     bcount, tcount = Counter(), Counter()
@@ -236,8 +487,9 @@ def skyline_paths(boxes):
     prev_top = None
     prev_bot = None
 
-    def clean(heap, counter):
-        while heap and counter[abs(heap[0][0])] == 0:
+    def clean(heap, counter, negated=False):
+        # drop stale entries; the tops heap holds negated values
+        while heap and counter[-heap[0][0] if negated else heap[0][0]] == 0:
             heapq.heappop(heap)
 
     for x, typ, yb, yt in events:
@@ -264,7 +516,7 @@ def skyline_paths(boxes):
             if tcount[yt] == 0: del tcount[yt]
 
         clean(bottoms, bcount)
-        clean(tops, tcount)
+        clean(tops, tcount, negated=True)
 
         curr_top = -tops[0][0] if tops else None
         curr_bot = bottoms[0][0] if bottoms else None
@@ -298,6 +550,586 @@ def skyline_paths(boxes):
 
     return upper_paths, lower_paths
 
+# Optional NumPy backend of merge_intervals and skyline_paths, for paragraphs with many
+# anchored boxes. Box coordinates are held as float arrays (lengths by their value in
+# meters) and swept with vectorized operations; the results are the same intervals,
+# groups and polygon points (equal in value) as the pure Python functions.
+
+# Below this box count the pure Python functions are faster
+_NUMPY_MIN_BOXES = 100
+
+
+def merge_intervals_numpy(intervals):
+    '''
+    Vectorized merge_intervals, for intervals of non-negative length.
+    Falls back to merge_intervals otherwise.
+    '''
+    if not intervals:
+        return [],[]
+    starts = numpy.array([float(start) for start, end in intervals])
+    ends = numpy.array([float(end) for start, end in intervals])
+    if (ends < starts).any():
+        return merge_intervals(intervals)
+    # sort by starting position, in place like merge_intervals
+    order = numpy.argsort(starts, kind='stable')
+    intervals[:] = [intervals[i] for i in order.tolist()]
+    starts = starts[order]
+    ends = ends[order]
+    count = len(intervals)
+    # with non-negative lengths, the running maximum of the ends is the end of the current group
+    previous_end = numpy.maximum.accumulate(ends)[:-1]
+    # a group starts where an interval neither overlaps nor touches the previous ones
+    group_start = numpy.ones(count, dtype=bool)
+    group_start[1:] = starts[1:] > previous_end
+    # index of the interval holding the group's end (the first maximal one, like max())
+    new_end = group_start.copy()
+    new_end[1:] |= ends[1:] > previous_end
+    end_holder = numpy.maximum.accumulate(numpy.where(new_end, numpy.arange(count), 0)).tolist()
+    first = numpy.flatnonzero(group_start).tolist()
+    last = first[1:] + [count]
+    merged = [(intervals[a][0], intervals[end_holder[b - 1]][1]) for a, b in zip(first, last)]
+    indices_group = [list(range(a, b)) for a, b in zip(first, last)]
+    return merged, indices_group
+
+
+def _numpy_covering_max(lo, hi, values, size):
+    '''
+    For every position p in range(size), the maximum of values[i] over the ranges
+    lo[i] <= p < hi[i] covering it, or -1, using a segment tree updated level by level.
+    '''
+    leaves = 1
+    while leaves < size:
+        leaves *= 2
+    tree = numpy.full(2 * leaves, -1, dtype=numpy.int64)
+    lo = lo + leaves
+    hi = hi + leaves
+    while lo.size:
+        odd = (lo & 1).astype(bool)
+        numpy.maximum.at(tree, lo[odd], values[odd])
+        lo[odd] += 1
+        odd = (hi & 1).astype(bool)
+        hi[odd] -= 1
+        numpy.maximum.at(tree, hi[odd], values[odd])
+        lo >>= 1
+        hi >>= 1
+        keep = lo < hi
+        lo, hi, values = lo[keep], hi[keep], values[keep]
+    # a position is covered by the ranges stored at its leaf and all of its ancestors
+    nodes = numpy.arange(size) + leaves
+    result = tree[nodes]
+    while leaves > 1:
+        nodes >>= 1
+        leaves >>= 1
+        numpy.maximum(result, tree[nodes], out=result)
+    return result
+
+
+def _numpy_skyline_path(event_count, event_x, x_objects, active, level, level_box, level_objects, path_starts):
+    '''
+    Build the paths of one skyline, given the level (value in meters, nan when no box
+    is active) after every event, the box holding it and the level objects of the boxes.
+    '''
+    events = numpy.arange(event_count)
+    active_before = numpy.zeros(event_count, dtype=bool)
+    active_before[1:] = active[:-1]
+    level_before = numpy.full(event_count, numpy.nan)
+    level_before[1:] = level[:-1]
+    moved = numpy.zeros(event_count, dtype=bool)
+    moved[1:] = event_x[1:] != event_x[:-1]
+    # the path, counted from 0, each event belongs to before and after it is applied
+    path_after = numpy.cumsum(path_starts) - 1
+    path_before = path_after - path_starts
+
+    # candidate points: (order key, path, x event, level event)
+    horizontal = numpy.flatnonzero(moved & active_before)
+    started = numpy.flatnonzero(path_starts)
+    changed = numpy.flatnonzero(active & (level != level_before))
+    keys = numpy.concatenate((horizontal * 4, horizontal * 4 + 1, started * 4 + 2, changed * 4 + 3))
+    paths = numpy.concatenate((path_before[horizontal], path_before[horizontal], path_after[started], path_after[changed]))
+    xs = numpy.concatenate((horizontal - 1, horizontal, started, changed))
+    levels = numpy.concatenate((horizontal - 1, horizontal - 1, started, changed))
+    order = numpy.argsort(keys, kind='stable')
+    paths, xs, levels = paths[order], xs[order], levels[order]
+    # points equal to the previous point of the same path are skipped
+    keep = numpy.ones(len(order), dtype=bool)
+    keep[1:] = (paths[1:] != paths[:-1]) | (event_x[xs[1:]] != event_x[xs[:-1]]) | (level[levels[1:]] != level[levels[:-1]])
+    paths, xs, levels = paths[keep], xs[keep], levels[keep]
+
+    points = list(zip(map(x_objects.__getitem__, xs.tolist()), map(level_objects.__getitem__, level_box[levels].tolist())))
+    bounds = numpy.flatnonzero(paths[1:] != paths[:-1]) + 1
+    bounds = [0] + bounds.tolist() + [len(points)]
+    return [points[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+def skyline_paths_numpy(boxes):
+    '''
+    Vectorized skyline_paths, for boxes of non-negative size.
+    Falls back to skyline_paths otherwise.
+    '''
+    count = len(boxes)
+    if not count:
+        return [], []
+    coordinates = numpy.array([[float(value) for value in box] for box in boxes]).reshape(count, 4)
+    x, y, w, h = coordinates.T
+    if (w < 0).any() or (h < 0).any():
+        return skyline_paths(boxes)
+
+    # events: start and end of every box, starts first at the same x, in box order otherwise
+    event_x = numpy.empty(2 * count)
+    event_x[0::2] = x
+    event_x[1::2] = x + w
+    event_type = numpy.tile(numpy.array([1, -1]), count)
+    order = numpy.lexsort((-event_type, event_x))
+    event_x = event_x[order]
+    position = numpy.empty(2 * count, dtype=numpy.int64)
+    position[order] = numpy.arange(2 * count)
+    start_position, end_position = position[0::2], position[1::2]
+    starts = [box[0] for box in boxes]
+    ends = [box[0] + box[2] for box in boxes]
+    x_objects = [ends[i >> 1] if i & 1 else starts[i >> 1] for i in order.tolist()]
+
+    # highest top and lowest bottom of the boxes active after every event, as box ranks
+    top_order = numpy.argsort(y + h, kind='stable')
+    top_rank = numpy.empty(count, dtype=numpy.int64)
+    top_rank[top_order] = numpy.arange(count)
+    bottom_order = numpy.argsort(-y, kind='stable')
+    bottom_rank = numpy.empty(count, dtype=numpy.int64)
+    bottom_rank[bottom_order] = numpy.arange(count)
+    top = _numpy_covering_max(start_position, end_position, top_rank, 2 * count)
+    bottom = _numpy_covering_max(start_position, end_position, bottom_rank, 2 * count)
+    active = top >= 0
+    top_box = top_order[top]
+    bottom_box = bottom_order[bottom]
+    top_level = numpy.where(active, (y + h)[top_box], numpy.nan)
+    bottom_level = numpy.where(active, y[bottom_box], numpy.nan)
+
+    path_starts = active.copy()
+    path_starts[1:] &= ~active[:-1]
+    path_starts = path_starts.astype(numpy.int64)
+
+    top_objects = [box[1] + box[3] for box in boxes]
+    bottom_objects = [box[1] for box in boxes]
+    upper_paths = _numpy_skyline_path(2 * count, event_x, x_objects, active, top_level, top_box, top_objects, path_starts)
+    lower_paths = _numpy_skyline_path(2 * count, event_x, x_objects, active, bottom_level, bottom_box, bottom_objects, path_starts)
+    return upper_paths, lower_paths
+
+
+# For solving enhanced geometry equations of custom shapes
+#
+# Formulas (draw:formula) are parsed once into a small AST, cached by formula text.
+# The equation list of a geometry is then linked into closures reading and writing
+# a flat slot array, cached by the equation list, so solving a shape is a single
+# linear pass without eval.
+
+_FORMULA_TOKEN_PATTERN = re.compile(r'\s*(?:(\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)|\$(\d+)|\?([A-Za-z0-9]+)|([A-Za-z_][A-Za-z0-9_]*)|(.))')
+
+_FORMULA_FUNCTIONS = {
+    'abs': abs,
+    'sqrt': math.sqrt,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+    'atan': math.atan,
+    'atan2': math.atan2,
+    'min': min,
+    'max': max,
+    'if': lambda c, t, f: t if c else f,
+}
+
+# Named constants, occupying the first slots of the slot array
+_FORMULA_CONSTANTS = ('pi', 'left', 'top', 'right', 'bottom', 'width', 'height', 'logwidth', 'logheight')
+
+
+class FormulaError(ValueError):
+    pass
+
+
+class _FormulaParser:
+    """Recursive descent parser for enhanced geometry formulas.
+
+    Produces nested tuples: ('num', value), ('mod', index), ('ref', name), ('name', identifier),
+    ('neg', node), ('bin', op, left, right), ('call', function, args).
+    """
+    def __init__(self, text: str):
+        self.tokens = []
+        for number, modifier, reference, identifier, symbol in _FORMULA_TOKEN_PATTERN.findall(text):
+            if number: self.tokens.append(('num', float(number)))
+            elif modifier: self.tokens.append(('mod', int(modifier)))
+            elif reference: self.tokens.append(('ref', reference))
+            elif identifier: self.tokens.append(('name', identifier))
+            elif symbol.strip(): self.tokens.append(('op', symbol))
+        self.pos = 0
+
+    def parse(self) -> tuple:
+        node = self.expression()
+        if self.pos != len(self.tokens):
+            raise FormulaError(f'Unexpected token {self.tokens[self.pos][1]!r}')
+        return node
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def expect(self, symbol):
+        if self.peek() != ('op', symbol):
+            raise FormulaError(f'Expected {symbol!r}')
+        self.pos += 1
+
+    def expression(self):
+        node = self.term()
+        while self.peek() in (('op', '+'), ('op', '-')):
+            op = self.tokens[self.pos][1]
+            self.pos += 1
+            node = ('bin', op, node, self.term())
+        return node
+
+    def term(self):
+        node = self.unary()
+        while self.peek() in (('op', '*'), ('op', '/')):
+            op = self.tokens[self.pos][1]
+            self.pos += 1
+            node = ('bin', op, node, self.unary())
+        return node
+
+    def unary(self):
+        kind, value = self.peek()
+        if kind == 'op' and value in '+-':
+            self.pos += 1
+            operand = self.unary()
+            return ('neg', operand) if value == '-' else operand
+        return self.primary()
+
+    def primary(self):
+        kind, value = self.peek()
+        self.pos += 1
+        if kind in ('num', 'mod', 'ref'):
+            return (kind, value)
+        if kind == 'name':
+            if self.peek() == ('op', '('):
+                self.pos += 1
+                args = [self.expression()]
+                while self.peek() == ('op', ','):
+                    self.pos += 1
+                    args.append(self.expression())
+                self.expect(')')
+                return ('call', value, tuple(args))
+            return ('name', value)
+        if (kind, value) == ('op', '('):
+            node = self.expression()
+            self.expect(')')
+            return node
+        raise FormulaError(f'Unexpected token {value!r}')
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_formula(text: str) -> tuple:
+    """Parse an enhanced geometry formula into an AST (cached by formula text)."""
+    return _FormulaParser(text).parse()
+
+
+def _compile_formula_node(node: tuple, slot_of: dict[str, int]) -> Callable[[list, list], float]:
+    """Compile a formula AST into a closure ``f(slots, modifiers)``.
+
+    ``slot_of`` maps identifiers and ``?name`` references visible to this formula to slot indices.
+    """
+    kind = node[0]
+    if kind == 'num':
+        value = node[1]
+        return lambda s, m: value
+    if kind == 'mod':
+        index = node[1]
+        return lambda s, m: m[index]
+    if kind in ('ref', 'name'):
+        key = node[1] if kind == 'name' else '?' + node[1]
+        if key not in slot_of:
+            raise FormulaError(f'Unknown identifier {node[1]!r}')
+        index = slot_of[key]
+        return lambda s, m: s[index]
+    if kind == 'neg':
+        operand = _compile_formula_node(node[1], slot_of)
+        return lambda s, m: -operand(s, m)
+    if kind == 'bin':
+        op = node[1]
+        a = _compile_formula_node(node[2], slot_of)
+        b = _compile_formula_node(node[3], slot_of)
+        if op == '+': return lambda s, m: a(s, m) + b(s, m)
+        if op == '-': return lambda s, m: a(s, m) - b(s, m)
+        if op == '*': return lambda s, m: a(s, m) * b(s, m)
+        return lambda s, m: a(s, m) / b(s, m)
+    if kind == 'call':
+        func = _FORMULA_FUNCTIONS.get(node[1])
+        if func is None:
+            raise FormulaError(f'Unknown function {node[1]!r}')
+        args = tuple(_compile_formula_node(arg, slot_of) for arg in node[2])
+        if len(args) == 1:
+            (a,) = args
+            return lambda s, m: func(a(s, m))
+        return lambda s, m: func(*(arg(s, m) for arg in args))
+    raise FormulaError(f'Unknown node {kind!r}')
+
+
+def _failing_formula(s, m):
+    raise FormulaError('Invalid formula')
+
+
+class CompiledEquations:
+    """The linked equations of an enhanced geometry, solved in a single pass over a slot array.
+
+    Slots hold the named constants (_FORMULA_CONSTANTS) followed by one slot per equation.
+    A ``?name`` reference is bound to the latest equation of that name defined before it;
+    invalid formulas, unknown identifiers, forward references and evaluation errors yield 0.0.
+    """
+    __slots__ = ('names', 'functions')
+
+    def __init__(self, equations: tuple[tuple[str, str], ...]):
+        slot_of = {name: index for index, name in enumerate(_FORMULA_CONSTANTS)}
+        self.names = tuple(name for name, formula in equations)
+        functions = []
+        for index, (name, formula) in enumerate(equations):
+            try:
+                functions.append(_compile_formula_node(parse_formula(formula), slot_of))
+            except (FormulaError, RecursionError):
+                functions.append(_failing_formula)
+            slot_of['?' + name] = len(_FORMULA_CONSTANTS) + index
+        self.functions = tuple(functions)
+
+    def solve(self, constants: list[float], modifiers: list[float]) -> list[float]:
+        """Return the equation values, given the constant values (in _FORMULA_CONSTANTS order)."""
+        slots = list(constants)
+        append = slots.append
+        for function in self.functions:
+            try:
+                append(float(function(slots, modifiers)))
+            except Exception:
+                append(0.0)
+        return slots[len(_FORMULA_CONSTANTS):]
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_equations(equations: tuple[tuple[str, str], ...]) -> CompiledEquations:
+    """Link the (name, formula) equations of a geometry (cached by the equation list)."""
+    return CompiledEquations(equations)
+
+
+def _format_coordinate(val: float) -> str:
+    """Format an SVG path coordinate with at most two decimals and no trailing zeros."""
+    text = f"{val:.2f}"
+    if text[-1] != '0':
+        return text
+    if text[-2] == '0':
+        return text[:-3]
+    return text[:-1]
+
+
+# Splits an enhanced path into [leading coordinates, command, coordinates, command, ...]
+_PATH_COMMAND_PATTERN = re.compile(r'(?<!\S)([^\W\d_]+)(?!\S)')
+
+
+# Spans of points longer than this are scanned with NumPy, when available
+_NUMPY_MIN_SIMPLIFY_SPAN = 64
+
+
+def simplify_polyline(xs: list[float], ys: list[float], tolerance: float) -> list[int]:
+    """Return the indices of the points kept by Ramer-Douglas-Peucker simplification.
+
+    Points closer than ``tolerance`` to the segment between the kept points around
+    them are dropped; the first and last points are always kept.
+    """
+    count = len(xs)
+    if count < 3:
+        return list(range(count))
+    keep = [False] * count
+    keep[0] = keep[-1] = True
+    tolerance_sq = tolerance * tolerance
+    x_array = y_array = None
+    if numpy is not None and count > _NUMPY_MIN_SIMPLIFY_SPAN:
+        x_array = numpy.array(xs, dtype=float)
+        y_array = numpy.array(ys, dtype=float)
+    # Explicit stack, freeform paths can have far too many points for recursion
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        x0, y0 = xs[first], ys[first]
+        dx, dy = xs[last] - x0, ys[last] - y0
+        length_sq = dx * dx + dy * dy
+        farthest, farthest_sq = 0, tolerance_sq
+        # Squared distance to the segment, or to its start when it is a single point
+        if x_array is not None and last - first > _NUMPY_MIN_SIMPLIFY_SPAN:
+            px = x_array[first + 1:last] - x0
+            py = y_array[first + 1:last] - y0
+            if length_sq:
+                t = (px * dx + py * dy) / length_sq
+                numpy.clip(t, 0.0, 1.0, out=t)
+                px -= t * dx
+                py -= t * dy
+            distances_sq = px * px + py * py
+            i = int(distances_sq.argmax())
+            if distances_sq[i] > tolerance_sq:
+                farthest = first + 1 + i
+        else:
+            for i in range(first + 1, last):
+                px, py = xs[i] - x0, ys[i] - y0
+                if length_sq:
+                    t = (px * dx + py * dy) / length_sq
+                    t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+                    px -= t * dx
+                    py -= t * dy
+                distance_sq = px * px + py * py
+                if distance_sq > farthest_sq:
+                    farthest, farthest_sq = i, distance_sq
+        if farthest:
+            keep[farthest] = True
+            if farthest - first > 1:
+                stack.append((first, farthest))
+            if last - farthest > 1:
+                stack.append((farthest, last))
+    return [i for i in range(count) if keep[i]]
+
+
+class PresetShape:
+    """A built-in custom shape preset with precomputed, parameterized SVG path data.
+
+    ``build(modifiers)`` returns the same ``(d, fill, stroke)`` subpaths the generic
+    equation solver and _convert_path produce for ``enhanced_path`` and ``equations``
+    in the default 0 0 21600 21600 viewBox. Presets whose path uses no equation have
+    ``equations`` None.
+    """
+    __slots__ = ('modifier_count', 'enhanced_path', 'build', 'equations')
+
+    def __init__(self, modifier_count: int, enhanced_path: str, build: Callable[[list[float]], list[tuple[str, bool, bool]]],
+                 equations: Optional[tuple[tuple[str, str], ...]] = None):
+        self.modifier_count = modifier_count
+        self.enhanced_path = enhanced_path
+        self.build = build
+        self.equations = _normalize_equations(equations) if equations is not None else None
+
+
+def _normalize_equations(equations: tuple[tuple[str, str], ...]) -> tuple[tuple[str, str], ...]:
+    """Equations with the whitespace removed from the formulas, for comparisons."""
+    return tuple((name, "".join(formula.split())) for name, formula in equations)
+
+
+def _constant_preset(enhanced_path: str, *subpaths: tuple[str, bool, bool]) -> PresetShape:
+    return PresetShape(0, enhanced_path, lambda m: list(subpaths))
+
+
+def _build_horizontal_arrow(tip_x: float, tail_x: float) -> Callable[[list[float]], list[tuple[str, bool, bool]]]:
+    def build(m):
+        f = _format_coordinate
+        f0, f1, f2 = f(m[1]), f(m[0]), f(21600.0 - m[1])
+        return [(f"M {f(tail_x)} {f0} L {f1} {f0} L {f1} 0 L {f(tip_x)} 10800 L {f1} 21600 L {f1} {f2} L {f(tail_x)} {f2} Z", True, True)]
+    return build
+
+
+def _build_round_rectangle(m):
+    f = _format_coordinate
+    f7, f8, f9, f10 = 0.0 + m[0], 0.0 + m[0], 21600.0 - m[0], 21600.0 - m[0]
+    return [(
+        f"M {f(f7)} 0 A {f(abs(0.0 - f7))} {f(abs(f8 - 0.0))} 0 0 0 0 {f(f8)} L 0 {f(f9)} "
+        f"A {f(abs(f7 - 0.0))} {f(abs(21600.0 - f9))} 0 0 0 {f(f7)} 21600 L {f(f10)} 21600 "
+        f"A {f(abs(21600.0 - f10))} {f(abs(f9 - 21600.0))} 0 0 0 21600 {f(f9)} L 21600 {f(f8)} "
+        f"A {f(abs(f10 - 21600.0))} {f(abs(0.0 - f8))} 0 0 0 {f(f10)} 0 Z",
+        True, True,
+    )]
+
+
+def _build_smiley(m):
+    f = _format_coordinate
+    f0 = m[0] - 14510.0
+    f1, f2 = f(18520.0 - f0), f(14510.0 + f0)
+    return [
+        ('M 21600 10800 A 10800 10800 0 1 1 0 10800 A 10800 10800 0 1 1 21600 10800 Z', True, True),
+        ('M 8305 7515 A 1000 1865 0 1 1 6305 7515 A 1000 1865 0 1 1 8305 7515 Z', True, True),
+        ('M 15295 7515 A 1000 1865 0 1 1 13295 7515 A 1000 1865 0 1 1 15295 7515 Z', True, True),
+        (f'M 4870 {f1} C 8680 {f2} 12920 {f2} 16730 {f1}', False, True),
+    ]
+
+
+def _build_quad_arrow_callout(m):
+    f = _format_coordinate
+    f0, f1, f2, f3 = f(m[0]), f(m[1]), f(m[2]), f(m[3])
+    f4, f5, f6, f7 = f(21600.0 - m[0]), f(21600.0 - m[1]), f(21600.0 - m[2]), f(21600.0 - m[3])
+    points = (
+        f0, f0, f3, f0, f3, f2, f1, f2, '10800', '0', f5, f2, f7, f2, f7, f0, f4, f0, f4, f3, f6, f3, f6, f1,
+        '21600', '10800', f6, f5, f6, f7, f4, f7, f4, f4, f7, f4, f7, f6, f5, f6, '10800', '21600', f1, f6,
+        f3, f6, f3, f4, f0, f4, f0, f7, f2, f7, f2, f5, '0', '10800', f2, f1, f2, f3, f0, f3,
+    )
+    lines = " ".join(f"L {points[i]} {points[i + 1]}" for i in range(2, len(points), 2))
+    return [(f"M {points[0]} {points[1]} {lines} Z", True, True)]
+
+
+_ARROW_EQUATIONS = (
+    ('f0', '$1'), ('f1', '$0'), ('f2', '21600-$1'), ('f3', '21600-?f1'),
+    ('f4', '?f3 *?f0 /10800'), ('f5', '?f1 +?f4'), ('f6', '?f1 *?f0 /10800'), ('f7', '?f1 -?f6'),
+)
+
+_ELLIPSE_SUBPATH = ('M 21600 10800 A 10800 10800 0 1 1 0 10800 A 10800 10800 0 1 1 21600 10800 Z', True, True)
+
+# Common LibreOffice draw:type presets. A preset is used only when the geometry's modifier
+# count, enhanced path and equations match, so edited shapes keep going through the generic solver.
+_PRESET_SHAPES = {
+    'rectangle': _constant_preset(
+        'M 0 0 L 21600 0 21600 21600 0 21600 0 0 Z N',
+        ('M 0 0 L 21600 0 L 21600 21600 L 0 21600 L 0 0 Z', True, True),
+    ),
+    'flowchart-process': _constant_preset(
+        'M 0 0 L 21600 0 21600 21600 0 21600 Z N',
+        ('M 0 0 L 21600 0 L 21600 21600 L 0 21600 Z', True, True),
+    ),
+    'ellipse': _constant_preset('U 10800 10800 10800 10800 0 360 Z N', _ELLIPSE_SUBPATH),
+    'star5': _constant_preset(
+        'M 10797 0 L 8278 8256 0 8256 6722 13405 4198 21600 10797 16580 17401 21600 14878 13405 21600 8256 13321 8256 10797 0 Z N',
+        ('M 10797 0 L 8278 8256 L 0 8256 L 6722 13405 L 4198 21600 L 10797 16580 L 17401 21600 '
+         'L 14878 13405 L 21600 8256 L 13321 8256 L 10797 0 Z', True, True),
+    ),
+    'heart': _constant_preset(
+        'M 10812 21594 C 10540 19423 9746 16742 7801 15040 4560 12230 2678 12550 566 8804 -605 6314 -208 1952 '
+        '4142 313 8616 -1006 10394 2228 10812 2888 11230 2228 12987 -1006 17482 313 21832 1952 22208 6314 '
+        '21037 8804 18925 12550 17043 12230 13802 15040 11858 16742 11063 19423 10812 21594 Z N',
+        ('M 10812 21594 C 10540 19423 9746 16742 7801 15040 C 4560 12230 2678 12550 566 8804 '
+         'C -605 6314 -208 1952 4142 313 C 8616 -1006 10394 2228 10812 2888 C 11230 2228 12987 -1006 17482 313 '
+         'C 21832 1952 22208 6314 21037 8804 C 18925 12550 17043 12230 13802 15040 '
+         'C 11858 16742 11063 19423 10812 21594 Z', True, True),
+    ),
+    'flowchart-internal-storage': _constant_preset(
+        'M 0 0 L 21600 0 21600 21600 0 21600 Z N M 4230 0 L 4230 21600 N M 0 4230 L 21600 4230 N',
+        ('M 0 0 L 21600 0 L 21600 21600 L 0 21600 Z', True, True),
+        ('M 4230 0 L 4230 21600', True, True),
+        ('M 0 4230 L 21600 4230', True, True),
+    ),
+    'round-rectangle': PresetShape(
+        1, 'M ?f7 0 X 0 ?f8 L 0 ?f9 Y ?f7 21600 L ?f10 21600 X 21600 ?f9 L 21600 ?f8 Y ?f10 0 Z N',
+        _build_round_rectangle,
+        (('f0', '45'), ('f1', '$0 *sin(?f0 *(pi/180))'), ('f2', '?f1 *3163/7636'), ('f3', 'left+?f2'),
+         ('f4', 'top+?f2'), ('f5', 'right-?f2'), ('f6', 'bottom-?f2'), ('f7', 'left+$0'), ('f8', 'top+$0'),
+         ('f9', 'bottom-$0'), ('f10', 'right-$0')),
+    ),
+    'right-arrow': PresetShape(
+        2, 'M 0 ?f0 L ?f1 ?f0 ?f1 0 21600 10800 ?f1 21600 ?f1 ?f2 0 ?f2 Z N',
+        _build_horizontal_arrow(21600.0, 0.0),
+        _ARROW_EQUATIONS,
+    ),
+    'left-arrow': PresetShape(
+        2, 'M 21600 ?f0 L ?f1 ?f0 ?f1 0 0 10800 ?f1 21600 ?f1 ?f2 21600 ?f2 Z N',
+        _build_horizontal_arrow(0.0, 21600.0),
+        _ARROW_EQUATIONS,
+    ),
+    'smiley': PresetShape(
+        1, 'U 10800 10800 10800 10800 0 360 Z N U 7305 7515 1000 1865 0 360 Z N U 14295 7515 1000 1865 0 360 Z N '
+           'M 4870 ?f1 C 8680 ?f2 12920 ?f2 16730 ?f1 F N',
+        _build_smiley,
+        (('f0', '$0 -14510'), ('f1', '18520-?f0'), ('f2', '14510+?f0')),
+    ),
+    'quad-arrow-callout': PresetShape(
+        4, 'M ?f0 ?f0 L ?f3 ?f0 ?f3 ?f2 ?f1 ?f2 10800 0 ?f5 ?f2 ?f7 ?f2 ?f7 ?f0 ?f4 ?f0 ?f4 ?f3 ?f6 ?f3 ?f6 ?f1 '
+           '21600 10800 ?f6 ?f5 ?f6 ?f7 ?f4 ?f7 ?f4 ?f4 ?f7 ?f4 ?f7 ?f6 ?f5 ?f6 10800 21600 ?f1 ?f6 ?f3 ?f6 '
+           '?f3 ?f4 ?f0 ?f4 ?f0 ?f7 ?f2 ?f7 ?f2 ?f5 0 10800 ?f2 ?f1 ?f2 ?f3 ?f0 ?f3 Z N',
+        _build_quad_arrow_callout,
+        (('f0', '$0'), ('f1', '$1'), ('f2', '$2'), ('f3', '$3'),
+         ('f4', '21600-?f0'), ('f5', '21600-?f1'), ('f6', '21600-?f2'), ('f7', '21600-?f3')),
+    ),
+}
+
+
 # ODF XML namespaces
 NAMESPACES = {
     'office': 'urn:oasis:names:tc:opendocument:xmlns:office:1.0',
@@ -313,86 +1145,207 @@ NAMESPACES = {
     'loext': 'urn:org:documentfoundation:names:experimental:office:xmlns:loext:1.0',
 }
 
-# Register namespaces for ElementTree
-for prefix, uri in NAMESPACES.items():
-    ET.register_namespace(prefix, uri)
+# NOTE: namespaces are deliberately not registered with ET.register_namespace, it mutates
+# a process-wide registry; the converter only serializes XML for its own worker processes
+
+
+def gil_enabled() -> bool:
+    """Whether the GIL is enabled, False on free-threaded CPython builds running without it."""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is None or is_gil_enabled()
 
-def extract_sign_number_unit_str(text):
+
+_MIMETYPES_INIT_LOCK = threading.Lock()
+_mimetypes_ready = False
+
+
+def guess_mimetype(name: str) -> Optional[str]:
+    """Thread-safe mimetypes.guess_type, initializing the mimetypes registry once on first use."""
+    global _mimetypes_ready
+    if not _mimetypes_ready:
+        # mimetypes.init() is slow and not safe to run concurrently, see OdtToHtmlConverter._guess_mimetype
+        with _MIMETYPES_INIT_LOCK:
+            if not _mimetypes_ready:
+                mimetypes.init()
+                _mimetypes_ready = True
+    return mimetypes.guess_type(name)[0]
+
+
+class TextDecoration:
     """
-    Extracts the first number (integer or float) and its unit from a string.
-    
-    Returns a tuple (number_as_float, unit_string) or (None, None) if no match.
+    Immutable text decoration state of a style (line-through / underline).
+
+    Each field is tri-state: None (unset, inherited from the enclosing element),
+    False (explicitly disabled) or True (enabled). As there are only 9 possible
+    combinations, instances are interned: ``TextDecoration(...)`` and ``inherit``
+    return shared instances and never allocate on the inline rendering path.
+    The wrapping markup of each combination is precomputed. All combinations are
+    created at import, so the interning table is read-only and safe from any thread.
     """
-    # Regex pattern explanation:
-    # (?P<sign>[-+]*)
-    # (?P<number>\\d*\\.?\\d+) : Captures the number part (float or int) into a group named 'number'.
-    # \\s?                      : Matches an optional space.
-    # (?P<unit>[a-zA-Z]+)       : Captures the unit part (letters only) into a group named 'unit'.
-    pattern = re.compile(r'(?P<sign>[-+]*)(?P<number>\d*\.?\d+)\s*(?P<unit>[a-zA-Z]*)')
-    match = pattern.match(text.strip())
-    if match:
-        # Access the named groups
-        sign_str = match.group('sign')
-        number_str = match.group('number')
-        unit_str = match.group('unit')
-        # Convert the number string to a float
-        return sign_str, number_str, unit_str
-    else:
-        return None
+    __slots__ = ('line_through', 'underline', '_is_setted', '_open_tag', '_close_tag')
+    _INTERNED: dict[tuple, 'TextDecoration'] = {}
+
+    def __new__(cls, line_through: bool | None = None, underline: bool | None = None):
+        key = (line_through if line_through is None else bool(line_through),
+               underline if underline is None else bool(underline))
+        instance = cls._INTERNED.get(key)
+        if instance is None:
+            instance = object.__new__(cls)
+            setattr_ = object.__setattr__
+            setattr_(instance, 'line_through', key[0])
+            setattr_(instance, 'underline', key[1])
+            decorations = []
+            if key[0]: decorations.append('line-through')
+            if key[1]: decorations.append('underline')
+            setattr_(instance, '_is_setted', bool(decorations))
+            style_str = f' style="text-decoration:{" ".join(decorations)}"' if decorations else ''
+            setattr_(instance, '_open_tag', f'<span{style_str}>')
+            setattr_(instance, '_close_tag', '</span>')
+            cls._INTERNED[key] = instance
+        return instance
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        # Re-intern on unpickling (e.g. when styles are shipped to worker processes)
+        return (TextDecoration, (self.line_through, self.underline))
 
-def is_sign_str_negative(sign_str: str):
-    minus_count = sign_str.count('-')
-    return minus_count % 2 == 1
-
-from pydantic import BaseModel, ConfigDict
+    def __repr__(self):
+        return f"TextDecoration(line_through={self.line_through!r}, underline={self.underline!r})"
 
-class TextDecoration(BaseModel):
-    model_config = ConfigDict(extra='forbid') # Forbid extra fields
-    line_through: bool | None = None
-    underline: bool | None = None
+    def inherit(self, base: 'TextDecoration') -> 'TextDecoration':
+        """Return the decoration with unset fields taken from ``base`` (shared instance)."""
+        line_through = self.line_through
+        underline = self.underline
+        if line_through is not None and underline is not None:
+            return self
+        if line_through is None: line_through = base.line_through
+        if underline is None: underline = base.underline
+        return self._INTERNED[(line_through, underline)]
 
-    def inherit(self, base: "TextDecoration") -> "TextDecoration":
-        return TextDecoration(
-            line_through = base.line_through if base.line_through is not None else self.line_through,
-            underline   = base.underline     if base.underline     is not None else self.underline,
-        )
     def is_setted(self) -> bool:
-        # return self.line_through is not None and self.underline is not None
-        return self.line_through or self.underline 
-    
+        return self._is_setted
+
     def wrap(self, content: str):
-        if content and self.is_setted():
-            return f'<span{self._as_style_str()}>{content}</span>'
+        if content and self._is_setted:
+            return f'{self._open_tag}{content}{self._close_tag}'
         else:
             return content
 
     def nowrap(self, content: str):
-        if content and self.is_setted():
-            return f'</span>{content}<span{self._as_style_str()}>'
+        if content and self._is_setted:
+            return f'{self._close_tag}{content}{self._open_tag}'
         else:
             return content
 
-    # def as_wrapped_str(self, format:str = ' style={}') -> str:
-    #     decorations = []
-    #     if self.line_through: decorations.append('line-through')
-    #     if self.underline: decorations.append('underline')
-    #     decorations_value_str = ' '.join(decorations)
-    #     style_str = decorations_value_str
-    #     return format.format(style_str)
-    
-    def _as_style_str(self):
-        decorations = []
-        if self.line_through: decorations.append('line-through')
-        if self.underline: decorations.append('underline')
-        decorations_value_str = ' '.join(decorations)
-        style_str = decorations_value_str
-        result = f' style="text-decoration:{style_str}"' if style_str else ''
-        return result
-    
-    def inherit(self, base: 'TextDecoration') -> 'TextDecoration':
-        if self.line_through is None: self.line_through = base.line_through
-        if self.underline is None: self.underline = base.underline
-        return self
+# Intern all combinations upfront
+for _line_through in (None, False, True):
+    for _underline in (None, False, True):
+        TextDecoration(_line_through, _underline)
+del _line_through, _underline
+
+
+class LruCache:
+    """
+    A bounded, thread-safe least-recently-used cache.
+
+    Used by :class:`OdtToHtmlConverterRuntime` to share expensive parse results
+    across conversions. Hit/miss counters are kept for diagnostics.
+    """
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def info(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+        }
+
+
+class RuntimeMetrics:
+    """
+    Thread-safe counters and timings shared by the converters of a runtime.
+    """
+    def __init__(self):
+        self._counters: dict[str, int] = {}
+        self._timings: dict[str, list[float]] = {}  # name -> [count, total, max]
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                self._timings[name] = [1, seconds, seconds]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+                if seconds > timing[2]:
+                    timing[2] = seconds
+
+    @contextlib.contextmanager
+    def time(self, name: str) -> Iterator[None]:
+        """Observe the wall time of the enclosed block under ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'timings': {
+                    name: {'count': count, 'total': total, 'mean': total / count, 'max': maximum}
+                    for name, (count, total, maximum) in self._timings.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
 
 
 import pydantic
@@ -406,42 +1359,245 @@ class OdtToHtmlConverterConfig(pydantic.BaseModel):
     title_from_h1: bool
     title_from_filename: bool
     title_fallback: Optional[str] = None
+    # Number of parsed styles.xml kept by the runtime, 0 disables the cache
+    styles_cache_size: int = 64
+    # Number of rendered custom shape SVGs kept by the runtime, 0 disables the cache
+    shape_cache_size: int = 1024
+    # Number of base64 encoded images kept by the runtime, 0 disables the cache
+    resource_cache_size: int = 64
+    # Workers of the runtime thread pool, None for the concurrent.futures default
+    thread_pool_size: Optional[int] = None
+    # Workers of the runtime process pool, None for the number of CPUs
+    process_pool_size: Optional[int] = None
+    # Omit inherited CSS declarations equal to the ones of the enclosing element
+    css_inherit_elimination: bool = False
+    # Drop custom shape line points closer than this to the simplified path, in viewBox units; 0 disables
+    path_simplify_tolerance: float = 0.0
+    # Emit shape geometry once per document as <symbol> definitions referenced by <use>
+    svg_symbols: bool = False
+    # Render the pages of documents with at least this many pages on the runtime process pool; 0 disables
+    parallel_pages_threshold: int = 0
 
 class OdtToHtmlConverterRuntime(pydantic.BaseModel):
+    """Expensive machinery shared by any number of converters, from any thread.
+
+    The caches are sized by the config. The thread and process pools are created on
+    first use; process pool workers each keep a converter built from the config.
+    ``shutdown()``, also called when leaving a ``with`` block, releases the pools and
+    caches; the caches stay usable, but the pools can't be used anymore.
+    """
+    # Parsed styles.xml keyed by a blake2b digest of its data,
+    # shared by all converters using this runtime
+    _styles_cache: LruCache = pydantic.PrivateAttr(default_factory=LruCache)
+    # Rendered custom shape SVG markup keyed by geometry, modifiers, size and colors
+    _shape_cache: LruCache = pydantic.PrivateAttr(default_factory=lambda: LruCache(1024))
+    # Image data URIs keyed by (blake2b digest of the data, mimetype)
+    _resource_cache: LruCache = pydantic.PrivateAttr(default_factory=lambda: LruCache(64))
+    _metrics: RuntimeMetrics = pydantic.PrivateAttr(default_factory=RuntimeMetrics)
+    _config: Optional[OdtToHtmlConverterConfig] = pydantic.PrivateAttr(default=None)
+    _thread_pool: Optional[concurrent.futures.ThreadPoolExecutor] = pydantic.PrivateAttr(default=None)
+    _process_pool: Optional[concurrent.futures.ProcessPoolExecutor] = pydantic.PrivateAttr(default=None)
+    _pool_lock: threading.Lock = pydantic.PrivateAttr(default_factory=threading.Lock)
+    _closed: bool = pydantic.PrivateAttr(default=False)
+
     def __init__(self, config=None):
+        super().__init__()
         # NOTE: Comment for lazy initializion, don't initialize mimetypes registry at first
         # to bypass slow mimetypes initialization for common extensions
         # mimetypes.init()
-        pass
+        if config is not None:
+            self._config = config
+            self._styles_cache = LruCache(config.styles_cache_size)
+            self._shape_cache = LruCache(config.shape_cache_size)
+            self._resource_cache = LruCache(config.resource_cache_size)
 
-    def shutdown(self):
-        pass
+    def __enter__(self) -> 'OdtToHtmlConverterRuntime':
+        return self
 
-class OdtToHtmlConverter:
-    """Converts ODT files to HTML with embedded resources."""
-    Config = OdtToHtmlConverterConfig
-    Runtime = OdtToHtmlConverterRuntime
-    def __init__(self, config: OdtToHtmlConverterConfig, runtime: Optional[OdtToHtmlConverterRuntime] = None):
-        self.config = config
-        self.runtime = runtime if runtime is not None else self.Runtime(config=config)
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    @property
+    def config(self) -> Optional[OdtToHtmlConverterConfig]:
+        return self._config
+
+    @property
+    def styles_cache(self) -> LruCache:
+        return self._styles_cache
+
+    @property
+    def shape_cache(self) -> LruCache:
+        return self._shape_cache
+
+    @property
+    def resource_cache(self) -> LruCache:
+        return self._resource_cache
+
+    @property
+    def metrics(self) -> RuntimeMetrics:
+        return self._metrics
+
+    @property
+    def thread_pool_size(self) -> int:
+        size = self._config.thread_pool_size if self._config is not None else None
+        return size if size is not None else min(32, (os.cpu_count() or 1) + 4)
+
+    @property
+    def process_pool_size(self) -> int:
+        size = self._config.process_pool_size if self._config is not None else None
+        return size if size is not None else os.cpu_count() or 1
+
+    @property
+    def thread_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        """The runtime thread pool, created on first use."""
+        with self._pool_lock:
+            self._check_open()
+            if self._thread_pool is None:
+                self._thread_pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.thread_pool_size, thread_name_prefix='odt_to_html')
+            return self._thread_pool
+
+    @property
+    def process_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        """The runtime process pool, created on first use; needs a runtime built with a config."""
+        with self._pool_lock:
+            self._check_open()
+            if self._process_pool is None:
+                if self._config is None:
+                    raise ValueError("The process pool needs a runtime created with a config")
+                self._process_pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.process_pool_size, initializer=_init_worker, initargs=(self._config,))
+            return self._process_pool
+
+    def discard_process_pool(self, pool: concurrent.futures.ProcessPoolExecutor) -> None:
+        """Drop a broken process pool (one of its workers died), the next use starts a new one."""
+        with self._pool_lock:
+            if self._process_pool is not pool:
+                return
+            self._process_pool = None
+        self._metrics.increment('process_pool_restarts')
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("The runtime is shut down")
+
+    def cache_info(self) -> dict[str, dict]:
+        """Hit-rate statistics of the runtime caches."""
+        return {
+            'styles': self._styles_cache.info(),
+            'shapes': self._shape_cache.info(),
+            'resources': self._resource_cache.info(),
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Shut the pools down and clear the caches."""
+        with self._pool_lock:
+            self._closed = True
+            pools = (self._thread_pool, self._process_pool)
+            self._thread_pool = self._process_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=not wait)
+        self._styles_cache.clear()
+        self._shape_cache.clear()
+        self._resource_cache.clear()
+
+_DEFAULT_PAGE_PROPERTIES = {
+    'width': '21cm',
+    'height': '29.7cm',
+    'margin-top': '2cm',
+    'margin-bottom': '2cm', 
+    'margin-left': '2cm', 
+    'margin-right': '2cm'
+}
+
+
+class ConversionCancelled(Exception):
+    """Raised by a conversion whose context was cancelled, see OdtToHtmlConversionContext.cancel."""
+
+
+class OdtToHtmlConversionContext:
+    """Per-document state of a conversion.
+
+    A context is created for every :meth:`OdtToHtmlConverter.convert` call, so a converter
+    only holds its configuration and runtime, and can convert any number of documents,
+    from several threads at once. Pass a context to ``convert`` to inspect it afterwards.
+    """
+    def __init__(self):
+        # Set from any thread to stop the conversion at the next page, see cancel
+        self.cancelled = threading.Event()
         self.resources: dict[str, bytes] = {}
+        # Content digests of the resources, computed on first use, see _resource_data_uri
+        self.resource_digests: dict[str, bytes] = {}
         self.styles: dict[str, dict] = {}
         self.extra_styles: dict[str, dict] = {}
         self.text_decorations: dict[str, TextDecoration] = {} # key is style_name
         self.list_styles: dict[str, dict] = {}
         self.font_declarations: dict[str, dict] = {}
         self.footnotes: list[dict] = []  # Collect footnotes for end of document
-        self.show_page_breaks = config.show_page_breaks
         self.current_page_anchors: list[str] = []
         self.list_style_name_stack: list[str] = []
-        self.page_properties: dict[str, str] = {
-            'width': '21cm',
-            'height': '29.7cm',
-            'margin-top': '2cm',
-            'margin-bottom': '2cm', 
-            'margin-left': '2cm', 
-            'margin-right': '2cm'
-        }
+        # Effective inherited CSS properties along the render stack, see _enter_style_context
+        self.css_context_stack: list[dict[str, str]] = []
+        # Points and path data bytes removed by simplification, see _convert_path
+        self.path_simplify_stats = {'points': 0, 'removed_points': 0, 'removed_bytes': 0}
+        # Shape geometry candidates for the document <defs> and their uses, see _use_svg_symbol
+        self.svg_symbols_by_key: dict[Hashable, dict] = {}
+        self.svg_symbol_uses: list[tuple[dict, str, str]] = []
+        self.page_properties: dict[str, str] = dict(_DEFAULT_PAGE_PROPERTIES)
+
+    def cancel(self) -> None:
+        """Stop the conversion with ConversionCancelled before it renders its next page."""
+        self.cancelled.set()
+
+
+def _context_attribute(name: str) -> property:
+    """A converter attribute stored in the context of the running conversion.
+
+    Each access looks the context up, hot code binds ``self._context()`` once instead.
+    """
+    def fget(self):
+        return getattr(self._context(name), name)
+
+    def fset(self, value):
+        setattr(self._context(name), name, value)
+
+    return property(fget, fset)
+
+
+class OdtToHtmlConverter:
+    """Converts ODT files to HTML with embedded resources."""
+    Config = OdtToHtmlConverterConfig
+    Runtime = OdtToHtmlConverterRuntime
+    Context = OdtToHtmlConversionContext
+    _DEFAULT_PAGE_PROPERTIES = _DEFAULT_PAGE_PROPERTIES
+
+    # Per-document state, see OdtToHtmlConversionContext
+    cancelled = _context_attribute('cancelled')
+    resources = _context_attribute('resources')
+    resource_digests = _context_attribute('resource_digests')
+    styles = _context_attribute('styles')
+    extra_styles = _context_attribute('extra_styles')
+    text_decorations = _context_attribute('text_decorations')
+    list_styles = _context_attribute('list_styles')
+    font_declarations = _context_attribute('font_declarations')
+    footnotes = _context_attribute('footnotes')
+    current_page_anchors = _context_attribute('current_page_anchors')
+    list_style_name_stack = _context_attribute('list_style_name_stack')
+    css_context_stack = _context_attribute('css_context_stack')
+    path_simplify_stats = _context_attribute('path_simplify_stats')
+    svg_symbols_by_key = _context_attribute('svg_symbols_by_key')
+    svg_symbol_uses = _context_attribute('svg_symbol_uses')
+    page_properties = _context_attribute('page_properties')
+
+    def __init__(self, config: OdtToHtmlConverterConfig, runtime: Optional[OdtToHtmlConverterRuntime] = None):
+        self.config = config
+        self.runtime = runtime if runtime is not None else self.Runtime(config=config)
+        self.show_page_breaks = config.show_page_breaks
+        self.css_inherit_elimination = config.css_inherit_elimination
+        self.svg_symbols = config.svg_symbols
+        self.path_simplify_tolerance = config.path_simplify_tolerance
         # Title configuration
         self.overridden_title = config.title
         self.use_meta_title = config.title_from_metadata
@@ -449,9 +1605,93 @@ class OdtToHtmlConverter:
         self.use_h1_title = config.title_from_h1
         self.use_filename_title = config.title_from_filename
         self.fallback_title = config.title_fallback
+        # Context of the conversion this converter runs in the current thread (or task); one
+        # variable per converter, so a conversion can run another converter without mixing states
+        self._current_conversion: contextvars.ContextVar[Optional[OdtToHtmlConversionContext]] = \
+            contextvars.ContextVar('odt_to_html_conversion', default=None)
+
+    def _context(self, name: str = 'context') -> OdtToHtmlConversionContext:
+        """The context of the running conversion; ``name`` is the attribute for the error message."""
+        conversion = self._current_conversion.get()
+        if conversion is None:
+            raise RuntimeError(f"'{name}' is only available during a conversion, see OdtToHtmlConverter.conversion_context")
+        return conversion
+
+    @contextlib.contextmanager
+    def conversion_context(self, context: Optional[OdtToHtmlConversionContext] = None) -> Iterator[OdtToHtmlConversionContext]:
+        """Run the enclosed block with its own (or the given) per-document conversion context."""
+        if context is None:
+            context = self.Context()
+        token = self._current_conversion.set(context)
+        try:
+            yield context
+        finally:
+            self._current_conversion.reset(token)
+
+    def convert(self, file: Union[StrPath,bytes,IO[bytes]], title: Optional[str],
+                context: Optional[OdtToHtmlConversionContext] = None) -> str:
+        """Convert the ODT file to HTML string.
+
+        The per-document state lives in a new conversion context, or in ``context`` if given.
+        """
+        metrics = self.runtime.metrics
+        with self.conversion_context(context), metrics.time('convert'):
+            try:
+                html = self._convert(file, title)
+            except ConversionCancelled:
+                metrics.increment('cancelled')
+                raise
+            except Exception:
+                metrics.increment('errors')
+                raise
+            metrics.increment('documents')
+            return html
+
+    async def convert_async(self, file: Union[StrPath,bytes,IO[bytes]], title: Optional[str],
+                            context: Optional[OdtToHtmlConversionContext] = None) -> str:
+        """Convert the ODT file to HTML string on the runtime thread pool.
+
+        Reading the zip and rendering both run off the event loop. Cancelling the awaiting
+        task cancels the conversion: a queued one never starts, a running one stops before
+        its next page.
+        """
+        if context is None:
+            context = self.Context()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.runtime.thread_pool, self.convert, file, title, context)
+        except asyncio.CancelledError:
+            context.cancel()
+            raise
+
+    async def convert_many_async(self, files: Iterable[Union[StrPath,bytes,IO[bytes]]], title: Optional[str] = None,
+                                 concurrency: Optional[int] = None,
+                                 return_exceptions: bool = False) -> list[Union[str, BaseException]]:
+        """Convert the ODT files concurrently, returning the HTML strings in input order.
+
+        At most ``concurrency`` files (default: the runtime thread pool size) are in flight at
+        once, the others wait without holding a pool worker. With ``return_exceptions`` a
+        failed file yields its exception instead of cancelling the remaining conversions.
+        """
+        semaphore = asyncio.Semaphore(concurrency if concurrency is not None else self.runtime.thread_pool_size)
+
+        async def convert_one(file):
+            async with semaphore:
+                return await self.convert_async(file, title)
+
+        tasks = [asyncio.ensure_future(convert_one(file)) for file in files]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _check_cancelled(self) -> None:
+        if self.cancelled.is_set():
+            raise ConversionCancelled("The conversion was cancelled")
 
-    def convert(self, file: Union[StrPath,bytes,IO[bytes]], title: Optional[str]) -> str:
-        """Convert the ODT file to HTML string."""
+    def _convert(self, file: Union[StrPath,bytes,IO[bytes]], title: Optional[str]) -> str:
+        self._check_cancelled()
 
         # Normalize input
         fp = self._normalize_source(file)
@@ -467,21 +1707,28 @@ class OdtToHtmlConverter:
             # Load all resources (images, etc.)
             self._load_resources(odt_zip)
             
-            # Parse styles
-            if 'styles.xml' in odt_zip.namelist():
-                styles_xml = odt_zip.read('styles.xml').decode('utf-8')
-                self._parse_styles(styles_xml)
+            content_xml = odt_zip.read('content.xml').decode('utf-8')
+            content_root = ET.fromstring(content_xml)
+
+            # Only styles referenced by the body (and their ancestors) are resolved
+            referenced_style_names = self._collect_referenced_style_names(content_root)
+
+            # Parse styles (shared across documents with identical styles.xml)
+            self._load_styles(odt_zip, referenced_style_names)
             
             # Parse automatic styles from content.xml
-            content_xml = odt_zip.read('content.xml').decode('utf-8')
-            self._parse_styles(content_xml)
+            self._parse_styles(content_root, referenced_style_names)
             
             # Convert content to HTML
-            html_body = self._convert_content(content_xml)
+            html_body = self._convert_content(content_root)
             
             # Add footnotes section if any
             if self.footnotes:
                 html_body += self._generate_footnotes_section()
+
+            # Hoist repeated shape geometry into shared definitions
+            if self.svg_symbol_uses:
+                html_body = self._resolve_svg_symbols(html_body)
         
             # Determine title
             doc_title = self._determine_title(odt_zip, content_xml, title)
@@ -526,11 +1773,97 @@ class OdtToHtmlConverter:
             if name.startswith('Pictures/') or name.startswith('media/') or name.startswith('ObjectReplacements/'):
                 self.resources[name] = odt_zip.read(name)
     
-    def _parse_styles(self, xml_content: str) -> None:
-        """Parse style definitions from XML content."""
-        root = ET.fromstring(xml_content)
-        
-        # Parse font declarations
+    def _collect_referenced_style_names(self, root: ET.Element) -> set[str]:
+        """Cheap pre-scan of the document body for the style names it references.
+
+        Collects every ``*:style-name`` attribute (text, draw, table and list styles) in the body,
+        plus the parent and list styles of referenced automatic styles, so that the referenced
+        styles of styles.xml are known before it is parsed.
+        """
+        referenced = set()
+        body = root.find(f"{{{NAMESPACES['office']}}}body")
+        if body is None:
+            return referenced
+        for element in body.iter():
+            for key, value in element.attrib.items():
+                if key.endswith('style-name'):
+                    referenced.add(value)
+
+        # Follow parent chains of the automatic styles, as their ancestors usually live in styles.xml
+        parent_attr = f"{{{NAMESPACES['style']}}}parent-style-name"
+        list_style_attr = f"{{{NAMESPACES['style']}}}list-style-name"
+        elements = self._index_styles(root)
+        pending = list(referenced)
+        while pending:
+            style = elements.get(pending.pop())
+            if style is None:
+                continue
+            for name in (style.get(parent_attr), style.get(list_style_attr)):
+                if name and name not in referenced:
+                    referenced.add(name)
+                    pending.append(name)
+        return referenced
+
+    def _load_styles(self, odt_zip: zipfile.ZipFile, referenced: Optional[set[str]] = None) -> None:
+        """Load styles.xml, reusing the runtime cache when an identical styles.xml was parsed before.
+
+        The cache key is a cryptographic digest of the styles.xml data: the runtime may be
+        shared by the clients of a service, and a CRC32 and size are easily forged to poison
+        the styles of other documents. A hit saves the parse, not the decompression. Styles are
+        extracted lazily: only the referenced ones are resolved, and resolved styles are
+        memoized in the cache entry.
+        """
+        self.styles = {}
+        self.extra_styles = {}
+        self.text_decorations = {}
+        self.list_styles = {}
+        self.font_declarations = {}
+        self.page_properties = dict(self._DEFAULT_PAGE_PROPERTIES)
+        try:
+            info = odt_zip.getinfo('styles.xml')
+        except KeyError:
+            return
+        cache = self.runtime.styles_cache
+        data = odt_zip.read(info)
+        key = hashlib.blake2b(data, digest_size=16).digest()
+        cached = cache.get(key)
+        if cached is None:
+            root = ET.fromstring(data)
+            self._parse_font_declarations(root)
+            self._parse_page_layout(root)
+            self._parse_list_styles(root)
+            cached = {
+                'style_elements': self._index_styles(root),
+                # (props, extra_props, text_decoration) by style name, filled lazily and never mutated
+                'resolved_styles': {},
+                'font_declarations': dict(self.font_declarations),
+                'list_styles': dict(self.list_styles),
+                'page_properties': dict(self.page_properties),
+            }
+            cache.put(key, cached)
+        else:
+            self.font_declarations = dict(cached['font_declarations'])
+            self.list_styles = dict(cached['list_styles'])
+            self.page_properties = dict(cached['page_properties'])
+        elements = cached['style_elements']
+        names = elements if referenced is None else [name for name in referenced if name in elements]
+        self._resolve_styles(elements, names, cached['resolved_styles'])
+
+    def _parse_styles(self, xml_content: Union[str, ET.Element], referenced: Optional[set[str]] = None) -> None:
+        """Parse style definitions from XML content.
+
+        If ``referenced`` is given, only those styles and their ancestors are extracted.
+        """
+        root = ET.fromstring(xml_content) if isinstance(xml_content, str) else xml_content
+        self._parse_font_declarations(root)
+        elements = self._index_styles(root)
+        names = elements if referenced is None else [name for name in elements if name in referenced]
+        self._resolve_styles(elements, names, {})
+        self._parse_page_layout(root)
+        self._parse_list_styles(root, referenced)
+
+    def _parse_font_declarations(self, root: ET.Element) -> None:
+        """Parse font face declarations."""
         for font_decl in root.iter(f"{{{NAMESPACES['style']}}}font-face"):
             font_name = font_decl.get(f"{{{NAMESPACES['style']}}}name")
             font_family = font_decl.get(f"{{{NAMESPACES['svg']}}}font-family")
@@ -539,52 +1872,89 @@ class OdtToHtmlConverter:
                     'family': font_family.strip("'\""),
                     'generic': font_decl.get(f"{{{NAMESPACES['style']}}}font-family-generic", ""),
                 }
-        
-        # Find all style definitions
+
+    @staticmethod
+    def _index_styles(root: ET.Element) -> dict[str, ET.Element]:
+        """Map style names to their style:style elements, without extracting properties."""
+        name_attr = f"{{{NAMESPACES['style']}}}name"
+        elements = {}
         for style in root.iter(f"{{{NAMESPACES['style']}}}style"):
-            style_name = style.get(f"{{{NAMESPACES['style']}}}name")
-            if not style_name:
-                continue
-            
-            style_props = {}
-            extra_style_props = {}
-            text_decoration = TextDecoration()
-            
-            # Get parent style properties first
-            parent_style = style.get(f"{{{NAMESPACES['style']}}}parent-style-name")
-            if parent_style and parent_style in self.styles:
-                style_props.update(self.styles[parent_style])
-            
-            # Get text properties
-            text_props = style.find(f"{{{NAMESPACES['style']}}}text-properties")
-            if text_props is not None:
-                self._extract_text_properties(text_props, style_props, text_decoration)
-            
-            # Get paragraph properties
-            para_props = style.find(f"{{{NAMESPACES['style']}}}paragraph-properties")
-            if para_props is not None:
-                self._extract_paragraph_properties(para_props, style_props)
-            
-            # Get table properties
-            table_props = style.find(f"{{{NAMESPACES['style']}}}table-properties")
-            if table_props is not None:
-                self._extract_table_properties(table_props, style_props)
-            
-            # Get table cell properties
-            cell_props = style.find(f"{{{NAMESPACES['style']}}}table-cell-properties")
-            if cell_props is not None:
-                self._extract_cell_properties(cell_props, style_props)
-            
-            # Get graphic properties
-            graphic_props = style.find(f"{{{NAMESPACES['style']}}}graphic-properties")
-            if graphic_props is not None:
-                self._extract_graphic_properties(graphic_props, style_props, extra_style_props)
-            
-            self.styles[style_name] = style_props
-            self.extra_styles[style_name] = extra_style_props
-            self.text_decorations[style_name] = text_decoration
+            style_name = style.get(name_attr)
+            if style_name:
+                elements[style_name] = style
+        return elements
+
+    def _resolve_styles(self, elements: dict[str, ET.Element], names, resolved: dict[str, tuple]) -> None:
+        """Extract the named styles and their ancestors into the style stores.
 
-        # Parse Page Layouts
+        ``resolved`` memoizes the extracted ``(props, extra_props, text_decoration)`` by name.
+        It may be shared across conversions through the runtime cache: the extracted style
+        dicts are final once parsed (font stacks included) and must never be mutated.
+        """
+        parent_attr = f"{{{NAMESPACES['style']}}}parent-style-name"
+        context = self._context()
+        styles, extra_styles, text_decorations = context.styles, context.extra_styles, context.text_decorations
+        done = set()
+        for name in names:
+            # Collect the not yet handled ancestors defined in this document, nearest first
+            chain = []
+            current = name
+            while current in elements and current not in done and current not in chain:
+                chain.append(current)
+                current = elements[current].get(parent_attr)
+            for current in reversed(chain):
+                entry = resolved.get(current)
+                if entry is None:
+                    parent_style = elements[current].get(parent_attr)
+                    parent_entry = resolved.get(parent_style)
+                    parent_props = parent_entry[0] if parent_entry else styles.get(parent_style)
+                    # Concurrent conversions may race here, the first stored entry wins for all
+                    entry = resolved.setdefault(current, self._extract_style(elements[current], parent_props))
+                style_props, extra_style_props, text_decoration = entry
+                styles[current] = style_props
+                extra_styles[current] = extra_style_props
+                text_decorations[current] = text_decoration
+                done.add(current)
+
+    def _extract_style(self, style: ET.Element, parent_props: Optional[dict]) -> tuple[dict, dict, TextDecoration]:
+        """Extract the properties of a single style:style element."""
+        style_props = {}
+        extra_style_props = {}
+        text_decoration = TextDecoration()
+        
+        # Get parent style properties first
+        if parent_props:
+            style_props.update(parent_props)
+        
+        # Get text properties
+        text_props = style.find(f"{{{NAMESPACES['style']}}}text-properties")
+        if text_props is not None:
+            text_decoration = self._extract_text_properties(text_props, style_props)
+        
+        # Get paragraph properties
+        para_props = style.find(f"{{{NAMESPACES['style']}}}paragraph-properties")
+        if para_props is not None:
+            self._extract_paragraph_properties(para_props, style_props)
+        
+        # Get table properties
+        table_props = style.find(f"{{{NAMESPACES['style']}}}table-properties")
+        if table_props is not None:
+            self._extract_table_properties(table_props, style_props)
+        
+        # Get table cell properties
+        cell_props = style.find(f"{{{NAMESPACES['style']}}}table-cell-properties")
+        if cell_props is not None:
+            self._extract_cell_properties(cell_props, style_props)
+        
+        # Get graphic properties
+        graphic_props = style.find(f"{{{NAMESPACES['style']}}}graphic-properties")
+        if graphic_props is not None:
+            self._extract_graphic_properties(graphic_props, style_props, extra_style_props)
+        
+        return style_props, extra_style_props, text_decoration
+
+    def _parse_page_layout(self, root: ET.Element) -> None:
+        """Parse the default page layout properties."""
         # 1. Find master page to identify the default page layout
         default_page_layout_name = None
         for master_styles in root.iter(f"{{{NAMESPACES['office']}}}master-styles"):
@@ -601,11 +1971,12 @@ class OdtToHtmlConverter:
                     props = page_layout.find(f"{{{NAMESPACES['style']}}}page-layout-properties")
                     if props is not None:
                         self._extract_page_properties(props)
-        
-        # Parse list styles
+
+    def _parse_list_styles(self, root: ET.Element, referenced: Optional[set[str]] = None) -> None:
+        """Parse list styles, only the referenced ones if ``referenced`` is given."""
         for list_style in root.iter(f"{{{NAMESPACES['text']}}}list-style"):
             style_name = list_style.get(f"{{{NAMESPACES['style']}}}name")
-            if style_name:
+            if style_name and (referenced is None or style_name in referenced):
                 self.list_styles[style_name] = self._parse_list_style(list_style)
     
     def _parse_list_style(self, list_style: ET.Element) -> dict:
@@ -634,8 +2005,8 @@ class OdtToHtmlConverter:
                  key = attr.replace('page-', '') # page-width -> width
                  self.page_properties[key] = val
     
-    def _extract_text_properties(self, props: ET.Element, style_dict: dict, text_decoration: TextDecoration) -> None:
-        """Extract text formatting properties."""
+    def _extract_text_properties(self, props: ET.Element, style_dict: dict) -> TextDecoration:
+        """Extract text formatting properties, returning the text decoration of the style."""
         # Font weight (bold)
         font_weight = props.get(f"{{{NAMESPACES['fo']}}}font-weight")
         if font_weight == 'bold':
@@ -653,11 +2024,11 @@ class OdtToHtmlConverter:
         # so checking style:text-underline-style is enough
         text_underline = props.get(f"{{{NAMESPACES['style']}}}text-underline-style")
         if text_underline is None:
-            text_decoration.underline = None
+            underline = None
         elif text_underline == 'none':
-            text_decoration.underline = False
+            underline = False
         else:
-            text_decoration.underline = True
+            underline = True
         
         # Text decoration (Strikethrough)
         # For viewing the doc about style:text-line-through-type, see https://docs.oasis-open.org/office/OpenDocument/v1.3/os/part3-schema/OpenDocument-v1.3-os-part3-schema.html#__RefHeading__1420190_253892949
@@ -666,11 +2037,11 @@ class OdtToHtmlConverter:
         # so checking style:text-line-through-style is enough
         text_line_through = props.get(f"{{{NAMESPACES['style']}}}text-line-through-style")
         if text_line_through is None:
-            text_decoration.line_through = None
+            line_through = None
         elif text_line_through == 'none':
-            text_decoration.line_through = False
+            line_through = False
         else:
-            text_decoration.line_through = True
+            line_through = True
         
         # Border (Table cells)
         for border_prop in ['border', 'border-top', 'border-bottom', 'border-left', 'border-right']:
@@ -704,23 +2075,24 @@ class OdtToHtmlConverter:
             style_dict['color'] = color
         
         # Font family - use the actual font name from declarations
+        # Map ODF fonts to system font stacks for offline viewing
         font_name = props.get(f"{{{NAMESPACES['style']}}}font-name")
         if font_name:
             if font_name in self.font_declarations:
                 font_info = self.font_declarations[font_name]
                 font_family = font_info['family']
-                generic = font_info.get('generic', '')
+                generic = self._FONT_GENERIC_MAP.get(font_info.get('generic', ''))
                 if generic:
-                    style_dict['font-family'] = f"'{font_family}', {generic}"
+                    style_dict['font-family'] = self._resolve_font_stack(f"'{font_family}', {generic}")
                 else:
-                    style_dict['font-family'] = f"'{font_family}'"
+                    style_dict['font-family'] = self._resolve_font_stack(f"'{font_family}'")
             else:
-                style_dict['font-family'] = f"'{font_name}'"
+                style_dict['font-family'] = self._resolve_font_stack(f"'{font_name}'")
         
         # Fallback to fo:font-family
         fo_font_family = props.get(f"{{{NAMESPACES['fo']}}}font-family")
         if fo_font_family and 'font-family' not in style_dict:
-            style_dict['font-family'] = fo_font_family
+            style_dict['font-family'] = self._resolve_font_stack(fo_font_family)
         
         # Background color
         bg_color = props.get(f"{{{NAMESPACES['fo']}}}background-color")
@@ -736,7 +2108,17 @@ class OdtToHtmlConverter:
             elif text_position.startswith('super') or (text_position[0].isdigit() and int(text_position.split('%')[0]) > 0):
                 style_dict['vertical-align'] = 'super'
                 style_dict['font-size'] = '0.8em'
+
+        return TextDecoration(line_through, underline)
     
+    @classmethod
+    def _resolve_font_stack(cls, font_family: str) -> str:
+        """Map a css font-family value to the full font stack of its primary font, if known."""
+        font = font_family.strip("'\"")
+        if ',' in font:
+            font = font.split(',')[0].strip().strip("'\"")
+        return cls._FONT_STACK_MAP.get(font, font_family)
+
     def _extract_paragraph_properties(self, props: ET.Element, style_dict: dict) -> None:
         """Extract paragraph formatting properties."""
         # Text alignment
@@ -877,31 +2259,6 @@ class OdtToHtmlConverter:
         # horizontal_pos = props.get(f"{{{NAMESPACES['style']}}}horizontal-pos")
         # if horizontal_pos: extra_style_dict['horizontal-pos'] = horizontal_pos
 
-    def _parse_odt_transform(self, transform_str: str) -> dict:
-        """Parse ODT draw:transform attribute.
-        
-        ODT transform syntax: "rotate (angle) translate (x y)" 
-        where angle is in radians, and x/y are dimensions like "1.5in".
-        
-        Returns dict with keys: 'rotate' (radians), 'translate_x', 'translate_y'
-        """
-        result = {'rotate': None, 'translate_x': None, 'translate_y': None}
-        if not transform_str:
-            return result
-        
-        # Parse rotate
-        rotate_match = re.search(r'rotate\s*\(\s*([-\d.]+)\s*\)', transform_str)
-        if rotate_match:
-            result['rotate'] = float(rotate_match.group(1))
-        
-        # Parse translate - ODT uses "translate (x y)" with space separator
-        translate_match = re.search(r'translate\s*\(\s*([\d.]+\w+)\s+([\d.]+\w+)\s*\)', transform_str)
-        if translate_match:
-            result['translate_x'] = translate_match.group(1)
-            result['translate_y'] = translate_match.group(2)
-        
-        return result
-
     def _get_meta_title(self, odt_zip: zipfile.ZipFile) -> str | None:
         """Extract title from meta.xml if available."""
         if 'meta.xml' not in odt_zip.namelist():
@@ -1047,67 +2404,80 @@ class OdtToHtmlConverter:
     
     def _get_style_string(self, style_name: str, predicate: Optional[Callable[[str],bool]] = None) -> str:
         """Get CSS style string for a named style."""
-        if style_name not in self.styles:
+        props = self.styles.get(style_name)
+        if props is None:
             return ""
         
-        props = self.styles[style_name]
         return "; ".join(f"{k}: {v}" for k, v in props.items() if predicate is None or predicate(k))
 
-    def _get_text_decoration(self, style_name: str) -> TextDecoration:
-        """Get CSS style string for a named style."""
-        text_decoration = self.text_decorations[style_name]
-        return text_decoration
+    # CSS properties inherited by descendant elements
+    _INHERITED_CSS_PROPERTIES = frozenset({
+        'color', 'font-family', 'font-size', 'font-style', 'font-weight', 'line-height', 'text-align',
+    })
 
-    def _convert_content(self, content_xml: str) -> str:
+    @staticmethod
+    def _is_relative_css_value(value: str) -> bool:
+        # Relative values compound when repeated (e.g. 0.8em in 0.8em), so they are never omitted
+        return (value.endswith(('%', 'em', 'ex', 'ch')) and not value.endswith('rem')) or value in ('larger', 'smaller')
+
+    def _enter_style_context(self, style_name: str, predicate: Optional[Callable[[str],bool]] = None, isolate: bool = False) -> str:
+        """Get CSS style string for a named style, entering its inherited CSS context.
+
+        With css_inherit_elimination enabled, inherited declarations identical to the effective
+        value of the enclosing element are omitted, and the effective inherited properties are
+        pushed on css_context_stack. ``isolate`` starts from an empty context, for elements whose
+        own default CSS overrides inherited properties (e.g. headings, table cells).
+        Must be paired with _exit_style_context.
+        """
+        if not self.css_inherit_elimination:
+            return self._get_style_string(style_name, predicate)
+        conversion = self._context()
+        css_context_stack = conversion.css_context_stack
+        context = css_context_stack[-1] if css_context_stack and not isolate else {}
+        effective = dict(context)
+        declarations = []
+        for k, v in conversion.styles.get(style_name, {}).items():
+            if predicate is not None and not predicate(k):
+                continue
+            if k in self._INHERITED_CSS_PROPERTIES:
+                if context.get(k) == v and not self._is_relative_css_value(v):
+                    continue
+                effective[k] = v
+            declarations.append(f"{k}: {v}")
+        css_context_stack.append(effective)
+        return "; ".join(declarations)
+
+    def _exit_style_context(self) -> None:
+        if self.css_inherit_elimination:
+            self.css_context_stack.pop()
+
+    def _get_text_decoration(self, style_name: str) -> TextDecoration:
+        """Get CSS style string for a named style."""
+        text_decoration = self.text_decorations[style_name]
+        return text_decoration
+
+    def _convert_content(self, content_xml: Union[str, ET.Element]) -> str:
         """Convert ODT content XML to HTML body content."""
-        root = ET.fromstring(content_xml)
+        root = ET.fromstring(content_xml) if isinstance(content_xml, str) else content_xml
         
         # Find the body/text element
         body = root.find(f".//{{{NAMESPACES['office']}}}text")
         if body is None:
             return "<p>No content found in document.</p>"
-            
-        # Process content with pagination
-        pages = []
-        current_page_content = []
-        self.current_page_anchors = [] # Reset anchors
-        
-        def start_new_page():
-            nonlocal current_page_content
-            # Finish current page
-            page_inner_html = "\n".join(current_page_content)
-            
-            # Add hoisted page anchors
-            anchors_html = "".join(self.current_page_anchors)
-            self.current_page_anchors = [] # Reset for next page
-            
-            # Construct page div
-            w = self.page_properties.get('width', '21cm')
-            h = self.page_properties.get('height', '29.7cm')
-            mt = self.page_properties.get('margin-top', '2cm')
-            mb = self.page_properties.get('margin-bottom', '2cm')
-            ml = self.page_properties.get('margin-left', '2cm')
-            mr = self.page_properties.get('margin-right', '2cm')
-            
-            # Convert dimensions to pixels for consistent rendering if needed, 
-            # but using CSS strings is fine if they are units like 'cm'.
-            # Note: Explicit dimensions are crucial for absolute positioning reliability.
-            
-            page_style = (f"width: {w}; min-height: {h}; "
-                          f"padding: {mt} {mr} {mb} {ml}; "
-                          f"box-sizing: border-box")
-            
-            content_style = "position: relative; width: 100%; height: 100%;"
-            
-            page_html = (f'<div class="anchor-page" style="{page_style}">'
-                         f'<div class="anchor-page-content" style="{content_style}">'
-                         f'{page_inner_html}{anchors_html}'
-                         f'</div></div>')
-            
-            pages.append(page_html)
-            current_page_content = []
 
-        
+        # Page groups render independently, so large documents can spread them over processes
+        groups = self._split_page_groups(body)
+        threshold = self.config.parallel_pages_threshold
+        if threshold and len(groups) >= threshold and len(groups) > 1 and self.runtime.process_pool_size > 1:
+            rendered = self._render_page_groups_parallel(groups)
+        else:
+            rendered = [self._render_page_group(group) for group in groups]
+        return self._join_pages(rendered)
+
+    def _split_page_groups(self, body: ET.Element) -> list[list[ET.Element]]:
+        """Split the top-level body elements before each page break."""
+        styles = self.styles
+        groups = [[]]
         for child in body:
             tag = child.tag.split('}')[-1]
             
@@ -1121,7 +2491,7 @@ class OdtToHtmlConverter:
             # 2. Paragraph with break-before style
             if tag in ('p', 'h'):
                 style_name = child.get(f"{{{NAMESPACES['text']}}}style-name", "")
-                if style_name in self.styles and self.styles[style_name].get('break-before') == 'page':
+                if style_name in styles and styles[style_name].get('break-before') == 'page':
                     is_break = True
                 
                 # 3. Check for soft-page-break as *first* child of paragraph (effectively a page break)
@@ -1133,27 +2503,167 @@ class OdtToHtmlConverter:
                          # We can optionally remove the soft-page-break node to avoid double processing?
                          # _process_paragraph handles soft-page-break by returning empty span or nothing.
             
-            if is_break and current_page_content:
-                start_new_page()
-            
-            # Process element
-            # We use a simplified dispatch here for top-level elements
-            # Reuse _process_element dispatch logic but for single item
-            
-            # We create a dummy wrapper to use _process_element? 
-            # Or just call specific methods. 
-            # _process_element iterates. Let's make a single element dispatcher.
-            
+            if is_break and groups[-1]:
+                groups.append([])
+            groups[-1].append(child)
+        return groups
+
+    def _render_page_group(self, group: list[ET.Element]) -> tuple[list[str], list[str]]:
+        """Render the elements of a page group, returning their HTML parts and hoisted page anchors."""
+        # Pages are the cancellation points of a conversion
+        self._check_cancelled()
+        self.current_page_anchors = []
+        parts = []
+        for child in group:
             html_part = self._process_single_element(child)
             if html_part:
-                current_page_content.append(html_part)
+                parts.append(html_part)
+        return parts, self.current_page_anchors
+
+    def _join_pages(self, rendered: list[tuple[list[str], list[str]]]) -> str:
+        """Wrap rendered page groups into page divs.
+
+        A break only starts a new page once the current one has content; the anchors of
+        groups rendering to nothing move on to the next page.
+        """
+        pages = []
+        page_content = []
+        page_anchors = []
+        for index, (parts, anchors) in enumerate(rendered):
+            if index and page_content:
+                pages.append(self._page_html(page_content, page_anchors))
+                page_content, page_anchors = [], []
+            page_content.extend(parts)
+            page_anchors.extend(anchors)
         
         # Flush final page
-        if current_page_content or self.current_page_anchors:
-            start_new_page()
+        if page_content or page_anchors:
+            pages.append(self._page_html(page_content, page_anchors))
             
         return "\n".join(pages)
 
+    def _page_html(self, page_content: list[str], page_anchors: list[str]) -> str:
+        page_inner_html = "\n".join(page_content)
+        
+        # Add hoisted page anchors
+        anchors_html = "".join(page_anchors)
+        
+        # Construct page div
+        page_properties = self.page_properties
+        w = page_properties.get('width', '21cm')
+        h = page_properties.get('height', '29.7cm')
+        mt = page_properties.get('margin-top', '2cm')
+        mb = page_properties.get('margin-bottom', '2cm')
+        ml = page_properties.get('margin-left', '2cm')
+        mr = page_properties.get('margin-right', '2cm')
+        
+        # Convert dimensions to pixels for consistent rendering if needed, 
+        # but using CSS strings is fine if they are units like 'cm'.
+        # Note: Explicit dimensions are crucial for absolute positioning reliability.
+        
+        page_style = (f"width: {w}; min-height: {h}; "
+                      f"padding: {mt} {mr} {mb} {ml}; "
+                      f"box-sizing: border-box")
+        
+        content_style = "position: relative; width: 100%; height: 100%;"
+        
+        return (f'<div class="anchor-page" style="{page_style}">'
+                f'<div class="anchor-page-content" style="{content_style}">'
+                f'{page_inner_html}{anchors_html}'
+                f'</div></div>')
+
+    # Read-only document state a page group worker renders with, see _render_page_groups_parallel
+    _PAGE_WORKER_STATE = ('styles', 'extra_styles', 'text_decorations', 'list_styles',
+                          'font_declarations', 'page_properties')
+
+    def _render_page_groups_parallel(self, groups: list[list[ET.Element]]) -> list[tuple[list[str], list[str]]]:
+        """Render page groups on the runtime process pool, in contiguous chunks of similar size.
+
+        Each chunk ships the read-only styles once, with the resources its images link to and
+        the object replacement images (looked up by frame name, see _process_frame). The
+        footnotes, simplification statistics and shape symbols collected by the workers are
+        merged in document order, so the result matches rendering the groups in order.
+        """
+        pool = self.runtime.process_pool
+        href_attribute = f"{{{NAMESPACES['xlink']}}}href"
+        groups_xml = []
+        groups_hrefs = []
+        for group in groups:
+            page = ET.Element('page')
+            page.extend(group)
+            groups_xml.append(ET.tostring(page, encoding='unicode'))
+            groups_hrefs.append({href for element in page.iter() if (href := element.get(href_attribute))})
+
+        # Contiguous chunks of roughly equal XML size, a few per worker to balance the load
+        chunk_count = min(len(groups), self.runtime.process_pool_size * 4)
+        total = sum(map(len, groups_xml))
+        chunks, chunk, hrefs, size = [], [], set(), 0
+        for xml, group_hrefs in zip(groups_xml, groups_hrefs):
+            chunk.append(xml)
+            hrefs |= group_hrefs
+            size += len(xml)
+            if size >= total * (len(chunks) + 1) / chunk_count:
+                chunks.append((chunk, hrefs))
+                chunk, hrefs = [], set()
+        if chunk:
+            chunks.append((chunk, hrefs))
+
+        state = {name: getattr(self, name) for name in self._PAGE_WORKER_STATE}
+        object_replacements = {name: data for name, data in self.resources.items() if 'ObjectReplacement' in name}
+        futures = []
+        for chunk, hrefs in chunks:
+            chunk_state = dict(state)
+            chunk_state['resources'] = dict(object_replacements)
+            chunk_state['resources'].update((href, self.resources[href]) for href in hrefs if href in self.resources)
+            futures.append(pool.submit(_render_pages_in_worker, self.config, chunk_state, chunk))
+        rendered = []
+        try:
+            for future in futures:
+                result = future.result()
+                self._check_cancelled()
+                rendered.extend(self._merge_page_worker_result(result))
+        finally:
+            for future in futures:
+                future.cancel()
+        return rendered
+
+    def _render_page_chunk(self, chunk: list[str]) -> dict:
+        """Render page groups serialized by _render_page_groups_parallel, in a worker process."""
+        rendered = [self._render_page_group(list(ET.fromstring(xml))) for xml in chunk]
+        return {
+            'pages': rendered,
+            'footnotes': self.footnotes,
+            'path_simplify_stats': self.path_simplify_stats,
+            'svg_symbols': [
+                (key, symbol['count'], symbol['render_svg'](), symbol['render_symbol']())
+                for key, symbol in self.svg_symbols_by_key.items()
+            ],
+            'svg_symbol_uses': [(symbol['key'], svg, use_attributes) for symbol, svg, use_attributes in self.svg_symbol_uses],
+        }
+
+    def _merge_page_worker_result(self, result: dict) -> list[tuple[list[str], list[str]]]:
+        """Merge the state collected by a page group worker, returning its rendered groups."""
+        self.footnotes.extend(result['footnotes'])
+        for name, value in result['path_simplify_stats'].items():
+            self.path_simplify_stats[name] += value
+        if not result['svg_symbol_uses']:
+            return result['pages']
+
+        # Worker symbols are renumbered as if their shapes had been met here, in order
+        for key, count, svg, symbol in result['svg_symbols']:
+            self._use_svg_symbol_definition(key, functools.partial(tuple, symbol), functools.partial(str, svg))['count'] += count
+        offset = len(self.svg_symbol_uses)
+        self.svg_symbol_uses.extend((self.svg_symbols_by_key[key], svg, use_attributes)
+                                    for key, svg, use_attributes in result['svg_symbol_uses'])
+
+        def renumber(match):
+            return f"\x00svg-symbol:{int(match[1]) + offset}\x00"
+
+        return [
+            ([self._SVG_SYMBOL_PLACEHOLDER_PATTERN.sub(renumber, part) for part in parts], anchors)
+            for parts, anchors in result['pages']
+        ]
+
     def _process_single_element(self, child: ET.Element) -> str:
         """Process a single top-level element."""
         tag = child.tag.split('}')[-1]
@@ -1189,10 +2699,11 @@ class OdtToHtmlConverter:
         """Process a paragraph element."""
         style_name = para.get(f"{{{NAMESPACES['text']}}}style-name", "")
         text_decoration = self._get_text_decoration(style_name)
-        style_str = self._get_style_string(style_name)
+        style_str = self._enter_style_context(style_name)
         
         # Split content into inline text, paragraph anchors, and page anchors
         inline_content, anchored_content_list, page_anchors_list = self._process_paragraph_content_split(para, text_decoration)
+        self._exit_style_context()
         
         # Hoist page anchors to global state
         if page_anchors_list:
@@ -1305,8 +2816,12 @@ class OdtToHtmlConverter:
         else: # box_count > 0
             intervals = [(y,y+h) for x,y,w,h in boxes]
             assert intervals
-            intervals,indices_group = merge_intervals(intervals)
-            upper_paths, lower_paths = skyline_paths([(y,x,h,w) for x,y,w,h in boxes])
+            if numpy is not None and box_count >= _NUMPY_MIN_BOXES:
+                intervals,indices_group = merge_intervals_numpy(intervals)
+                upper_paths, lower_paths = skyline_paths_numpy([(y,x,h,w) for x,y,w,h in boxes])
+            else:
+                intervals,indices_group = merge_intervals(intervals)
+                upper_paths, lower_paths = skyline_paths([(y,x,h,w) for x,y,w,h in boxes])
             element_strs = []
             y_base = Length(0, boxes[0][0].unit)
             for interval, indices, upper_path, lower_path in zip(intervals,indices_group,upper_paths,lower_paths):
@@ -1432,11 +2947,13 @@ class OdtToHtmlConverter:
         level = min(int(level), 6)  # HTML only supports h1-h6
         
         style_name = heading.get(f"{{{NAMESPACES['text']}}}style-name", "")
-        style_str = self._get_style_string(style_name)
+        # NOTE: isolated as the default heading css overrides inherited properties
+        style_str = self._enter_style_context(style_name, isolate=True)
         text_decoration = self._get_text_decoration(style_name)
         
         content = self._process_inline_content(heading, text_decoration)
         content = text_decoration.wrap(content)
+        self._exit_style_context()
         
         style_attr = f' style="{style_str}"' if style_str else ''
         return f'<h{level}{style_attr}>{content}</h{level}>'
@@ -1472,8 +2989,8 @@ class OdtToHtmlConverter:
         transform_str = child.get(f"{{{NAMESPACES['draw']}}}transform")
         
         # Parse transform if present
-        transform_info = self._parse_odt_transform(transform_str) if transform_str else {}
-        has_transform_position = transform_info.get('translate_x') or transform_info.get('translate_y')
+        transform = parse_odf_transform(transform_str) if transform_str else None
+        has_transform_position = transform is not None and transform.translated
         
         if (x and y) or has_transform_position or anchor_type in ('paragraph', 'page', 'char'):
             # Shapes with x/y coordinates, or transform with translate, or paragraph/page/char anchor
@@ -1481,24 +2998,29 @@ class OdtToHtmlConverter:
             element_style.append("position: absolute")
 
             
-            # Use transform translate if available, otherwise use x/y
+            # The transform matrix includes the translation if any, otherwise use x/y
             if has_transform_position:
-                element_style.append(f"left: {transform_info.get('translate_x', '0')}")
-                element_style.append(f"top: {transform_info.get('translate_y', '0')}")
+                element_style.append("left: 0")
+                element_style.append("top: 0")
             else:
                 if x: element_style.append(f"left: {x}")
                 if y: element_style.append(f"top: {y}")
             
-            # Apply rotation if present
-            if transform_info.get('rotate'):
-                angle_rad = -transform_info['rotate']  # Negate for CSS
-                element_style.append(f"transform: rotate({angle_rad}rad)")
+            # Apply the transform around the top left corner
+            if transform is not None and not transform.identity:
+                element_style.append(f"transform: {transform.css}")
                 element_style.append("transform-origin: 0 0")
         else:
             # As-char elements, unset anchor, or only partial coordinates → flow inline
             element_style.append("display: inline-block")
             element_style.append("vertical-align: text-bottom")
         
+        # Objects, links and notes are rendered with their own css (or elsewhere, for notes),
+        # so they don't inherit the css context of the enclosing text
+        isolate_css_context = self.css_inherit_elimination and tag not in self._INLINE_TEXT_TAGS
+        if isolate_css_context:
+            self.css_context_stack.append({})
+
         # NOTE: currently only span and line-break enable nowrap for line-decoration.
         # NOTE: may come back for other in the future ?
         if tag == 'span':
@@ -1549,8 +3071,15 @@ class OdtToHtmlConverter:
         else:
             result = ""
         # result = text_decoration.nowrap(result) if result else ""
+        if isolate_css_context:
+            self.css_context_stack.pop()
         return result
 
+    # Inline elements rendered within the css context of the enclosing text
+    _INLINE_TEXT_TAGS = frozenset({
+        'span', 's', 'tab', 'line-break', 'bookmark', 'bookmark-start', 'bookmark-end', 'soft-page-break', 'sequence',
+    })
+
     
     def _process_sequence(self, seq: ET.Element) -> str:
         """Process a sequence element (figure/table numbering)."""
@@ -1561,10 +3090,10 @@ class OdtToHtmlConverter:
     def _process_span(self, span: ET.Element, base_text_decoration: TextDecoration) -> str:
         """Process a text span element."""
         style_name = span.get(f"{{{NAMESPACES['text']}}}style-name", "")
-        style_str = self._get_style_string(style_name)
-        text_decoration = self._get_text_decoration(style_name)
-        text_decoration.inherit(base_text_decoration)
+        style_str = self._enter_style_context(style_name)
+        text_decoration = self._get_text_decoration(style_name).inherit(base_text_decoration)
         content = self._process_inline_content(span, text_decoration)
+        self._exit_style_context()
         content = text_decoration.wrap(content)
         if style_str:
             return f'<span style="{style_str}">{content}</span>'
@@ -1679,15 +3208,11 @@ class OdtToHtmlConverter:
             if ch: child_style.append(f"height: {ch}")
             
             if transform:
-                 # Clean up transform string - simplified for basic cases
-                 # rotate (-0.5...) translate (...) -> rotate(...) translate(...)
-                 child_style.append(f"transform: {transform}")
-                 # You might need detailed parsing if syntax varies significantly from CSS
-                 # ODT often uses "rotate (angle) translate (x y)". CSS expects "rotate(angle) translate(x, y)"
-                 # Simple fix specific for typical ODT output: add commas to translate?
-                 # Actually ODT: "rotate (1.57) translate (1cm 2cm)" -> CSS: "rotate(1.57rad) translate(1cm, 2cm)"
-                 # This is complex. For now, pass it through and hope it works or needs minor tweak.
-                 pass
+                # ODF transform syntax differs from CSS, emit the normalized matrix instead
+                parsed_transform = parse_odf_transform(transform)
+                if parsed_transform is not None and not parsed_transform.identity:
+                    child_style.append(f"transform: {parsed_transform.css}")
+                    child_style.append("transform-origin: 0 0")
 
             if tag == 'image':
                 frame_content_parts.append(self._process_image(child, style_parts.copy() + child_style, frame_name))
@@ -1778,15 +3303,15 @@ class OdtToHtmlConverter:
                 x_is_defined = isinstance(x, str)
                 x_value = 0
                 if x_is_defined:
-                    x_sign, x_number, x_unit = extract_sign_number_unit_str(x)
-                    x_abs = x_number + x_unit
-                    x_value = x_abs
+                    x_length = parse_odf_length(x)
+                    if x_length is not None:
+                        x_value = x_length.magnitude
                 # Process svg:y
-                y_is_defined = isinstance(y, str)
+                y_length = parse_odf_length(y) if isinstance(y, str) else None
+                y_is_defined = y_length is not None
                 if y_is_defined:
-                    y_sign, y_number, y_unit = extract_sign_number_unit_str(y)
-                    y_is_zero_or_positive = not is_sign_str_negative(y_sign) 
-                    y_abs = y_number + y_unit
+                    y_is_zero_or_positive = not y_length.negative
+                    y_abs = y_length.magnitude
                     if y_is_zero_or_positive:
                         svgy_align_elements_str:str = (
                             f'<span class="svgy-positive-aligner"></span>'
@@ -1830,12 +3355,13 @@ class OdtToHtmlConverter:
         for child in text_box:
             tag = child.tag.split('}')[-1]
             if tag == 'p':
+                # Check if this looks like a figure caption
+                style_name = child.get(f"{{{NAMESPACES['text']}}}style-name", "")
+                # NOTE: HACK, Libreoffice seems doesn't respect margin-bottom, let's ignore it
+                style_str = self._enter_style_context(style_name, lambda key: key not in {'margin-bottom'})
                 content = self._process_inline_content(child)
+                self._exit_style_context()
                 if content.strip():
-                    # Check if this looks like a figure caption
-                    style_name = child.get(f"{{{NAMESPACES['text']}}}style-name", "")
-                    # NOTE: HACK, Libreoffice seems doesn't respect margin-bottom, let's ignore it
-                    style_str = self._get_style_string(style_name, lambda key: key not in {'margin-bottom'})
                     style_attr = f' style="{style_str}"' if style_str else ''
                     # NOTE: use span class=p instead of p for as-char shape/object
                     # parts.append(f'<p class="caption"{style_attr}>{content}</p>')
@@ -1916,12 +3442,31 @@ class OdtToHtmlConverter:
             # the initialization take around 0.26sec / total 0.32sec, which is A LOT OF time
             # avoid time consuming init, use init on demand strategy
             # init  triggers at the first time fallback
-            mimetype = mimetypes.guess_type(href)[0]
+            mimetype = guess_mimetype(href)
         if mimetype is None:
             mimetype = default_mimetype
         # print(mimetype)
         return mimetype
 
+    def _resource_data_uri(self, name: str, mime_type: str) -> str:
+        """Return the base64 data URI of a resource, shared through the runtime cache.
+
+        The cache is keyed by a cryptographic digest of the data, so a document can't
+        get the data of another document (CRC32 and size are easily forged).
+        """
+        context = self._context()
+        digest = context.resource_digests.get(name)
+        if digest is None:
+            digest = context.resource_digests[name] = hashlib.blake2b(context.resources[name], digest_size=16).digest()
+        cache = self.runtime.resource_cache
+        key = (digest, mime_type)
+        uri = cache.get(key)
+        if uri is None:
+            base64_data = base64.b64encode(context.resources[name]).decode('ascii')
+            uri = f"data:{mime_type};base64,{base64_data}"
+            cache.put(key, uri)
+        return uri
+
     def _process_image(self, image: ET.Element, style_parts: list, frame_name: str = "") -> str:
         """Process an image element with optional caption support."""
         href = image.get(f"{{{NAMESPACES['xlink']}}}href", "")
@@ -1931,10 +3476,7 @@ class OdtToHtmlConverter:
         
         # Get the image data
         if href in self.resources:
-            data = self.resources[href]
-            mime_type = self._guess_mimetype(href)
-            base64_data = base64.b64encode(data).decode('ascii')
-            src = f"data:{mime_type};base64,{base64_data}"
+            src = self._resource_data_uri(href, self._guess_mimetype(href))
         else:
             # External image - keep the href
             src = href
@@ -1949,10 +3491,8 @@ class OdtToHtmlConverter:
     
     def _create_image_from_resource(self, resource_name: str, style_parts: list) -> str:
         """Create an image tag from a resource."""
-        data = self.resources[resource_name]
-        mime_type = mimetypes.guess_type(resource_name)[0] or 'application/octet-stream'
-        base64_data = base64.b64encode(data).decode('ascii')
-        src = f"data:{mime_type};base64,{base64_data}"
+        mime_type = guess_mimetype(resource_name) or 'application/octet-stream'
+        src = self._resource_data_uri(resource_name, mime_type)
         
         style_str = "; ".join(style_parts) if style_parts else ""
         style_attr = f' style="{style_str}"' if style_str else ''
@@ -1984,26 +3524,6 @@ class OdtToHtmlConverter:
         if shape_style.get('stroke') == 'none':
             base_stroke_color = 'none'
         
-        # ODT custom shapes usually have a viewBox coordinate system (e.g. 0 0 21600 21600)
-        enhanced_geom = shape.find(f".//{{{NAMESPACES['draw']}}}enhanced-geometry")
-        
-        view_box = "0 0 21600 21600" # Default ODT viewbox
-        subpaths = []
-        
-        if enhanced_geom is not None:
-             # Get viewBox if available
-            vb = enhanced_geom.get(f"{{{NAMESPACES['svg']}}}viewBox")
-            if vb:
-                view_box = vb
-            
-            # Solve equations to get variable values
-            variables = self._solve_equations(enhanced_geom, frame)
-            
-            # Get path and substitute variables
-            raw_path = enhanced_geom.get(f"{{{NAMESPACES['draw']}}}enhanced-path", "")
-            if raw_path:
-                subpaths = self._convert_path(raw_path, variables)
-        
         # Check for text inside the shape
         text_content_parts = []
         # ODT puts text in a text-box or directly as P/List elements? 
@@ -2019,60 +3539,39 @@ class OdtToHtmlConverter:
 
         text_html = "".join(text_content_parts)
 
-        # Construct SVG
-        # We need to group subpaths by their fill/stroke requirements
-        svg_paths_html = []
-        
-        if subpaths:
-            # Group compatible paths to reduce DOM elements where possible
-            # Compatible means same effective fill and stroke behavior
-            current_group = []
-            
-            # Grouping key: (has_fill, has_stroke)
-            current_key = None
-            
-            for sub in subpaths:
-                # Determine effective colors for this subpath
-                has_fill = sub['fill'] and base_fill_color != 'none'
-                has_stroke = sub['stroke'] and base_stroke_color != 'none'
-                
-                key = (has_fill, has_stroke)
-                
-                if current_key is None:
-                    current_key = key
-                    current_group.append(sub['d'])
-                elif key == current_key:
-                    current_group.append(sub['d'])
-                else:
-                    # Flush current group
-                    if current_group:
-                        d_attr = " ".join(current_group)
-                        fill_attr = base_fill_color if current_key[0] else "none"
-                        stroke_attr = base_stroke_color if current_key[1] else "none"
-                        # Use fill-rule="evenodd" to handle holes correctly (e.g. eyes in face)
-                        svg_paths_html.append(f'<path d="{d_attr}" fill="{fill_attr}" stroke="{stroke_attr}" stroke-width="{stroke_width}" fill-rule="evenodd" vector-effect="non-scaling-stroke"/>')
-                    
-                    # Start new group
-                    current_key = key
-                    current_group = [sub['d']]
-            
-            # Flush final group
-            if current_group:
-                d_attr = " ".join(current_group)
-                fill_attr = base_fill_color if current_key[0] else "none"
-                stroke_attr = base_stroke_color if current_key[1] else "none"
-                svg_paths_html.append(f'<path d="{d_attr}" fill="{fill_attr}" stroke="{stroke_attr}" stroke-width="{stroke_width}" fill-rule="evenodd" vector-effect="non-scaling-stroke"/>')
+        # Rendered SVG is shared by shapes with identical geometry, modifiers, size and colors
+        enhanced_geom = shape.find(f".//{{{NAMESPACES['draw']}}}enhanced-geometry")
+        equations = None
+        if enhanced_geom is not None:
+            equations = self._get_geometry_equations(enhanced_geom)
+            geometry_key = (
+                enhanced_geom.get(f"{{{NAMESPACES['svg']}}}viewBox"),
+                enhanced_geom.get(f"{{{NAMESPACES['draw']}}}modifiers"),
+                enhanced_geom.get(f"{{{NAMESPACES['draw']}}}enhanced-path"),
+                equations,
+                self.path_simplify_tolerance,
+            )
         else:
-             # Fallback if no path but fallback rendering needed?
-             pass
-             
-        svg_content = "\n".join(svg_paths_html)
-              
-        svg = (
-            f'<svg width="{width}" height="{height}" viewBox="{view_box}" xmlns="http://www.w3.org/2000/svg" preserveAspectRatio="none">'
-            f'{svg_content}'
-            '</svg>'
-        )
+            geometry_key = (None,)
+
+        def render_svg():
+            return self._cached_shape_render(
+                (*geometry_key, width, height, base_fill_color, base_stroke_color, stroke_width),
+                lambda: self._render_custom_shape_svg(enhanced_geom, equations, width, height, base_fill_color, base_stroke_color, stroke_width),
+            )
+
+        def render_symbol():
+            return self._cached_shape_render(
+                ('symbol', *geometry_key), lambda: self._render_custom_shape_symbol(enhanced_geom, equations))
+
+        if self.svg_symbols:
+            # Size and colors stay on the referencing <svg>, the symbol paths inherit them
+            svg = self._use_svg_symbol(
+                ('custom-shape', *geometry_key), render_symbol, render_svg, width, height,
+                f' fill="{base_fill_color}" stroke="{base_stroke_color}" stroke-width="{stroke_width}"',
+            )
+        else:
+            svg = render_svg()
         
         # If there is text, we need to overlay it. 
         # NOTE: ODT text inside shapes is usually centered or fully filling the shape box. adopt this apporach as approximation for now
@@ -2100,87 +3599,187 @@ class OdtToHtmlConverter:
         # NOTE: fix as-char issue, use span to avoid invalid html element hierarchy like <span><div></div></span>
         return f'<span class="div draw-custom-shape" style="{style_str}">{content}</span>'
 
-    def _solve_equations(self, geometry: ET.Element, frame: ET.Element) -> dict:
+    def _render_custom_shape_svg(self, enhanced_geom: Optional[ET.Element], equations: Optional[tuple],
+                                 width: str, height: str,
+                                 base_fill_color: str, base_stroke_color: str, stroke_width: str) -> str:
+        """Render the SVG markup of a custom shape geometry."""
+        view_box, subpaths = self._get_custom_shape_subpaths(enhanced_geom, equations)
+        svg_content = "\n".join(self._shape_path_elements(subpaths, base_fill_color, base_stroke_color, stroke_width))
+              
+        svg = (
+            f'<svg width="{width}" height="{height}" viewBox="{view_box}" xmlns="http://www.w3.org/2000/svg" preserveAspectRatio="none">'
+            f'{svg_content}'
+            '</svg>'
+        )
+        return svg
+
+    def _render_custom_shape_symbol(self, enhanced_geom: Optional[ET.Element], equations: Optional[tuple]) -> tuple[str, str]:
+        """Render the viewBox and the color independent paths of a custom shape symbol."""
+        view_box, subpaths = self._get_custom_shape_subpaths(enhanced_geom, equations)
+        return view_box, "\n".join(self._shape_path_elements(subpaths, None, None, None))
+
+    def _get_custom_shape_subpaths(self, enhanced_geom: Optional[ET.Element], equations: Optional[tuple]) -> tuple[str, list[dict]]:
+        """Return the viewBox and the subpaths of a custom shape geometry."""
+        # ODT custom shapes usually have a viewBox coordinate system (e.g. 0 0 21600 21600)
+        view_box = "0 0 21600 21600" # Default ODT viewbox
+        subpaths = []
+        
+        if enhanced_geom is not None:
+             # Get viewBox if available
+            vb = enhanced_geom.get(f"{{{NAMESPACES['svg']}}}viewBox")
+            if vb:
+                view_box = vb
+            
+            # Built-in presets skip the generic equation solver
+            subpaths = self._get_preset_subpaths(enhanced_geom, equations)
+            if subpaths is None:
+                # Solve equations to get variable values
+                variables = self._solve_equations(enhanced_geom, equations)
+                
+                # Get path and substitute variables
+                subpaths = []
+                raw_path = enhanced_geom.get(f"{{{NAMESPACES['draw']}}}enhanced-path", "")
+                if raw_path:
+                    subpaths = self._convert_path(raw_path, variables)
+        return view_box, subpaths
+
+    @staticmethod
+    def _shape_path_elements(subpaths: list[dict], base_fill_color: Optional[str],
+                             base_stroke_color: Optional[str], stroke_width: Optional[str]) -> list[str]:
+        """Build the <path> elements of the subpaths, grouped by fill and stroke.
+
+        A None color or stroke width leaves the attribute out, so that it is inherited
+        from the <use> element referencing a symbol.
+        """
+        svg_paths_html = []
+        if stroke_width is None:
+            width_attr = ""
+        else:
+            width_attr = f' stroke-width="{stroke_width}"'
+
+        def flush(d_parts, key):
+            d_attr = " ".join(d_parts)
+            if base_fill_color is None:
+                fill_attr = "" if key[0] else ' fill="none"'
+            else:
+                fill_attr = f' fill="{base_fill_color if key[0] else "none"}"'
+            if base_stroke_color is None:
+                stroke_attr = "" if key[1] else ' stroke="none"'
+            else:
+                stroke_attr = f' stroke="{base_stroke_color if key[1] else "none"}"'
+            # Use fill-rule="evenodd" to handle holes correctly (e.g. eyes in face)
+            svg_paths_html.append(f'<path d="{d_attr}"{fill_attr}{stroke_attr}{width_attr} fill-rule="evenodd" vector-effect="non-scaling-stroke"/>')
+
+        # Group compatible paths to reduce DOM elements where possible
+        # Compatible means same effective fill and stroke behavior
+        current_group = []
+        
+        # Grouping key: (has_fill, has_stroke)
+        current_key = None
+        
+        for sub in subpaths:
+            # Determine effective colors for this subpath
+            has_fill = sub['fill'] and base_fill_color != 'none'
+            has_stroke = sub['stroke'] and base_stroke_color != 'none'
+            
+            key = (has_fill, has_stroke)
+            
+            if key == current_key:
+                current_group.append(sub['d'])
+            else:
+                # Flush current group
+                if current_group:
+                    flush(current_group, current_key)
+                
+                # Start new group
+                current_key = key
+                current_group = [sub['d']]
+        
+        # Flush final group
+        if current_group:
+            flush(current_group, current_key)
+        return svg_paths_html
+
+    @staticmethod
+    def _get_preset_subpaths(geometry: ET.Element, equations: Optional[tuple[tuple[str, str], ...]] = None) -> Optional[list[dict]]:
+        """Return the precomputed subpaths of a built-in preset geometry, or None.
+
+        The preset is used when draw:type, the modifier count, the enhanced path and the
+        equations (``equations``, or those of the geometry) match and the viewBox is the
+        default one; other geometries go through the generic solver.
+        """
+        preset = _PRESET_SHAPES.get(geometry.get(f"{{{NAMESPACES['draw']}}}type"))
+        if preset is None:
+            return None
+        if geometry.get(f"{{{NAMESPACES['svg']}}}viewBox") not in (None, "", "0 0 21600 21600"):
+            return None
+        if geometry.get(f"{{{NAMESPACES['draw']}}}enhanced-path") != preset.enhanced_path:
+            return None
+        modifiers = []
+        for val in geometry.get(f"{{{NAMESPACES['draw']}}}modifiers", "").split():
+            try:
+                modifiers.append(float(val))
+            except ValueError:
+                modifiers.append(0.0)
+        if len(modifiers) != preset.modifier_count:
+            return None
+        if preset.equations is not None:
+            if equations is None:
+                equations = OdtToHtmlConverter._get_geometry_equations(geometry)
+            if _normalize_equations(equations) != preset.equations:
+                return None
+        return [{'d': d, 'fill': fill, 'stroke': stroke} for d, fill, stroke in preset.build(modifiers)]
+
+    @staticmethod
+    def _get_geometry_equations(geometry: ET.Element) -> tuple[tuple[str, str], ...]:
+        """Collect the (name, formula) equations of an enhanced geometry, in order."""
+        equations = []
+        for eq in geometry.iter(f"{{{NAMESPACES['draw']}}}equation"):
+            name = eq.get(f"{{{NAMESPACES['draw']}}}name")
+            formula = eq.get(f"{{{NAMESPACES['draw']}}}formula")
+            if name and formula:
+                equations.append((name, formula))
+        return tuple(equations)
+
+    def _solve_equations(self, geometry: ET.Element, equations: Optional[tuple[tuple[str, str], ...]] = None) -> dict:
         """Solve ODT enhanced geometry equations."""
         variables = {}
         
         # Get modifiers ($0, $1...)
-        modifiers = geometry.get(f"{{{NAMESPACES['draw']}}}modifiers", "")
-        if modifiers:
+        modifiers = []
+        modifiers_str = geometry.get(f"{{{NAMESPACES['draw']}}}modifiers", "")
+        if modifiers_str:
             # Modifiers can be numbers or percentages? Usually space separated numbers.
-            mods = modifiers.split()
-            for i, val in enumerate(mods):
+            for i, val in enumerate(modifiers_str.split()):
                 try:
-                    variables[f'${i}'] = float(val)
+                    modifiers.append(float(val))
                 except ValueError:
-                    variables[f'${i}'] = 0.0
-        else:
-             # Some defaults might be needed?
-             pass
+                    modifiers.append(0.0)
+                variables[f'${i}'] = modifiers[-1]
 
         # Constants often used
-        variables['pi'] = math.pi
-        variables['left'] = 0
-        variables['top'] = 0
-        variables['right'] = 21600 # Default width in internal units
-        variables['bottom'] = 21600 # Default height
+        left, top, width, height = 0.0, 0.0, 21600.0, 21600.0 # Default size in internal units
         
-        # Update width/height if viewBox provided (though right/bottom usually match viewBox width/height)
+        # Update width/height if viewBox provided
         vb = geometry.get(f"{{{NAMESPACES['svg']}}}viewBox")
         if vb:
             parts = vb.split()
             if len(parts) == 4:
-                variables['left'] = float(parts[0])
-                variables['top'] = float(parts[1])
-                variables['right'] = float(parts[2]) # strictly left + width?
-                variables['bottom'] = float(parts[3]) 
-                # Note: viewBox is min-x min-y width height. 
-                # ODT usage of 'right' usually implies width if starting at 0.
-        
-        # Helper for if function
-        def iff(c, t, f):
-            return t if c else f
+                # Note: viewBox is min-x min-y width height
+                try:
+                    left, top, width, height = (float(part) for part in parts)
+                except ValueError:
+                    pass
+        right, bottom = left + width, top + height
+        constants = [math.pi, left, top, right, bottom, width, height, width, height]
+        variables.update(zip(_FORMULA_CONSTANTS, constants))
 
         # Process equations in order
-        for eq in geometry.findall(f".//{{{NAMESPACES['draw']}}}equation"):
-            name = eq.get(f"{{{NAMESPACES['draw']}}}name")
-            formula = eq.get(f"{{{NAMESPACES['draw']}}}formula")
-            if name and formula:
-                # Sanitize and convert formula to python expression
-                
-                expr = formula
-                
-                # Replace $0, $1... with mod_0, mod_1...
-                expr = re.sub(r'\$(\d+)', r'mod_\1', expr)
-                
-                # Replace ?name with var_name
-                expr = re.sub(r'\?([a-zA-Z0-9]+)', r'var_\1', expr)
-                
-                # Replace 'if(' with 'iff('
-                expr = expr.replace('if(', 'iff(')
-                
-                # Allowed globals
-                safe_locals = {'math': math, 'sin': math.sin, 'cos': math.cos, 
-                               'tan': math.tan, 'sqrt': math.sqrt, 'abs': abs,
-                               'min': min, 'max': max, 'pi': math.pi, 'iff': iff}
-                
-                # Add current variables to locals with mapped names
-                current_locals = safe_locals.copy()
-                for k, v in variables.items():
-                    if k.startswith('$'):
-                        current_locals[f'mod_{k[1:]}'] = v
-                    else:
-                        current_locals[f'var_{k}'] = v
-                        # Also expose standard constants directly (left, top, right, bottom)
-                        if k in ['left', 'top', 'right', 'bottom', 'width', 'height']:
-                             current_locals[k] = v
-                
-                try:
-                    res = eval(expr, {"__builtins__": {}}, current_locals)
-                    variables[name] = float(res)
-                except Exception as e:
-                    # Fallback or log?
-                    variables[name] = 0.0
+        if equations is None:
+            equations = self._get_geometry_equations(geometry)
+        if equations:
+            compiled = compile_equations(equations)
+            variables.update(zip(compiled.names, compiled.solve(constants, modifiers)))
                     
         return variables
 
@@ -2189,209 +3788,231 @@ class OdtToHtmlConverter:
         
         Returns a list of dicts: {'d': str, 'fill': bool, 'stroke': bool}
         handling ODT commands like 'F' (No Fill), 'S' (No Stroke), 'N' (New Path).
+
+        The path is scanned once, command by command: the coordinates following a command
+        are formatted as a run and emitted straight into a flat buffer of SVG tokens.
+        Incomplete trailing coordinates of a command are ignored.
+
+        With a path_simplify_tolerance, the polyline of each M/L run (from the current
+        point for L) is simplified before emission, see simplify_polyline.
         """
-        # Split tokens
-        raw_tokens = path_data.split()
-        
-        # Pass 1: Resolve all variables to float values or keep commands/literals
-        resolved_tokens = []
-        for token in raw_tokens:
-            if token.isalpha():
-                resolved_tokens.append(token.upper())
-            elif token.startswith('?') or token.startswith('$'):
-                val = float(variables.get(token[1:] if token.startswith('?') else token, 0))
-                resolved_tokens.append(val)
-            else:
-                try:
-                    resolved_tokens.append(float(token))
-                except ValueError:
-                     # Should not happen for valid paths, but keep as is just in case
-                    resolved_tokens.append(token)
+        fmt = _format_coordinate
+        tolerance = self.path_simplify_tolerance
+        # Formatted text of ?name and $n references, which usually repeat
+        references = {}
+
+        def text_of(token):
+            head = token[0]
+            if head == '?' or head == '$':
+                text = references.get(token)
+                if text is None:
+                    text = references[token] = fmt(value_of(token))
+                return text
+            # Plain integer literals are already in their formatted form
+            if token.isdecimal() and (head != '0' or len(token) == 1) and token.isascii():
+                return token
+            try:
+                return fmt(float(token))
+            except ValueError:
+                # Should not happen for valid paths, but keep as is just in case
+                return token
+
+        def texts_of(tokens):
+            if tokens[0].isdecimal():
+                return [text_of(token) for token in tokens]
+            try:
+                # Runs of decimal literals are converted without per token dispatch
+                return list(map(fmt, map(float, tokens)))
+            except ValueError:
+                return [text_of(token) for token in tokens]
+
+        def value_of(token):
+            head = token[0]
+            if head == '?':
+                return float(variables.get(token[1:], 0))
+            if head == '$':
+                return float(variables.get(token, 0))
+            try:
+                return float(token)
+            except ValueError:
+                return 0.0
 
-        # Pass 2: Process commands and generate SVG
         subpaths = []
-        current_path_cmds = []
+        parts = [] # SVG path data of the current subpath, joined with spaces on flush
+        append = parts.append
 
-        current_x = 0.0
-        current_y = 0.0
-        # Track start of subpath for Z (Close) - usually M sets this
-        subpath_start_x = 0.0
-        subpath_start_y = 0.0
-        
+        # Current point and start of subpath (for Z), kept as tokens until X, Y or U need the values
+        current_x = current_y = '0'
+        subpath_start_x = subpath_start_y = '0'
         # Track subpath start state for implicit moves (U following N)
         is_subpath_start = True
-
         # Default state for new paths
         current_fill = True
         current_stroke = True
-        
-        def fmt(val):
-            if isinstance(val, float):
-                return f"{val:.2f}".rstrip('0').rstrip('.')
-            return str(val)
 
-        i = 0
-        last_cmd = None # Track last command for implicit repetition
-
-        while i < len(resolved_tokens):
-            token = resolved_tokens[i]
-            
-            # Determine command to execute
-            cmd = None
-            if isinstance(token, str) and token.isalpha():
-                cmd = token
-                i += 1
-                last_cmd = cmd
-            else:
-                # Implicit command based on last_cmd
-                if last_cmd in ['M', 'L']:
-                    cmd = 'L' # M followed by coords implies L, L repeats
-                elif last_cmd == 'C':
-                    cmd = 'C'
-                elif last_cmd in ['X', 'Y']:
-                    # Implicit repetition for X/Y? 
-                    # Assuming X/Y also behave like L regarding coordinate consumption (take 2 args here as per our Arc logic which uses targets)
-                    # Although ODF spec for X/Y is murky, treating them as L-like targets for Arc seems consistent with 'Poly-Arc'?
-                    # Or should we fallback to L? 
-                    # Let's fallback to behaving like the explicit command was repeated.
-                    cmd = last_cmd 
-                # U, Z, N usually don't have coordinate repetition in the same way (U has fixed args, Z/N have none/ignore)
-            
-            if cmd == 'M':
-                # Abs Move: M x y
-                if i + 1 < len(resolved_tokens):
-                    x = resolved_tokens[i]
-                    y = resolved_tokens[i+1]
-                    current_path_cmds.append(f"M {fmt(x)} {fmt(y)}")
-                    current_x, current_y = x, y
-                    subpath_start_x, subpath_start_y = x, y
-                    is_subpath_start = False
-                    i += 2
-            elif cmd == 'L':
-                # Abs Line: L x y
-                if i + 1 < len(resolved_tokens):
-                    x = resolved_tokens[i]
-                    y = resolved_tokens[i+1]
-                    current_path_cmds.append(f"L {fmt(x)} {fmt(y)}")
-                    current_x, current_y = x, y
-                    is_subpath_start = False
-                    i += 2
+        # Commands alternate with the whitespace separated coordinates following them
+        segments = _PATH_COMMAND_PATTERN.split(path_data)
+        for index in range(1, len(segments), 2):
+            cmd = segments[index].upper()
+            if cmd == 'M' or cmd == 'L':
+                # M x y, followed by coords implies L; L repeats
+                args = segments[index + 1].split()
+                count = len(args) - len(args) % 2
+                if not count:
+                    continue
+                texts = texts_of(args[:count])
+                if tolerance > 0 and count >= 4:
+                    texts = self._simplify_path_run(cmd, args[:count], texts, current_x, current_y, value_of, tolerance)
+                append(cmd)
+                append(texts[0])
+                append(texts[1])
+                for i in range(2, len(texts), 2):
+                    append('L')
+                    append(texts[i])
+                    append(texts[i + 1])
+                if cmd == 'M':
+                    subpath_start_x, subpath_start_y = args[0], args[1]
+                current_x, current_y = args[count - 2], args[count - 1]
+                is_subpath_start = False
             elif cmd == 'C':
-                # Cubic Bezier: C x1 y1 x2 y2 x y
-                if i + 5 < len(resolved_tokens):
-                    coords = resolved_tokens[i:i+6]
-                    current_path_cmds.append(f"C {' '.join(fmt(c) for c in coords)}")
-                    current_x, current_y = coords[4], coords[5]
-                    is_subpath_start = False
-                    i += 6
+                # Cubic Bezier: C x1 y1 x2 y2 x y, repeated
+                args = segments[index + 1].split()
+                count = len(args) - len(args) % 6
+                if not count:
+                    continue
+                texts = texts_of(args[:count])
+                for i in range(0, count, 6):
+                    append('C')
+                    parts.extend(texts[i:i + 6])
+                current_x, current_y = args[count - 2], args[count - 1]
+                is_subpath_start = False
             elif cmd == 'Z':
-                current_path_cmds.append("Z")
+                append('Z')
                 current_x, current_y = subpath_start_x, subpath_start_y
-                # is_subpath_start remains False usually? 
-                pass
             elif cmd == 'N':
-                # End subpath - Flush current path
-                if current_path_cmds:
-                    subpaths.append({
-                        'd': " ".join(current_path_cmds),
-                        'fill': current_fill,
-                        'stroke': current_stroke
-                    })
-                    current_path_cmds = []
-                # Reset defaults for next subpath? 
-                # ODF spec is vague but typically S/F resets or applies per subpath.
-                # In common implementations, flags apply to the subpath they appear in (at end).
-                # We assume flags (S, F) seen *before* N apply to the *just finished* subpath.
-                # So we actually need to capture flags *before* processing N?
-                # Wait, 'F' and 'S' are commands.
-                # If we see F, we set current_fill = False.
-                # If we see N, we commit.
-                # Reset for next path?
+                # End subpath - flags (S, F) seen before N apply to the just finished subpath
+                if parts:
+                    subpaths.append({'d': " ".join(parts), 'fill': current_fill, 'stroke': current_stroke})
+                    parts.clear()
                 current_fill = True
                 current_stroke = True
                 is_subpath_start = True
-                
             elif cmd == 'F':
                 # No Fill for current subpath
                 current_fill = False
-
             elif cmd == 'S':
                 # No Stroke for current subpath
                 current_stroke = False
-
             elif cmd == 'X' or cmd == 'Y':
-                # Treated as Arc (Quarter Ellipse) for Round Rectangles
-                # Abs target: x y
-                if i + 1 < len(resolved_tokens):
-                    x = resolved_tokens[i]
-                    y = resolved_tokens[i+1]
-                    
+                # Treated as Arc (Quarter Ellipse) for Round Rectangles, repeated as the same command
+                args = segments[index + 1].split()
+                count = len(args) - len(args) % 2
+                for i in range(0, count, 2):
+                    x = value_of(args[i])
+                    y = value_of(args[i + 1])
                     # Calculate radii based on distance
-                    rx = abs(x - current_x)
-                    ry = abs(y - current_y)
-                    
+                    rx = abs(x - value_of(current_x))
+                    ry = abs(y - value_of(current_y))
                     # A rx ry rot large_arc sweep x y
                     # Sweep 0 is usually correct for convex corners in standard ODF paths
-                    current_path_cmds.append(f"A {fmt(rx)} {fmt(ry)} 0 0 0 {fmt(x)} {fmt(y)}")
-                    
-                    current_x, current_y = x, y
+                    append(f"A {fmt(rx)} {fmt(ry)} 0 0 0 {text_of(args[i])} {text_of(args[i + 1])}")
+                    current_x, current_y = args[i], args[i + 1]
                     is_subpath_start = False
-                    i += 2
             elif cmd == 'U':
-                # Angle Ellipse: U cx cy rx ry start end
-                if i + 5 < len(resolved_tokens):
-                    args = resolved_tokens[i:i+6]
-                    cx, cy, rx, ry, start_deg, end_deg = args
-                    
-                    start_rad = math.radians(start_deg)
-                    end_rad = math.radians(end_deg)
-                    
-                    sx = cx + rx * math.cos(start_rad)
-                    sy = cy + ry * math.sin(start_rad)
-                    
-                    # implicit move/line logic
-                    action = 'M' if is_subpath_start else 'L'
-                    current_path_cmds.append(f"{action} {fmt(sx)} {fmt(sy)}")
-                    
-                    # Draw arcs
-                    if abs(end_deg - start_deg) >= 360:
-                        mid_rad = start_rad + math.pi
-                        mid_x = cx + rx * math.cos(mid_rad)
-                        mid_y = cy + ry * math.sin(mid_rad)
-                        end_x = cx + rx * math.cos(end_rad)
-                        end_y = cy + ry * math.sin(end_rad)
-                        
-                        current_path_cmds.append(f"A {fmt(rx)} {fmt(ry)} 0 1 1 {fmt(mid_x)} {fmt(mid_y)}")
-                        current_path_cmds.append(f"A {fmt(rx)} {fmt(ry)} 0 1 1 {fmt(end_x)} {fmt(end_y)}")
-                    else:
-                        ex = cx + rx * math.cos(end_rad)
-                        ey = cy + ry * math.sin(end_rad)
-                        delta = end_deg - start_deg
-                        large = 1 if abs(delta) > 180 else 0
-                        sweep = 1 # Clockwise usually
-                        current_path_cmds.append(f"A {fmt(rx)} {fmt(ry)} 0 {large} {sweep} {fmt(ex)} {fmt(ey)}")
-                    
-                    # Update current pos (end of arc)
-                    current_x = cx + rx * math.cos(end_rad)
-                    current_y = cy + ry * math.sin(end_rad)
-                    is_subpath_start = False
-                    i += 6
-            else:
-                # Unknown command? skip
-                if cmd is None:
-                    i += 1
-                pass
+                # Angle Ellipse: U cx cy rx ry start end (further coordinates are ignored)
+                args = segments[index + 1].split()
+                if len(args) < 6:
+                    continue
+                cx, cy, rx, ry, start_deg, end_deg = (value_of(token) for token in args[:6])
+                
+                start_rad = math.radians(start_deg)
+                end_rad = math.radians(end_deg)
+                
+                sx = cx + rx * math.cos(start_rad)
+                sy = cy + ry * math.sin(start_rad)
+                
+                # implicit move/line logic
+                action = 'M' if is_subpath_start else 'L'
+                append(f"{action} {fmt(sx)} {fmt(sy)}")
+                
+                # Draw arcs
+                end_x = cx + rx * math.cos(end_rad)
+                end_y = cy + ry * math.sin(end_rad)
+                if abs(end_deg - start_deg) >= 360:
+                    mid_rad = start_rad + math.pi
+                    mid_x = cx + rx * math.cos(mid_rad)
+                    mid_y = cy + ry * math.sin(mid_rad)
+                    append(f"A {fmt(rx)} {fmt(ry)} 0 1 1 {fmt(mid_x)} {fmt(mid_y)}")
+                    append(f"A {fmt(rx)} {fmt(ry)} 0 1 1 {fmt(end_x)} {fmt(end_y)}")
+                else:
+                    delta = end_deg - start_deg
+                    large = 1 if abs(delta) > 180 else 0
+                    sweep = 1 # Clockwise usually
+                    append(f"A {fmt(rx)} {fmt(ry)} 0 {large} {sweep} {fmt(end_x)} {fmt(end_y)}")
+                
+                # Update current pos (end of arc), as tokens: repr round-trips the floats
+                current_x, current_y = repr(end_x), repr(end_y)
+                is_subpath_start = False
+            # Unknown commands and their coordinates are skipped
                 
         # Flush any remaining commands
-        if current_path_cmds:
-            subpaths.append({
-                'd': " ".join(current_path_cmds),
-                'fill': current_fill,
-                'stroke': current_stroke
-            })
+        if parts:
+            subpaths.append({'d': " ".join(parts), 'fill': current_fill, 'stroke': current_stroke})
 
         return subpaths
     
+    def _cached_shape_render(self, key: Hashable, render: Callable[[], str]) -> str:
+        """Return render() through the runtime shape cache.
+
+        The path simplification statistics of the render are cached with its result and
+        counted again on every hit, so they don't depend on what the cache holds.
+        """
+        stats = self.path_simplify_stats
+        cached = self.runtime.shape_cache.get(key)
+        if cached is None:
+            before = dict(stats)
+            rendered = render()
+            cached = (rendered, {name: stats[name] - before[name] for name in stats})
+            self.runtime.shape_cache.put(key, cached)
+        else:
+            for name, count in cached[1].items():
+                stats[name] += count
+        return cached[0]
+
+    def _simplify_path_run(self, cmd: str, args: list[str], texts: list[str], current_x: str, current_y: str,
+                           value_of: Callable[[str], float], tolerance: float) -> list[str]:
+        """Return the coordinate texts of an M/L run left after simplification."""
+        xs = [value_of(token) for token in args[0::2]]
+        ys = [value_of(token) for token in args[1::2]]
+        # A line run continues the polyline from the current point, which is already emitted
+        offset = 0
+        if cmd == 'L':
+            xs.insert(0, value_of(current_x))
+            ys.insert(0, value_of(current_y))
+            offset = 1
+        kept = simplify_polyline(xs, ys, tolerance)
+        if offset:
+            kept = kept[1:]
+        stats = self.path_simplify_stats
+        stats['points'] += len(args) // 2
+        if len(kept) == len(args) // 2:
+            return texts
+        simplified = []
+        for i in kept:
+            i = (i - offset) * 2
+            simplified.append(texts[i])
+            simplified.append(texts[i + 1])
+        stats['removed_points'] += (len(texts) - len(simplified)) // 2
+        # Each removed point was emitted as three space separated tokens 'L x y'
+        stats['removed_bytes'] += sum(map(len, texts)) - sum(map(len, simplified)) + (len(texts) - len(simplified)) // 2 * 4
+        return simplified
+
+    # Symbols of the rect and ellipse drawings in a unit viewBox; the stroke keeps its width in pixels
+    _UNIT_RECT_SYMBOL = ('<rect width="1" height="1" fill="#e0e0e0" stroke="#333" stroke-width="2"'
+                         ' vector-effect="non-scaling-stroke"/>')
+    _UNIT_ELLIPSE_SYMBOL = ('<ellipse cx="0.5" cy="0.5" rx="0.5" ry="0.5" fill="#e0e0e0" stroke="#333" stroke-width="2"'
+                            ' vector-effect="non-scaling-stroke"/>')
+
     def _process_drawing_rect(self, frame: ET.Element, rect: ET.Element, style_parts: list) -> str:
         """Process a rectangle drawing."""
         width = frame.get(f"{{{NAMESPACES['svg']}}}width", "100px")
@@ -2400,12 +4021,17 @@ class OdtToHtmlConverter:
         svg_width = self._dimension_to_px(width)
         svg_height = self._dimension_to_px(height)
         
-        svg = (
-            f'<svg width="{svg_width}" height="{svg_height}" xmlns="http://www.w3.org/2000/svg">'
+        rect_html = (
             f'<rect x="2" y="2" width="{svg_width-4}" height="{svg_height-4}"'
             ' fill="#e0e0e0" stroke="#333" stroke-width="2"/>'
-            '</svg>'
         )
+        svg = f'<svg width="{svg_width}" height="{svg_height}" xmlns="http://www.w3.org/2000/svg">{rect_html}</svg>'
+        if self.svg_symbols:
+            # One unit square symbol for all sizes, placed and sized by each <use>
+            svg = self._use_svg_symbol(
+                ('rect',), lambda: ('0 0 1 1', self._UNIT_RECT_SYMBOL), lambda: svg, svg_width, svg_height,
+                use_attributes=f' x="2" y="2" width="{svg_width-4}" height="{svg_height-4}"',
+            )
         
         style_str = "; ".join(style_parts)
         if "position" not in style_str and "display" not in style_str:
@@ -2420,12 +4046,16 @@ class OdtToHtmlConverter:
         svg_width = self._dimension_to_px(width)
         svg_height = self._dimension_to_px(height)
         
-        svg = (
-            f'<svg width="{svg_width}" height="{svg_height}" xmlns="http://www.w3.org/2000/svg">'
+        ellipse_html = (
             f'<ellipse cx="{svg_width/2}" cy="{svg_height/2}" rx="{svg_width/2-2}" ry="{svg_height/2-2}"'
             ' fill="#e0e0e0" stroke="#333" stroke-width="2"/>'
-            '</svg>'
         )
+        svg = f'<svg width="{svg_width}" height="{svg_height}" xmlns="http://www.w3.org/2000/svg">{ellipse_html}</svg>'
+        if self.svg_symbols:
+            svg = self._use_svg_symbol(
+                ('ellipse',), lambda: ('0 0 1 1', self._UNIT_ELLIPSE_SYMBOL), lambda: svg, svg_width, svg_height,
+                use_attributes=f' x="2" y="2" width="{svg_width-4}" height="{svg_height-4}"',
+            )
         
         style_str = "; ".join(style_parts)
         if "position" not in style_str and "display" not in style_str:
@@ -2459,29 +4089,78 @@ class OdtToHtmlConverter:
             style_str += "; display: inline-block"
         return f'<div class="drawing" style="{style_str}">{svg}</div>'
     
+    # Placeholder emitted for a shape until its geometry is known to be repeated or not,
+    # NUL is not allowed in XML so it cannot come from the document text
+    _SVG_SYMBOL_PLACEHOLDER_PATTERN = re.compile('\x00svg-symbol:(\\d+)\x00')
+
+    def _use_svg_symbol(self, key: Hashable, render_symbol: Callable[[], tuple[Optional[str], str]],
+                        render_svg: Callable[[], str], width, height, attributes: str = "", use_attributes: str = "") -> str:
+        """Return a placeholder for a shape whose geometry may be shared as a document symbol.
+
+        Shapes with the same key share the symbol rendered by render_symbol(), which returns
+        its viewBox (None for user units) and content. The placeholders are replaced by
+        _resolve_svg_symbols: geometry used once is inlined with render_svg(), repeated
+        geometry becomes an <svg> of the given size and attributes referencing the symbol,
+        with a <use> of the given attributes (e.g. its position and size).
+        """
+        symbol = self._use_svg_symbol_definition(key, render_symbol, render_svg)
+        symbol['count'] += 1
+        self.svg_symbol_uses.append((symbol, (
+            f'<svg width="{width}" height="{height}"{attributes} xmlns="http://www.w3.org/2000/svg">'
+        ), use_attributes))
+        return f"\x00svg-symbol:{len(self.svg_symbol_uses) - 1}\x00"
+
+    def _use_svg_symbol_definition(self, key: Hashable, render_symbol: Callable[[], tuple[Optional[str], str]],
+                                   render_svg: Callable[[], str]) -> dict:
+        """Return the document symbol of a geometry key, numbered in order of first use."""
+        symbol = self.svg_symbols_by_key.get(key)
+        if symbol is None:
+            symbol = {
+                'id': f"odt-symbol-{len(self.svg_symbols_by_key)}",
+                'key': key,
+                'count': 0,
+                'render_symbol': render_symbol,
+                'render_svg': render_svg,
+            }
+            self.svg_symbols_by_key[key] = symbol
+        return symbol
+
+    def _resolve_svg_symbols(self, html_body: str) -> str:
+        """Replace the shape placeholders and prepend the definitions of repeated geometry."""
+        def resolve(match):
+            symbol, svg, use_attributes = self.svg_symbol_uses[int(match[1])]
+            if symbol['count'] > 1:
+                return f'{svg}<use href="#{symbol["id"]}"{use_attributes}/></svg>'
+            return symbol['render_svg']()
+
+        html_body = self._SVG_SYMBOL_PLACEHOLDER_PATTERN.sub(resolve, html_body)
+        symbols = []
+        for symbol in self.svg_symbols_by_key.values():
+            if symbol['count'] > 1:
+                view_box, content = symbol['render_symbol']()
+                if view_box is None:
+                    symbols.append(f'<symbol id="{symbol["id"]}">{content}</symbol>')
+                else:
+                    # The stroke may overflow the symbol viewport, the referencing <svg> clips it
+                    symbols.append(f'<symbol id="{symbol["id"]}" viewBox="{view_box}" preserveAspectRatio="none"'
+                                   f' overflow="visible">{content}</symbol>')
+        if not symbols:
+            return html_body
+        symbols_html = "\n".join(symbols)
+        return (
+            '<svg xmlns="http://www.w3.org/2000/svg" width="0" height="0" aria-hidden="true" style="position: absolute">'
+            f'<defs>{symbols_html}</defs>'
+            '</svg>\n'
+        ) + html_body
+
     def _dimension_to_px(self, dim: str) -> float:
         """Convert an ODF dimension to pixels."""
         if not dim:
             return 100
-        
-        dim = dim.strip()
-        
-        # Remove unit and convert
-        if dim.endswith('cm'):
-            return float(dim[:-2]) * 37.795275591  # 1cm = 37.8px
-        elif dim.endswith('mm'):
-            return float(dim[:-2]) * 3.7795275591  # 1mm = 3.78px
-        elif dim.endswith('in'):
-            return float(dim[:-2]) * 96  # 1in = 96px
-        elif dim.endswith('pt'):
-            return float(dim[:-2]) * 1.333  # 1pt = 1.33px
-        elif dim.endswith('px'):
-            return float(dim[:-2])
-        else:
-            try:
-                return float(dim)
-            except ValueError:
-                return 100
+        length = parse_odf_length(dim)
+        if length is None or length.px is None:
+            return 100
+        return length.px
     
     def _process_text_box(self, text_box: ET.Element, style_parts: list) -> str:
         """Process a text box element."""
@@ -2500,14 +4179,16 @@ class OdtToHtmlConverter:
         style_name = list_elem.get(f"{{{NAMESPACES['text']}}}style-name", "")
         
         # use the applied style as default
-        if style_name == '' and self.list_style_name_stack:
-            style_name = self.list_style_name_stack[-1]
-        self.list_style_name_stack.append(style_name)
+        context = self._context()
+        list_style_name_stack = context.list_style_name_stack
+        if style_name == '' and list_style_name_stack:
+            style_name = list_style_name_stack[-1]
+        list_style_name_stack.append(style_name)
         
         # Determine list type (ordered or unordered)
         list_type = 'ul'
-        if style_name in self.list_styles:
-            level_info = self.list_styles[style_name].get(str(level), {})
+        if style_name in context.list_styles:
+            level_info = context.list_styles[style_name].get(str(level), {})
             if level_info.get('type') == 'number':
                 list_type = 'ol'
         
@@ -2519,7 +4200,7 @@ class OdtToHtmlConverter:
         
         result = f'<{list_type}>{"".join(items_html)}</{list_type}>'
 
-        self.list_style_name_stack.pop()
+        list_style_name_stack.pop()
         return result
     
     def _process_list_item(self, item: ET.Element, list_style: str, level: int) -> str:
@@ -2580,7 +4261,8 @@ class OdtToHtmlConverter:
     def _process_table_cell(self, cell: ET.Element, cell_tag: str) -> str:
         """Process a table cell element."""
         style_name = cell.get(f"{{{NAMESPACES['table']}}}style-name", "")
-        style_str = self._get_style_string(style_name)
+        # NOTE: isolated as the default th/td css overrides inherited properties
+        style_str = self._enter_style_context(style_name, isolate=True)
         
         # Handle colspan and rowspan
         colspan = cell.get(f"{{{NAMESPACES['table']}}}number-columns-spanned", "")
@@ -2606,6 +4288,7 @@ class OdtToHtmlConverter:
                 content_parts.append(self._process_list(child))
         
         content = "<br>".join(content_parts) if content_parts else "&nbsp;"
+        self._exit_style_context()
         
         return f'<{cell_tag}{attr_str}>{content}</{cell_tag}>'
     
@@ -2679,6 +4362,16 @@ class OdtToHtmlConverter:
         'Noto Sans CJK TC': "'Noto Sans CJK TC', 'Microsoft JhengHei', 'SimHei', sans-serif",
     }
 
+    # CSS generic families of the ODF style:font-family-generic values
+    _FONT_GENERIC_MAP = {
+        'roman': 'serif',
+        'swiss': 'sans-serif',
+        'modern': 'monospace',
+        'script': 'cursive',
+        'decorative': 'fantasy',
+        'system': 'system-ui',
+    }
+
     def _minify_css(self, content):
         """
         Minify css but preserve newline for minimal readablity.
@@ -2704,21 +4397,6 @@ class OdtToHtmlConverter:
 
     def _wrap_html(self, body_content: str, title: str = "") -> str:
         """Wrap the body content in a complete HTML document."""
-        # Build font-family CSS variables for commonly used fonts
-        # Map ODF fonts to system font stacks for offline viewing
-        font_stack_map = self._FONT_STACK_MAP
-        
-        # Generate CSS custom properties for fonts used in the document
-        font_css_vars = []
-        for style_props in self.styles.values():
-            if 'font-family' in style_props:
-                font = style_props['font-family'].strip("'\"")
-                if ',' in font:
-                    font = font.split(',')[0].strip().strip("'\"")
-                if font in font_stack_map:
-                    # Update the style to use the full font stack
-                    style_props['font-family'] = font_stack_map[font]
-        
         main_css = """
         body {
             position: relative;
@@ -2917,24 +4595,10 @@ class OdtToHtmlConverter:
         )
         return result
 
-def main():
-    parser = argparse.ArgumentParser(
-        description='Convert ODT files to standalone HTML with embedded resources.',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog='''
-Examples:
-    python odt_to_html.py document.odt output.html
-    python odt_to_html.py document.odt output.html --no-page-breaks
-    python odt_to_html.py "path/to/input document.odt" "path/to/output.html"
-'''
-    )
-    parser.add_argument('input', help='Path to the input ODT file')
-    parser.add_argument('output', help='Path for the output HTML file')
+def _add_converter_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the converter options shared by the single file and batch command lines."""
     parser.add_argument('--show-page-breaks', nargs='?', const=True, default=False, type=str_to_bool,
                         help='Show page break character in output HTML (default: False)')
-                        
-    # Title extraction arguments
-    parser.add_argument('--title', help='Specify the title explicitly', default=None)
     
     # Feature flags for title extraction
     parser.add_argument('--title-from-metadata', nargs='?', const=True, default=True, type=str_to_bool,
@@ -2946,55 +4610,1006 @@ Examples:
     parser.add_argument('--title-fallback', help='Fallback title if no other title found', default=None)
     parser.add_argument('--title-from-filename', nargs='?', const=True, default=False, type=str_to_bool,
                         help='Use filename as title if no other title found (default: False). Use --title-from-filename=1 to enable.')
+    parser.add_argument('--css-inherit-elimination', nargs='?', const=True, default=False, type=str_to_bool,
+                        help='Omit inline CSS declarations already inherited from the enclosing element (default: False).')
+    parser.add_argument('--svg-symbols', nargs='?', const=True, default=False, type=str_to_bool,
+                        help='Define shape geometry once as SVG symbols referenced by <use> (default: False).')
+    parser.add_argument('--path-simplify-tolerance', type=float, default=0.0,
+                        help='Simplify custom shape lines, dropping points closer than this in viewBox units (default: 0, disabled).')
+    parser.add_argument('--parallel-pages-threshold', type=int, default=0,
+                        help='Render the pages of documents with at least this many pages in worker processes (default: 0, disabled).')
+
+
+def _config_from_args(args: argparse.Namespace) -> OdtToHtmlConverterConfig:
+    return OdtToHtmlConverterConfig(
+        show_page_breaks=args.show_page_breaks,
+        title_from_metadata=args.title_from_metadata,
+        title_from_styled_title=args.title_from_styled_title,
+        title_from_h1=args.title_from_h1,
+        title_from_filename=args.title_from_filename,
+        title_fallback=args.title_fallback,
+        css_inherit_elimination=args.css_inherit_elimination,
+        svg_symbols=args.svg_symbols,
+        path_simplify_tolerance=args.path_simplify_tolerance,
+        parallel_pages_threshold=args.parallel_pages_threshold,
+    )
+
+
+_GLOB_MAGIC_PATTERN = re.compile(r'[*?[]')
+_WATCH_POLL_INTERVAL = 0.25
+
+
+def collect_batch_files(inputs: list[str], output_dir: StrPath) -> list[tuple[Path, Path]]:
+    """Expand files, directories and glob patterns into (input, output) path pairs.
+
+    Directories are searched recursively for .odt files. The outputs mirror the tree
+    below each directory, or below the non-wildcard prefix of a glob pattern, in output_dir.
+    Raise ValueError if several inputs would be written to the same output file.
+    """
+    output_dir = Path(output_dir)
+    pairs = []
+    seen = set()
+    outputs: dict[str, Path] = {}
+    conflicts = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            base = path
+            files = sorted(p for p in path.rglob('*') if p.suffix.lower() == '.odt' and p.is_file())
+        elif _GLOB_MAGIC_PATTERN.search(item):
+            base = Path(*[part for part in itertools.takewhile(lambda part: not _GLOB_MAGIC_PATTERN.search(part), path.parts)])
+            files = sorted(p for p in map(Path, glob.glob(item, recursive=True)) if p.is_file())
+        else:
+            # Single files (missing ones are reported by the conversion)
+            base = path.parent
+            files = [path]
+        for file in files:
+            key = file.resolve()
+            if key in seen:
+                continue
+            seen.add(key)
+            output = output_dir / file.relative_to(base).with_suffix('.html')
+            other = outputs.setdefault(os.path.normcase(output), file)
+            if other is not file:
+                conflicts.append(f"{file} and {other} both convert to {output}")
+                continue
+            pairs.append((file, output))
+    if conflicts:
+        raise ValueError("Duplicate output files: " + "; ".join(conflicts))
+    return pairs
+
+
+class DocumentFingerprint(NamedTuple):
+    size: int
+    mtime_ns: int
+    digest: bytes
+
+
+def document_fingerprint(path: StrPath) -> DocumentFingerprint:
+    """Size, modification time and content digest of a document.
+
+    The digest of a zip file only hashes the names, CRCs and sizes of its central
+    directory, without reading the members; other files are hashed whole.
+    """
+    stat = os.stat(path)
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with zipfile.ZipFile(path) as odt:
+            for info in odt.infolist():
+                digest.update(f"{info.filename}\0{info.CRC}\0{info.file_size}\n".encode('utf-8'))
+    except (zipfile.BadZipFile, OSError):
+        digest = hashlib.blake2b(Path(path).read_bytes(), digest_size=16)
+    return DocumentFingerprint(stat.st_size, stat.st_mtime_ns, digest.digest())
+
+
+class BatchWatcher:
+    """Finds the changed documents of batch inputs, for the batch --watch mode.
+
+    A document is reported once its size and modification time have stayed the same for
+    ``debounce`` seconds, so a save in progress (or several in a row) is converted once.
+    Documents saved again with the same content, according to their fingerprint, are not
+    reported.
+    """
+    def __init__(self, inputs: list[str], output_dir: StrPath, debounce: float = 0.5):
+        self.inputs = inputs
+        self.output_dir = output_dir
+        self.debounce = debounce
+        self._fingerprints: dict[Path, DocumentFingerprint] = {}
+        # Changed documents waiting to settle: (size, mtime_ns) and when it was first seen
+        self._settling: dict[Path, tuple[tuple[int, int], float]] = {}
+
+    def snapshot(self, pairs: list[tuple[Path, Path]]) -> None:
+        """Record the current state of the documents, before converting them all."""
+        for input_path, _ in pairs:
+            with contextlib.suppress(OSError):
+                self._fingerprints[input_path] = document_fingerprint(input_path)
+
+    def poll(self, now: Optional[float] = None) -> list[tuple[Path, Path]]:
+        """Return the (input, output) pairs of the documents to convert again."""
+        now = time.monotonic() if now is None else now
+        changed = []
+        found = set()
+        for input_path, output_path in collect_batch_files(self.inputs, self.output_dir):
+            try:
+                stat = input_path.stat()
+            except OSError:
+                continue
+            found.add(input_path)
+            state = (stat.st_size, stat.st_mtime_ns)
+            known = self._fingerprints.get(input_path)
+            if known is not None and (known.size, known.mtime_ns) == state:
+                self._settling.pop(input_path, None)
+                continue
+            settling = self._settling.get(input_path)
+            if settling is None or settling[0] != state:
+                self._settling[input_path] = (state, now)
+                continue
+            if now - settling[1] < self.debounce:
+                continue
+            del self._settling[input_path]
+            try:
+                fingerprint = document_fingerprint(input_path)
+            except OSError:
+                continue
+            self._fingerprints[input_path] = fingerprint
+            if known is None or fingerprint.digest != known.digest:
+                changed.append((input_path, output_path))
+        for input_path in set(self._fingerprints).difference(found):
+            del self._fingerprints[input_path]
+        for input_path in set(self._settling).difference(found):
+            del self._settling[input_path]
+        return changed
+
+
+class DocumentCost(NamedTuple):
+    """Conversion cost estimate of a document, from its zip central directory."""
+    size: int
+    content_size: int
+    media_size: int
+    draw_entries: int
+
+    @property
+    def weight(self) -> float:
+        # Relative cost: the content XML is parsed and rendered, the media only copied (or
+        # base64-encoded) and each embedded picture or object also costs a frame to render
+        return self.content_size + _COST_MEDIA_WEIGHT * self.media_size + _COST_PER_DRAW_ENTRY * self.draw_entries
+
+
+_COST_MEDIA_WEIGHT = 0.25
+_COST_PER_DRAW_ENTRY = 16 * 1024
+_DRAW_ENTRY_DIRECTORIES = ('Pictures/', 'Media/', 'ObjectReplacements/', 'Object ')
+
+
+def estimate_conversion_cost(path: StrPath) -> DocumentCost:
+    """Estimate the cost of converting a document without decompressing it.
+
+    Uses the uncompressed size of content.xml, the byte count of the other members
+    (pictures, media, embedded objects) and the number of picture and object entries,
+    which are drawn by draw: frames. Unreadable files cost their size.
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return DocumentCost(0, 0, 0, 0)
+    try:
+        with zipfile.ZipFile(path) as odt:
+            infos = odt.infolist()
+    except (zipfile.BadZipFile, OSError):
+        return DocumentCost(size, size, 0, 0)
+    content_size = media_size = draw_entries = 0
+    for info in infos:
+        if info.is_dir():
+            continue
+        if info.filename == 'content.xml':
+            content_size = info.file_size
+        elif not info.filename.endswith('.xml') and info.filename not in ('mimetype', 'manifest.rdf') \
+                and not info.filename.startswith('Thumbnails/'):
+            media_size += info.file_size
+            if info.filename.startswith(_DRAW_ENTRY_DIRECTORIES):
+                draw_entries += 1
+    return DocumentCost(size, content_size, media_size, draw_entries)
+
+
+class BatchProgress:
+    """Progress of a batch: files and input bytes done, ETA and utilization of the workers.
+
+    The ETA extrapolates the rate of the estimated cost (DocumentCost.weight) done so
+    far; a worker utilization is its conversion time over the time since the start.
+    """
+    def __init__(self, costs: dict[Path, DocumentCost], workers: int):
+        self.costs = costs
+        self.workers = workers
+        self.files = 0
+        self.size = 0
+        self.weight = 0.0
+        self.total_size = sum(cost.size for cost in costs.values())
+        self.total_weight = sum(cost.weight for cost in costs.values())
+        self.busy: dict[str, float] = {}
+        self.start = time.perf_counter()
+
+    def update(self, record: dict) -> None:
+        cost = self.costs.get(Path(record['input']))
+        if cost is not None:
+            self.size += cost.size
+            self.weight += cost.weight
+        self.files += 1
+        worker = record.get('worker')
+        if worker is not None:
+            self.busy[worker] = self.busy.get(worker, 0.0) + record['duration']
+
+    def eta(self, now: Optional[float] = None) -> Optional[float]:
+        """Estimated seconds until the batch is done, None before the first file."""
+        elapsed = (time.perf_counter() if now is None else now) - self.start
+        if self.weight <= 0:
+            return None
+        return max(0.0, elapsed * (self.total_weight - self.weight) / self.weight)
+
+    def utilization(self, now: Optional[float] = None) -> list[float]:
+        """Busy fraction of each worker that converted a file, busiest first."""
+        elapsed = max((time.perf_counter() if now is None else now) - self.start, 1e-9)
+        return sorted((min(1.0, busy / elapsed) for busy in self.busy.values()), reverse=True)
+
+    def format(self, now: Optional[float] = None) -> str:
+        eta = self.eta(now)
+        eta = '?' if eta is None else f"{int(eta) // 60}:{int(eta) % 60:02d}"
+        utilization = " ".join(f"{busy:.0%}" for busy in self.utilization(now))
+        return (f"{self.files}/{len(self.costs)} files, {self.size / 1e6:.1f}/{self.total_size / 1e6:.1f} MB, "
+                f"ETA {eta}, {len(self.busy)}/{self.workers} workers busy {utilization or '-'}")
+
+
+def convert_file(input_path: StrPath, output_path: StrPath, converter: OdtToHtmlConverter) -> dict:
+    """Convert one file for a batch and return its report record; errors are recorded, not raised."""
+    start = time.perf_counter()
+    record = {'input': str(input_path), 'output': str(output_path)}
+    try:
+        html_content = converter.convert(input_path, title=None)
+        data = html_content.encode('utf-8')
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(data)
+        record.update(status='ok', size=len(data))
+    except Exception as e:
+        record.update(status='error', error=f"{type(e).__name__}: {e}")
+    record['duration'] = round(time.perf_counter() - start, 6)
+    record['worker'] = f"{os.getpid()}:{threading.current_thread().name}"
+    return record
+
+
+# Converter of a runtime process pool worker, kept warm across its tasks
+_worker_converter: Optional[OdtToHtmlConverter] = None
+
+
+def _worker_config(config: OdtToHtmlConverterConfig) -> OdtToHtmlConverterConfig:
+    """The config of a pool worker converter: workers render pages themselves, never on a pool of their own."""
+    return config.model_copy(update={'process_pool_size': 1, 'parallel_pages_threshold': 0})
+
+
+def _init_worker(config: OdtToHtmlConverterConfig) -> None:
+    global _worker_converter
+    _worker_converter = OdtToHtmlConverter(_worker_config(config))
+
+
+def _convert_file_in_worker(input_path: str, output_path: str) -> dict:
+    return convert_file(input_path, output_path, _worker_converter)
+
+
+# Converters of a worker for tasks with another config, sharing the worker runtime caches
+_worker_converters_by_config: dict[str, OdtToHtmlConverter] = {}
+
+
+def _worker_converter_for(config: Optional[OdtToHtmlConverterConfig]) -> OdtToHtmlConverter:
+    if config is None:
+        return _worker_converter
+    config = _worker_config(config)
+    if config == _worker_converter.config:
+        return _worker_converter
+    key = config.model_dump_json()
+    converter = _worker_converters_by_config.get(key)
+    if converter is None:
+        if len(_worker_converters_by_config) >= 16:
+            _worker_converters_by_config.clear()
+        converter = _worker_converters_by_config[key] = OdtToHtmlConverter(config, _worker_converter.runtime)
+    return converter
+
+
+class ConversionResult(NamedTuple):
+    html: str
+    path_simplify_stats: dict
+
+
+def _convert_with(converter: OdtToHtmlConverter, file: Union[StrPath, bytes], title: Optional[str]) -> ConversionResult:
+    context = converter.Context()
+    html = converter.convert(file, title=title, context=context)
+    return ConversionResult(html, context.path_simplify_stats)
+
+
+def _convert_in_worker(file: Union[str, bytes], title: Optional[str],
+                       config: Optional[OdtToHtmlConverterConfig] = None) -> ConversionResult:
+    return _convert_with(_worker_converter_for(config), file, title)
+
+
+def _warm_up_worker() -> int:
+    return os.getpid()
+
+
+def _render_pages_in_worker(config: OdtToHtmlConverterConfig, state: dict, chunk: list[str]) -> dict:
+    converter = _worker_converter_for(config)
+    with converter.conversion_context() as context:
+        for name, value in state.items():
+            setattr(context, name, value)
+        return converter._render_page_chunk(chunk)
+
+
+def convert_files(pairs: list[tuple[StrPath, StrPath]], runtime: OdtToHtmlConverterRuntime,
+                  executor: str = 'process', costs: Optional[dict[Path, DocumentCost]] = None) -> Iterator[dict]:
+    """Convert (input, output) pairs, yielding the report records in completion order.
+
+    With the 'process' executor and more than one worker, the files are converted on the
+    runtime process pool, each worker reusing its converter for all the files it gets.
+    The 'thread' executor shares one converter on the runtime thread pool instead, which
+    runs in parallel on free-threaded Python builds.
+
+    On a pool, the files are dispatched largest first by estimated cost (``costs``, or
+    estimate_conversion_cost), so a large file doesn't start last and keep one worker
+    busy while the others are idle. Files lost with a dying worker process are reported
+    as errors and the batch goes on with a new process pool.
+    """
+    threaded = executor == 'thread'
+    pool_size = runtime.thread_pool_size if threaded else runtime.process_pool_size
+    if pool_size <= 1 or len(pairs) <= 1:
+        converter = OdtToHtmlConverter(runtime.config, runtime)
+        for input_path, output_path in pairs:
+            yield convert_file(input_path, output_path, converter)
+        return
+    costs = costs or {}
+    pairs = sorted(pairs, reverse=True, key=lambda pair: (
+        costs.get(Path(pair[0])) or estimate_conversion_cost(pair[0])).weight)
+    if threaded:
+        converter = OdtToHtmlConverter(runtime.config, runtime)
+        pool = runtime.thread_pool
+
+        def submit(input_path, output_path):
+            return pool.submit(convert_file, input_path, output_path, converter)
+    else:
+        pool = runtime.process_pool
+
+        def submit(input_path, output_path):
+            return pool.submit(_convert_file_in_worker, str(input_path), str(output_path))
+
+    # Only one file per worker is submitted at a time, so a worker process that dies (and
+    # breaks the pool) fails the files in flight, the others go to a new pool
+    waiting = iter(pairs)
+    futures = {}
+    try:
+        while True:
+            for input_path, output_path in itertools.islice(waiting, pool_size - len(futures)):
+                futures[submit(input_path, output_path)] = (input_path, output_path)
+            if not futures:
+                break
+            done, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                input_path, output_path = futures.pop(future)
+                try:
+                    record = future.result()
+                except BrokenProcessPool as e:
+                    runtime.discard_process_pool(pool)
+                    record = {'input': str(input_path), 'output': str(output_path), 'status': 'error',
+                              'error': f"{type(e).__name__}: {e}", 'duration': 0.0}
+                yield record
+            if not threaded:
+                pool = runtime.process_pool
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def batch_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog='odt_to_html.py batch',
+        description='Convert ODT files, directories or glob patterns into an output directory mirroring their tree.',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+    python odt_to_html.py batch docs/ -o html/ --jobs 8
+    python odt_to_html.py batch "docs/**/*.odt" -o html/ --report report.jsonl
+    python odt_to_html.py batch docs/ -o html/ --watch
+'''
+    )
+    parser.add_argument('inputs', nargs='+', help='ODT files, directories (searched recursively) or glob patterns')
+    parser.add_argument('-o', '--output-dir', required=True, help='Directory for the output HTML files')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes or threads (default: number of CPUs)')
+    parser.add_argument('--executor', choices=('auto', 'process', 'thread'), default='auto',
+                        help='Convert on worker processes or threads; auto uses threads when the GIL is disabled (default: auto)')
+    parser.add_argument('--report', help='Write a JSON-lines report with the status, duration and output size of each file')
+    parser.add_argument('--progress', action='store_true',
+                        help='Report the progress (files, input bytes, ETA and worker utilization) on the standard error')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and convert the documents again when they change, until interrupted')
+    parser.add_argument('--debounce', type=float, default=0.5,
+                        help='Seconds a changed document must stay unmodified before it is converted (default: 0.5)')
+    _add_converter_arguments(parser)
+    args = parser.parse_args(argv)
+
+    config = _config_from_args(args)
+    config.process_pool_size = config.thread_pool_size = args.jobs
+    executor = args.executor
+    if executor == 'auto':
+        executor = 'process' if gil_enabled() else 'thread'
+    try:
+        pairs = collect_batch_files(args.inputs, args.output_dir)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if not pairs:
+        print("Error: No ODT files found", file=sys.stderr)
+        return 1
+
+    watcher = None
+    if args.watch:
+        watcher = BatchWatcher(args.inputs, args.output_dir, args.debounce)
+        watcher.snapshot(pairs)
+
+    start = time.perf_counter()
+    failed = 0
+    report = open(args.report, 'w', encoding='utf-8') if args.report else None
+
+    def run(pairs: list[tuple[Path, Path]]) -> int:
+        failed = 0
+        costs = {input_path: estimate_conversion_cost(input_path) for input_path, _ in pairs}
+        progress = BatchProgress(costs, args.jobs) if args.progress else None
+        for record in convert_files(pairs, runtime, executor, costs):
+            if record['status'] == 'ok':
+                print(f"Converted: {record['input']} -> {record['output']} ({record['duration']:.2f}s)")
+            else:
+                failed += 1
+                print(f"Error: {record['input']}: {record['error']}", file=sys.stderr)
+            if report is not None:
+                report.write(json.dumps(record) + "\n")
+                report.flush()
+            if progress is not None:
+                progress.update(record)
+                print(f"Progress: {progress.format()}", file=sys.stderr)
+        return failed
+
+    try:
+        with OdtToHtmlConverterRuntime(config) as runtime:
+            failed = run(pairs)
+            print(f"Converted {len(pairs) - failed} of {len(pairs)} files in {time.perf_counter() - start:.2f}s")
+            if watcher is not None:
+                print("Watching for changes, press Ctrl+C to stop", file=sys.stderr)
+                try:
+                    while True:
+                        time.sleep(_WATCH_POLL_INTERVAL)
+                        try:
+                            changed = watcher.poll()
+                        except ValueError as e:
+                            print(f"Error: {e}", file=sys.stderr)
+                            time.sleep(max(args.debounce, 1.0))
+                            continue
+                        if changed:
+                            run(changed)
+                except KeyboardInterrupt:
+                    return 0
+    finally:
+        if report is not None:
+            report.close()
+    return 1 if failed else 0
+
+
+class ConversionService:
+    """Converts documents on a warm runtime pool, for long-running servers.
+
+    The pool workers are started, with the module imported and a converter built, by
+    ``start()``. At most ``capacity`` conversions are accepted at once: one per worker,
+    plus ``queue_depth`` waiting for a worker; beyond that ``submit`` refuses new work.
+    Conversions may use another config than the service one, their converters share
+    the caches of the service runtime (or of the worker process).
+    """
+    def __init__(self, config: OdtToHtmlConverterConfig, executor: str = 'auto', queue_depth: Optional[int] = None):
+        if executor == 'auto':
+            executor = 'process' if gil_enabled() else 'thread'
+        self.executor = executor
+        self.runtime = OdtToHtmlConverterRuntime(config)
+        self.converter = OdtToHtmlConverter(config, self.runtime)
+        self.workers = self.runtime.thread_pool_size if executor == 'thread' else self.runtime.process_pool_size
+        self.capacity = self.workers + (queue_depth if queue_depth is not None else 2 * self.workers)
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._converters_by_config: dict[str, OdtToHtmlConverter] = {}
+
+    def __enter__(self) -> 'ConversionService':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    @property
+    def pool(self) -> concurrent.futures.Executor:
+        return self.runtime.thread_pool if self.executor == 'thread' else self.runtime.process_pool
+
+    @property
+    def pending(self) -> int:
+        """Number of accepted conversions, running or waiting for a worker."""
+        return self._pending
+
+    def start(self) -> None:
+        """Start the pool workers, so the first requests don't pay for it."""
+        if self.executor == 'process':
+            concurrent.futures.wait([self.pool.submit(_warm_up_worker) for _ in range(self.workers)])
+        else:
+            self.pool
+
+    def _converter_for(self, config: Optional[OdtToHtmlConverterConfig]) -> OdtToHtmlConverter:
+        if config is None or config == self.converter.config:
+            return self.converter
+        key = config.model_dump_json()
+        with self._lock:
+            converter = self._converters_by_config.get(key)
+            if converter is None:
+                if len(self._converters_by_config) >= 16:
+                    self._converters_by_config.clear()
+                converter = self._converters_by_config[key] = OdtToHtmlConverter(config, self.runtime)
+        return converter
+
+    def reserve(self) -> bool:
+        """Take a conversion slot for a later ``submit(..., reserved=True)``, False when the service is saturated.
+
+        Lets a server refuse a request before receiving its document; a reservation that
+        isn't submitted must be given back with release().
+        """
+        if not self._slots.acquire(blocking=False):
+            self.runtime.metrics.increment('rejected')
+            return False
+        with self._lock:
+            self._pending += 1
+        return True
+
+    def submit(self, file: Union[StrPath, bytes], title: Optional[str] = None,
+               config: Optional[OdtToHtmlConverterConfig] = None, reserved: bool = False) -> Optional[concurrent.futures.Future]:
+        """Queue a conversion, returning the future of its ConversionResult, or None when the service is saturated.
+
+        With reserved=True the slot taken by reserve() is handed over: it is released when
+        the conversion ends, or right away if submit raises. A worker process that dies breaks the process pool, its conversions fail with
+        BrokenProcessPool and the pool is replaced for the next ones.
+        """
+        if not reserved and not self.reserve():
+            return None
+        try:
+            if self.executor == 'thread':
+                pool = self.pool
+                future = pool.submit(_convert_with, self._converter_for(config), file, title)
+            else:
+                file = str(file) if isinstance(file, Path) else file
+                try:
+                    pool = self.pool
+                    future = pool.submit(_convert_in_worker, file, title, config)
+                except BrokenProcessPool:
+                    self.runtime.discard_process_pool(pool)
+                    pool = self.pool
+                    future = pool.submit(_convert_in_worker, file, title, config)
+        except BaseException:
+            self.release()
+            raise
+        start = time.perf_counter()
+
+        def done(future):
+            metrics = self.runtime.metrics
+            metrics.observe('service', time.perf_counter() - start)
+            exception = None if future.cancelled() else future.exception()
+            if isinstance(exception, BrokenProcessPool):
+                self.runtime.discard_process_pool(pool)
+            metrics.increment('failed' if future.cancelled() or exception else 'completed')
+            self.release()
+
+        future.add_done_callback(done)
+        return future
+
+    def release(self) -> None:
+        """Give back a conversion slot, see reserve()."""
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def health(self) -> dict:
+        return {
+            'executor': self.executor,
+            'workers': self.workers,
+            'capacity': self.capacity,
+            'pending': self.pending,
+            'metrics': self.runtime.metrics.snapshot(),
+            'caches': self.runtime.cache_info(),
+        }
+
+    def shutdown(self) -> None:
+        self.runtime.shutdown()
+
+
+class ConversionRequestHandler(http.server.BaseHTTPRequestHandler):
+    """HTTP front end of a ConversionService, see make_http_server."""
+    protocol_version = 'HTTP/1.1'
+    server_version = 'odt_to_html'
+    # Seconds a connection may stay idle (or stall sending a document) before it is closed
+    timeout = 60
+
+    def do_GET(self):
+        if urllib.parse.urlsplit(self.path).path != '/health':
+            return self._send_error(404, "Not found")
+        self._send(200, 'application/json', json.dumps(self.server.service.health()).encode('utf-8'))
+
+    def do_POST(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path not in ('/', '/convert'):
+            return self._send_error(404, "Not found")
+        length = self.headers.get('Content-Length')
+        if length is None or not length.isdigit():
+            return self._send_error(411, "Content-Length required", close=True)
+        if int(length) > self.server.max_body_size:
+            return self._send_error(413, "Document too large", close=True)
+        title = urllib.parse.parse_qs(url.query).get('title', [None])[0]
+
+        # Take the slot first, so a saturated service doesn't receive (and buffer) the document
+        service = self.server.service
+        if not service.reserve():
+            return self._send_error(503, "Conversion queue is full", headers={'Retry-After': '1'}, close=True)
+        try:
+            data = self.rfile.read(int(length))
+            if len(data) < int(length):
+                raise ConnectionError("The client closed the connection while sending the document")
+        except BaseException:
+            service.release()
+            raise
+        # submit() owns the reservation from here on, it releases the slot even when it raises
+        future = service.submit(data, title, reserved=True)
+        try:
+            html = future.result().html
+        except (ValueError, KeyError, zipfile.BadZipFile, ET.ParseError) as e:
+            return self._send_error(400, f"Invalid ODT document: {e}")
+        except Exception as e:
+            self.log_error("Conversion failed: %s", traceback.format_exception_only(e)[-1].strip())
+            return self._send_error(500, "Conversion failed")
+        self._send(200, 'text/html; charset=utf-8', html.encode('utf-8'))
+
+    def _send(self, status: int, content_type: str, body: bytes, headers: Optional[dict] = None, close: bool = False):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if close:
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str, headers: Optional[dict] = None, close: bool = False):
+        self._send(status, 'text/plain; charset=utf-8', (message + "\n").encode('utf-8'), headers, close)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class _ConnectionLimitedHTTPServer(http.server.ThreadingHTTPServer):
+    """Threading HTTP server serving at most ``max_connections`` connections at once.
+
+    Each connection has its own thread; the connections beyond the limit get a 503 answer
+    and are closed right away, instead of piling up threads.
+    """
+    daemon_threads = True
+    OVERLOADED_RESPONSE = (b"HTTP/1.1 503 Service Unavailable\r\nContent-Type: text/plain; charset=utf-8\r\n"
+                           b"Content-Length: 20\r\nRetry-After: 1\r\nConnection: close\r\n\r\nToo many connections\n")
+
+    def __init__(self, server_address, handler_class, max_connections: int):
+        super().__init__(server_address, handler_class)
+        self.max_connections = max_connections
+        self._connections = threading.BoundedSemaphore(max_connections)
+
+    def process_request(self, request, client_address):
+        if not self._connections.acquire(blocking=False):
+            with contextlib.suppress(OSError):
+                request.sendall(self.OVERLOADED_RESPONSE)
+            self.shutdown_request(request)
+            return
+        try:
+            super().process_request(request, client_address)
+        except BaseException:
+            self._connections.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._connections.release()
+
+
+def make_http_server(service: ConversionService, host: str = '127.0.0.1', port: int = 8000,
+                     max_body_size: int = 256 * 1024 * 1024, quiet: bool = False,
+                     max_connections: Optional[int] = None) -> http.server.ThreadingHTTPServer:
+    """Create an HTTP server converting POSTed documents with the service; call serve_forever() to run it.
+
+    At most ``max_connections`` connections are served at once (default: 4 per conversion
+    the service accepts), the others are answered 503.
+    """
+    max_connections = max_connections if max_connections is not None else 4 * service.capacity
+    server = _ConnectionLimitedHTTPServer((host, port), ConversionRequestHandler, max_connections)
+    server.service = service
+    server.max_body_size = max_body_size
+    server.quiet = quiet
+    return server
+
+
+def serve_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog='odt_to_html.py serve',
+        description='Serve ODT to HTML conversions over HTTP from a warm worker pool.',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+    python odt_to_html.py serve --port 8000 --jobs 4
+    curl --data-binary @document.odt http://127.0.0.1:8000/convert -o document.html
+'''
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='Port to listen on (default: 8000)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes or threads kept warm (default: number of CPUs)')
+    parser.add_argument('--executor', choices=('auto', 'process', 'thread'), default='auto',
+                        help='Convert on worker processes or threads; auto uses threads when the GIL is disabled (default: auto)')
+    parser.add_argument('--queue-depth', type=int, default=None,
+                        help='Requests waiting for a worker before answering 503 (default: 2 per worker)')
+    parser.add_argument('--max-body-size', type=int, default=256 * 1024 * 1024,
+                        help='Largest accepted document in bytes (default: 256 MiB)')
+    parser.add_argument('--max-connections', type=int, default=None,
+                        help='Connections served at once before answering 503 (default: 4 per accepted conversion)')
+    parser.add_argument('--quiet', action='store_true', help='Do not log requests')
+    _add_converter_arguments(parser)
+    args = parser.parse_args(argv)
+
+    config = _config_from_args(args)
+    config.process_pool_size = config.thread_pool_size = args.jobs
+    with ConversionService(config, args.executor, args.queue_depth) as service:
+        server = make_http_server(service, args.host, args.port, args.max_body_size, args.quiet, args.max_connections)
+        print(f"Serving on http://{args.host}:{server.server_port} with {service.workers} {service.executor} workers, "
+              f"{service.capacity - service.workers} queued requests at most")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    return 0
+
+
+class _StreamArgumentParser(argparse.ArgumentParser):
+    """Argument parser printing its help and errors to given streams instead of sys.stdout/sys.stderr."""
+    def __init__(self, *args, stdout: IO[str], stderr: IO[str], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stdout = stdout
+        self.stderr = stderr
+
+    def _print_message(self, message, file=None):
+        if message:
+            (self.stderr if file is sys.stderr else self.stdout).write(message)
+
+
+def convert_main(argv: list[str], stdout: Optional[IO[str]] = None, stderr: Optional[IO[str]] = None,
+                 cwd: Optional[StrPath] = None, service: Optional[ConversionService] = None) -> int:
+    """The single file command line, returning its exit code.
+
+    Relative paths are resolved against ``cwd``. With a ``service`` the conversion runs on
+    its warm pool instead of in-process, this is how the daemon serves its clients.
+    """
+    stdout = stdout if stdout is not None else sys.stdout
+    stderr = stderr if stderr is not None else sys.stderr
+    parser = _StreamArgumentParser(
+        prog='odt_to_html.py',
+        description='Convert ODT files to standalone HTML with embedded resources.',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+    python odt_to_html.py document.odt output.html
+    python odt_to_html.py document.odt output.html --no-page-breaks
+    python odt_to_html.py "path/to/input document.odt" "path/to/output.html"
+    python odt_to_html.py document.odt - > output.html
+    python odt_to_html.py batch docs/ -o html/ --jobs 8 --report report.jsonl
+    python odt_to_html.py serve --port 8000 --jobs 4
+    python odt_to_html.py daemon &
+    python odt_to_html_client.py document.odt output.html
+''',
+        stdout=stdout,
+        stderr=stderr,
+    )
+    parser.add_argument('input', help='Path to the input ODT file')
+    parser.add_argument('output', help='Path for the output HTML file, - for the standard output')
+    parser.add_argument('--title', help='Specify the title explicitly', default=None)
+    _add_converter_arguments(parser)
     
-    args = parser.parse_args()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 2
     
     input_path = Path(args.input)
-    output_path = Path(args.output)
+    output_path = None if args.output == '-' else Path(args.output)
+    base = Path(cwd) if cwd is not None else Path()
     
     # Validate input file
-    if not input_path.exists():
-        print(f"Error: Input file not found: {input_path}", file=sys.stderr)
-        sys.exit(1)
+    if not (base / input_path).exists():
+        print(f"Error: Input file not found: {input_path}", file=stderr)
+        return 1
     
     if not input_path.suffix.lower() == '.odt':
-        print(f"Warning: Input file does not have .odt extension: {input_path}", file=sys.stderr)
+        print(f"Warning: Input file does not have .odt extension: {input_path}", file=stderr)
     
-    config = OdtToHtmlConverterConfig(
-        show_page_breaks=args.show_page_breaks,
-        title_from_metadata=args.title_from_metadata,
-        title_from_styled_title=args.title_from_styled_title,
-        title_from_h1=args.title_from_h1,
-        title_from_filename=args.title_from_filename,
-        title_fallback=args.title_fallback,
-    )
+    config = _config_from_args(args)
     
     try:
-        converter = OdtToHtmlConverter(config)
-        html_content = converter.convert(input_path, title=args.title)
+        if service is None:
+            result = _convert_with(OdtToHtmlConverter(config), base / input_path, args.title)
+        else:
+            future = service.submit(base / input_path, args.title, config)
+            if future is None:
+                print("Error: The conversion daemon is busy, try again later", file=stderr)
+                return 1
+            result = future.result()
+        
+        if output_path is None:
+            stdout.write(result.html)
+            stdout.flush()
+            return 0
         
         # Ensure output directory exists
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        (base / output_path).parent.mkdir(parents=True, exist_ok=True)
         
         # Write output
-        output_path.write_text(html_content, encoding='utf-8', newline='\n')
+        (base / output_path).write_text(result.html, encoding='utf-8', newline='\n')
         
-        print(f"Successfully converted: {input_path} -> {output_path}")
+        print(f"Successfully converted: {input_path} -> {output_path}", file=stdout)
+        if config.path_simplify_tolerance > 0:
+            stats = result.path_simplify_stats
+            print(f"Path simplification: removed {stats['removed_points']} of {stats['points']} points, "
+                  f"{stats['removed_bytes']} bytes of path data", file=stdout)
+        return 0
         
     except FileNotFoundError as e:
-        print(f"Error: {e}", file=sys.stderr)
-        sys.exit(1)
+        print(f"Error: {e}", file=stderr)
+        return 1
     except ValueError as e:
-        print(f"Error: {e}", file=sys.stderr)
-        sys.exit(1)
+        print(f"Error: {e}", file=stderr)
+        return 1
     except ET.ParseError as e:
-        print(f"Error parsing ODT content: {e}", file=sys.stderr)
-        sys.exit(1)
+        print(f"Error parsing ODT content: {e}", file=stderr)
+        return 1
     except Exception as e:
-        print(f"Unexpected error: {e}", file=sys.stderr)
-        traceback.print_exception(e)
-        print("Exit due to error.")
-        sys.exit(1)
+        print(f"Unexpected error: {e}", file=stderr)
+        traceback.print_exception(e, file=stderr)
+        print("Exit due to error.", file=stdout)
+        return 1
+
+
+
+
+class _DaemonStream:
+    """Text stream forwarding every write to the client as a frame of the given channel."""
+    def __init__(self, connection: socket.socket, channel: bytes):
+        self.connection = connection
+        self.channel = channel
+
+    def write(self, text: str) -> int:
+        if text:
+            data = text.encode('utf-8')
+            self.connection.sendall(DAEMON_FRAME_HEADER.pack(self.channel, len(data)) + data)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            argv, cwd = list(request['argv']), request.get('cwd')
+        except (ValueError, KeyError, TypeError):
+            return
+        stdout = _DaemonStream(self.connection, b'o')
+        stderr = _DaemonStream(self.connection, b'e')
+        try:
+            code = convert_main(argv, stdout, stderr, cwd, self.server.service)
+        except Exception as e:
+            stderr.write(f"Unexpected error: {e}\n")
+            code = 1
+        _DaemonStream(self.connection, b'x').write(str(code))
+
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_daemon_server(service: ConversionService, path: Optional[str] = None) -> socketserver.BaseServer:
+    """Create the daemon Unix socket server, only reachable by the current user; call serve_forever() to run it.
+
+    A stale socket file is replaced, RuntimeError is raised if a daemon already listens on it.
+    """
+    path = path or default_socket_path()
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+        else:
+            raise RuntimeError(f"A conversion daemon is already listening on {path}")
+        finally:
+            probe.close()
+    umask = os.umask(0o177)
+    try:
+        server = _DaemonServer(path, _DaemonRequestHandler)
+    finally:
+        os.umask(umask)
+    server.service = service
+    return server
+
+
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def daemon_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog='odt_to_html.py daemon',
+        description='Keep converters warm in a resident process serving odt_to_html_client.py over a Unix socket.',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+    python odt_to_html.py daemon --jobs 2 &
+    python odt_to_html_client.py document.odt output.html --svg-symbols
+'''
+    )
+    parser.add_argument('--socket', default=None, help=f'Unix socket path (default: $ODT_TO_HTML_SOCKET or {default_socket_path()})')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes or threads kept warm (default: number of CPUs)')
+    parser.add_argument('--executor', choices=('auto', 'process', 'thread'), default='auto',
+                        help='Convert on worker processes or threads; auto uses threads when the GIL is disabled (default: auto)')
+    parser.add_argument('--queue-depth', type=int, default=None,
+                        help='Requests waiting for a worker before answering busy (default: 2 per worker)')
+    _add_converter_arguments(parser)
+    args = parser.parse_args(argv)
+
+    config = _config_from_args(args)
+    config.process_pool_size = config.thread_pool_size = args.jobs
+    with ConversionService(config, args.executor, args.queue_depth) as service:
+        try:
+            server = make_daemon_server(service, args.socket)
+        except RuntimeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(f"Listening on {server.server_address} with {service.workers} {service.executor} workers")
+        # Stop cleanly on SIGTERM too, removing the socket
+        signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(server.server_address)
+    return 0
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        sys.exit(batch_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        sys.exit(serve_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'daemon':
+        sys.exit(daemon_main(sys.argv[2:]))
+    sys.exit(convert_main(sys.argv[1:]))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+ODT to HTML Converter client
+
+Runs the odt_to_html.py command line on a resident daemon (python odt_to_html.py daemon),
+saving the interpreter start-up and imports of every conversion. Takes the same
+arguments as odt_to_html.py; without a running daemon, converts in-process.
+
+Only the standard library is imported unless the conversion falls back to in-process.
+
+Examples:
+    python odt_to_html.py daemon &
+    python odt_to_html_client.py document.odt output.html
+    python odt_to_html_client.py document.odt - --svg-symbols > output.html
+"""
+
+import json
+import os
+import socket
+import struct
+import sys
+import tempfile
+
+# Daemon protocol: the client sends one JSON line {"argv": [...], "cwd": "..."}; the daemon
+# answers with frames of a channel byte and a big-endian 32-bit length, then the payload:
+# b'o' (stdout text), b'e' (stderr text) and a final b'x' (exit code as ASCII digits)
+DAEMON_FRAME_HEADER = struct.Struct('>cI')
+SUBCOMMANDS = ('batch', 'serve', 'daemon')
+
+
+def default_socket_path() -> str:
+    """Unix socket of the conversion daemon (odt_to_html.py daemon)."""
+    path = os.environ.get('ODT_TO_HTML_SOCKET')
+    if path:
+        return path
+    directory = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(directory, f"odt_to_html-{os.getuid() if hasattr(os, 'getuid') else 'user'}.sock")
+
+
+class DaemonConnectionLost(Exception):
+    """The daemon went away after it started answering, so the conversion can't be retried in-process."""
+
+
+def _read_exactly(connection: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = connection.recv(min(size - len(data), 1 << 20))
+        if not chunk:
+            raise ConnectionError("The conversion daemon closed the connection")
+        data += chunk
+    return bytes(data)
+
+
+def run_on_daemon(argv: list[str], path: str = None) -> int:
+    """Run the command line on the daemon, streaming its output.
+
+    Raise OSError if the daemon can't be reached or drops the request before answering.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        raise OSError("Unix sockets are not supported")
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path or default_socket_path())
+        connection.sendall(json.dumps({'argv': argv, 'cwd': os.getcwd()}).encode('utf-8') + b"\n")
+        streams = {b'o': sys.stdout.buffer, b'e': sys.stderr.buffer}
+        answered = False
+        while True:
+            try:
+                channel, size = DAEMON_FRAME_HEADER.unpack(_read_exactly(connection, DAEMON_FRAME_HEADER.size))
+                payload = _read_exactly(connection, size)
+            except OSError as e:
+                if answered:
+                    raise DaemonConnectionLost(str(e)) from e
+                raise
+            answered = True
+            if channel == b'x':
+                return int(payload)
+            streams[channel].write(payload)
+            streams[channel].flush()
+    finally:
+        connection.close()
+
+
+def main():
+    argv = sys.argv[1:]
+    if not argv or argv[0] not in SUBCOMMANDS:
+        try:
+            sys.exit(run_on_daemon(argv))
+        except DaemonConnectionLost as e:
+            print(f"Error: Lost the conversion daemon: {e}", file=sys.stderr)
+            sys.exit(1)
+        except OSError:
+            # No daemon running (or reachable), convert in-process
+            pass
+    import odt_to_html
+    odt_to_html.main()
+
+
+if __name__ == '__main__':
+    main()
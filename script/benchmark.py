@@ -0,0 +1,578 @@
+"""
+Micro benchmarks for the ODT to HTML converter hot paths.
+
+Usage (in project root):
+    python script/benchmark.py --help
+    python script/benchmark.py text-decoration
+"""
+
+import argparse
+import math
+import re
+import sys
+import time
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import odt_to_html
+from odt_to_html import NAMESPACES, OdtToHtmlConverter, OdtToHtmlConverterConfig
+
+BENCHMARKS = {}
+DATA_DIR = Path(__file__).resolve().parent.parent / 'test' / 'data'
+
+
+def benchmark(name):
+    """Register a benchmark function under a sub-command name."""
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+def timeit(func, repeat: int = 5, number: int = 1) -> float:
+    """Return the best wall time (seconds) of ``number`` calls, over ``repeat`` rounds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(label: str, seconds: float, baseline: float | None = None) -> None:
+    speedup = f"  (x{baseline / seconds:.2f})" if baseline else ""
+    print(f"  {label:<40} {seconds * 1000:10.3f} ms{speedup}")
+
+
+def make_converter(**kwargs) -> OdtToHtmlConverter:
+    config = OdtToHtmlConverterConfig(
+        show_page_breaks=False,
+        title_from_metadata=True,
+        title_from_styled_title=True,
+        title_from_h1=True,
+        title_from_filename=False,
+        **kwargs,
+    )
+    return OdtToHtmlConverter(config)
+
+
+def make_document_xml(body: str, automatic_styles: str = "") -> str:
+    """Wrap body XML into a minimal office:document-content."""
+    xmlns = " ".join(f'xmlns:{prefix}="{uri}"' for prefix, uri in NAMESPACES.items())
+    return (
+        f'<office:document-content {xmlns}>'
+        f'<office:automatic-styles>{automatic_styles}</office:automatic-styles>'
+        f'<office:body><office:text>{body}</office:text></office:body>'
+        f'</office:document-content>'
+    )
+
+
+SPAN_STYLES_XML = (
+    '<style:style style:name="P1" style:family="paragraph">'
+    '<style:text-properties style:text-underline-style="solid"/></style:style>'
+    '<style:style style:name="T1" style:family="text">'
+    '<style:text-properties fo:font-weight="bold"/></style:style>'
+    '<style:style style:name="T2" style:family="text">'
+    '<style:text-properties style:text-line-through-style="solid"/></style:style>'
+    '<style:style style:name="T3" style:family="text">'
+    '<style:text-properties style:text-underline-style="none"/></style:style>'
+)
+
+
+@benchmark('text-decoration')
+def bench_text_decoration(args):
+    """Span-heavy paragraphs: TextDecoration construction, inherit and wrapping."""
+    import pydantic
+
+    class LegacyTextDecoration(pydantic.BaseModel):
+        # The pydantic model previously used, kept here as the baseline
+        model_config = pydantic.ConfigDict(extra='forbid')
+        line_through: bool | None = None
+        underline: bool | None = None
+
+        def inherit(self, base):
+            if self.line_through is None: self.line_through = base.line_through
+            if self.underline is None: self.underline = base.underline
+            return self
+
+    n = args.size
+    print(f"text-decoration: {n} spans")
+
+    t_legacy = timeit(lambda: [LegacyTextDecoration(underline=True).inherit(LegacyTextDecoration()) for _ in range(n)])
+    t_new = timeit(lambda: [odt_to_html.TextDecoration(underline=True).inherit(odt_to_html.TextDecoration()) for _ in range(n)])
+    report('construct + inherit (pydantic)', t_legacy)
+    report('construct + inherit (interned)', t_new, t_legacy)
+
+    spans = "".join(f'<text:span text:style-name="T{i % 3 + 1}">word {i}</text:span> ' for i in range(n))
+    content_xml = make_document_xml(f'<text:p text:style-name="P1">{spans}</text:p>', SPAN_STYLES_XML)
+    converter = make_converter()
+    with converter.conversion_context():
+        converter._parse_styles(content_xml)
+        paragraph = ET.fromstring(content_xml).find(f".//{{{NAMESPACES['text']}}}p")
+        t_paragraph = timeit(lambda: converter._process_paragraph(paragraph))
+    report('render span-heavy paragraph', t_paragraph)
+
+
+def load_geometries(odt_path: Path) -> list[ET.Element]:
+    """Return the draw:enhanced-geometry elements of a document."""
+    with zipfile.ZipFile(odt_path) as odt:
+        root = ET.fromstring(odt.read('content.xml'))
+    return list(root.iter(f"{{{NAMESPACES['draw']}}}enhanced-geometry"))
+
+
+def legacy_solve_equations(geometry: ET.Element) -> dict:
+    """The former regex + eval based equation solver, kept here as the baseline."""
+    variables = {'pi': math.pi, 'left': 0, 'top': 0, 'right': 21600, 'bottom': 21600}
+    for i, val in enumerate(geometry.get(f"{{{NAMESPACES['draw']}}}modifiers", "").split()):
+        variables[f'${i}'] = float(val)
+    iff = lambda c, t, f: t if c else f
+    for eq in geometry.findall(f".//{{{NAMESPACES['draw']}}}equation"):
+        name = eq.get(f"{{{NAMESPACES['draw']}}}name")
+        expr = eq.get(f"{{{NAMESPACES['draw']}}}formula")
+        expr = re.sub(r'\$(\d+)', r'mod_\1', expr)
+        expr = re.sub(r'\?([a-zA-Z0-9]+)', r'var_\1', expr)
+        expr = expr.replace('if(', 'iff(')
+        current_locals = {'sin': math.sin, 'cos': math.cos, 'tan': math.tan, 'sqrt': math.sqrt,
+                          'abs': abs, 'min': min, 'max': max, 'pi': math.pi, 'iff': iff}
+        for k, v in variables.items():
+            if k.startswith('$'):
+                current_locals[f'mod_{k[1:]}'] = v
+            else:
+                current_locals[f'var_{k}'] = v
+                if k in ['left', 'top', 'right', 'bottom']:
+                    current_locals[k] = v
+        try:
+            variables[name] = float(eval(expr, {"__builtins__": {}}, current_locals))
+        except Exception:
+            variables[name] = 0.0
+    return variables
+
+
+@benchmark('equations')
+def bench_equations(args):
+    """Enhanced geometry equation solving for the custom shapes of sample_shapes.odt."""
+    geometries = load_geometries(DATA_DIR / 'sample_shapes.odt')
+    equation_count = sum(len(g.findall(f".//{{{NAMESPACES['draw']}}}equation")) for g in geometries)
+    rounds = max(1, args.size // 100)
+    print(f"equations: {len(geometries)} shapes, {equation_count} equations, x{rounds}")
+    converter = make_converter()
+    t_legacy = timeit(lambda: [legacy_solve_equations(g) for _ in range(rounds) for g in geometries], repeat=3)
+    t_new = timeit(lambda: [converter._solve_equations(g, g) for _ in range(rounds) for g in geometries], repeat=3)
+    report('regex + eval (legacy)', t_legacy)
+    report('compiled closures', t_new, t_legacy)
+
+
+@benchmark('presets')
+def bench_presets(args):
+    """Per-shape rendering of built-in presets against the generic equation solver."""
+    converter = make_converter()
+    geometries = {}
+    for name in ('sample_shapes.odt', 'sample_test_drawing.odt', 'sample_anchor.odt', 'sample.odt'):
+        for geometry in load_geometries(DATA_DIR / name):
+            if converter._get_preset_subpaths(geometry) is not None:
+                geometries.setdefault(geometry.get(f"{{{NAMESPACES['draw']}}}type"), geometry)
+    rounds = max(1, args.size // 10)
+    print(f"presets: {len(geometries)} shapes, x{rounds}")
+    for draw_type, geometry in sorted(geometries.items()):
+        path = geometry.get(f"{{{NAMESPACES['draw']}}}enhanced-path")
+        equations = converter._get_geometry_equations(geometry)
+        t_generic = timeit(lambda: [converter._convert_path(path, converter._solve_equations(geometry, equations))
+                                    for _ in range(rounds)], repeat=3)
+        t_preset = timeit(lambda: [converter._get_preset_subpaths(geometry) for _ in range(rounds)], repeat=3)
+        report(f'{draw_type} (generic)', t_generic)
+        report(f'{draw_type} (preset)', t_preset, t_generic)
+
+
+def legacy_convert_path(path_data: str, variables: dict) -> list[dict]:
+    """The former two pass path converter (M, L, C, Z and N only), kept here as the baseline."""
+    resolved_tokens = []
+    for token in path_data.split():
+        if token.isalpha():
+            resolved_tokens.append(token.upper())
+        elif token.startswith('?') or token.startswith('$'):
+            resolved_tokens.append(float(variables.get(token[1:] if token.startswith('?') else token, 0)))
+        else:
+            resolved_tokens.append(float(token))
+
+    def fmt(val):
+        return f"{val:.2f}".rstrip('0').rstrip('.')
+
+    subpaths, current_path_cmds = [], []
+    i, last_cmd = 0, None
+    while i < len(resolved_tokens):
+        token = resolved_tokens[i]
+        if isinstance(token, str):
+            cmd = last_cmd = token
+            i += 1
+        else:
+            cmd = 'L' if last_cmd in ['M', 'L'] else last_cmd
+        if cmd in ('M', 'L'):
+            current_path_cmds.append(f"{cmd} {fmt(resolved_tokens[i])} {fmt(resolved_tokens[i + 1])}")
+            i += 2
+        elif cmd == 'C':
+            current_path_cmds.append(f"C {' '.join(fmt(c) for c in resolved_tokens[i:i + 6])}")
+            i += 6
+        elif cmd == 'Z':
+            current_path_cmds.append("Z")
+        elif cmd == 'N' and current_path_cmds:
+            subpaths.append({'d': " ".join(current_path_cmds), 'fill': True, 'stroke': True})
+            current_path_cmds = []
+    if current_path_cmds:
+        subpaths.append({'d': " ".join(current_path_cmds), 'fill': True, 'stroke': True})
+    return subpaths
+
+
+@benchmark('path')
+def bench_path(args):
+    """Enhanced path conversion of synthetic freeform paths with --size * 10 points."""
+    import random
+    rnd = random.Random(0)
+    n = args.size * 10
+    variables = {f'f{i}': rnd.uniform(0, 21600) for i in range(100)}
+    paths = {
+        'integer literals': "M 0 0 L " + " ".join(f"{rnd.randint(0, 21600)} {rnd.randint(0, 21600)}" for _ in range(n)) + " Z N",
+        'decimal literals': "M 0 0 C " + " ".join(f"{rnd.uniform(0, 21600):.3f}" for _ in range(n * 2 - n * 2 % 6)) + " Z N",
+        'equation references': "M 0 0 L " + " ".join(f"?f{rnd.randrange(100)}" for _ in range(n * 2)) + " Z N",
+    }
+    converter = make_converter()
+    print(f"path: {n} points")
+    for label, path in paths.items():
+        assert converter._convert_path(path, variables) == legacy_convert_path(path, variables)
+        t_legacy = timeit(lambda: legacy_convert_path(path, variables), repeat=3)
+        t_new = timeit(lambda: converter._convert_path(path, variables), repeat=3)
+        report(f'{label} (legacy)', t_legacy)
+        report(f'{label} (single pass)', t_new, t_legacy)
+
+
+class LegacyLength:
+    """The former Length (operations used by the float span layout), kept here as the baseline."""
+    _UNIT_TO_M = odt_to_html.Length._UNIT_TO_M
+
+    @staticmethod
+    def from_str(text):
+        pattern = re.compile(r'(?P<number>[-+]*\d*\.?\d+)\s*(?P<unit>[a-zA-Z]*)')
+        match = pattern.match(text.strip())
+        return LegacyLength(float(match.group('number')), match.group('unit'))
+
+    def __init__(self, value, unit="m"):
+        if unit not in self._UNIT_TO_M:
+            raise ValueError(f"Unsupported unit: {unit}")
+        self.value = float(value)
+        self.unit = unit
+        self._meters = self.value * self._UNIT_TO_M[unit]
+
+    def __add__(self, other):
+        return LegacyLength(self.value + other.to(self.unit), self.unit)
+
+    def __sub__(self, other):
+        return LegacyLength(self.value - other.to(self.unit), self.unit)
+
+    def __neg__(self):
+        return LegacyLength(-self.value, self.unit)
+
+    def __abs__(self):
+        return LegacyLength(abs(self.value), self.unit)
+
+    def __eq__(self, other):
+        if not isinstance(other, LegacyLength):
+            return NotImplemented
+        return self._meters == other._meters
+
+    def __lt__(self, other):
+        return self._meters < other._meters
+
+    def __le__(self, other):
+        return self == other or self < other
+
+    def __gt__(self, other):
+        return not self <= other
+
+    def __ge__(self, other):
+        return not self < other
+
+    def __hash__(self):
+        return hash(self._meters)
+
+    def to(self, unit):
+        return self._meters / self._UNIT_TO_M[unit]
+
+    def __str__(self):
+        return f'{self.value:.6g}{self.unit}'
+
+
+@benchmark('length')
+def bench_length(args):
+    """Anchor-heavy paragraphs: parsing box attributes and laying out the float spans."""
+    import random
+    rnd = random.Random(0)
+    count = max(2, args.size // 100)
+    attributes = [
+        (f"{rnd.randint(0, 30) / 2}cm", f"{rnd.randint(0, 200) / 10}cm", f"{rnd.randint(1, 8) / 2}cm", f"{rnd.randint(1, 20) / 10}cm")
+        for _ in range(count)
+    ]
+    wrap_modes = [rnd.choice(['left', 'right', 'none']) for _ in range(count)]
+    rounds = 20
+    print(f"length: {count} paragraph anchored boxes, x{rounds}")
+
+    def layout(length_type):
+        odt_to_html.Length = length_type
+        try:
+            for _ in range(rounds):
+                boxes = [tuple(length_type.from_str(text) for text in box) for box in attributes]
+                OdtToHtmlConverter._generate_float_span(boxes, wrap_modes)
+        finally:
+            odt_to_html.Length = Length
+
+    Length = odt_to_html.Length
+    t_legacy = timeit(lambda: layout(LegacyLength), repeat=3)
+    t_new = timeit(lambda: layout(Length), repeat=3)
+    report('parse + layout (legacy)', t_legacy)
+    report('parse + layout (float backed)', t_new, t_legacy)
+
+
+@benchmark('skyline')
+def bench_skyline(args):
+    """Interval merging and skylines of paragraph anchored boxes, pure Python vs NumPy."""
+    import random
+    if odt_to_html.numpy is None:
+        print("skyline: skipped, numpy is not installed")
+        return
+    rnd = random.Random(0)
+    print("skyline: merge_intervals + skyline_paths")
+    for count in (10, 30, 100, 1000, 10000):
+        boxes = [
+            tuple(odt_to_html.Length(value, 'cm') for value in (
+                rnd.uniform(0, 15), rnd.uniform(0, count / 10), rnd.uniform(0.5, 4), rnd.uniform(0.1, 2)))
+            for _ in range(count)
+        ]
+        intervals = [(y, y + h) for x, y, w, h in boxes]
+        swapped = [(y, x, h, w) for x, y, w, h in boxes]
+        rounds = max(1, 1000 // count)
+
+        def python():
+            for _ in range(rounds):
+                odt_to_html.merge_intervals(list(intervals))
+                odt_to_html.skyline_paths(swapped)
+
+        def vectorized():
+            for _ in range(rounds):
+                odt_to_html.merge_intervals_numpy(list(intervals))
+                odt_to_html.skyline_paths_numpy(swapped)
+
+        t_python = timeit(python, repeat=3) / rounds
+        t_numpy = timeit(vectorized, repeat=3) / rounds
+        report(f'{count} boxes (python)', t_python)
+        report(f'{count} boxes (numpy)', t_numpy, t_python)
+
+
+def legacy_parse_odt_transform(transform_str: str) -> dict:
+    """The draw:transform parsing previously used, kept here as the baseline."""
+    result = {'rotate': None, 'translate_x': None, 'translate_y': None}
+    if not transform_str:
+        return result
+    rotate_match = re.search(r'rotate\s*\(\s*([-\d.]+)\s*\)', transform_str)
+    if rotate_match:
+        result['rotate'] = float(rotate_match.group(1))
+    translate_match = re.search(r'translate\s*\(\s*([\d.]+\w+)\s+([\d.]+\w+)\s*\)', transform_str)
+    if translate_match:
+        result['translate_x'] = translate_match.group(1)
+        result['translate_y'] = translate_match.group(2)
+    return result
+
+
+@benchmark('transform')
+def bench_transform(args):
+    """Rotated and translated shapes: draw:transform parsing and CSS emission."""
+    import random
+    rnd = random.Random(0)
+    distinct = [
+        f"rotate ({rnd.uniform(-3, 3)}) translate ({rnd.uniform(0, 6)}in {rnd.uniform(0, 9)}in)"
+        for _ in range(max(1, args.size // 100))
+    ]
+    transforms = [rnd.choice(distinct) for _ in range(args.size)]
+    print(f"transform: {len(transforms)} shapes, {len(distinct)} distinct transforms")
+
+    def legacy():
+        for text in transforms:
+            info = legacy_parse_odt_transform(text)
+            f"transform: rotate({-info['rotate']}rad)"
+
+    def cached():
+        odt_to_html.parse_odf_transform.cache_clear()
+        for text in transforms:
+            odt_to_html.parse_odf_transform(text).css
+
+    t_legacy = timeit(legacy)
+    t_cached = timeit(cached)
+    report('parse (regex per shape)', t_legacy)
+    report('parse (cached matrix)', t_cached, t_legacy)
+
+
+@benchmark('simplify')
+def bench_simplify(args):
+    """Oversized freeform path: conversion time and path data size per simplification tolerance."""
+    import random
+    rnd = random.Random(0)
+    n = args.size * 10
+    # A noisy, smooth freeform curve spanning the default viewBox
+    points = " ".join(
+        f"{i * 21600 / n:.2f} {10800 + 8000 * math.sin(i * 12 / n) + rnd.uniform(-5, 5):.2f}"
+        for i in range(n)
+    )
+    path_data = f"M {points} N"
+    print(f"simplify: {n} points")
+    baseline = None
+    for tolerance in (0, 1, 5, 20):
+        converter = make_converter(path_simplify_tolerance=tolerance)
+        with converter.conversion_context() as context:
+            subpaths = converter._convert_path(path_data, {})
+        size = sum(len(sub['d']) for sub in subpaths)
+        stats = context.path_simplify_stats
+        with converter.conversion_context():
+            t = timeit(lambda: converter._convert_path(path_data, {}), repeat=3)
+        baseline = baseline or t
+        report(f'tolerance {tolerance} ({size} bytes, -{stats["removed_points"]} points)', t, baseline)
+
+
+@benchmark('symbols')
+def bench_symbols(args):
+    """Diagram-heavy document: inline shape SVGs vs shared <symbol> definitions."""
+    import io
+    geometries = load_geometries(DATA_DIR / 'sample_shapes.odt')
+    shapes = [
+        f'<draw:custom-shape text:anchor-type="as-char" svg:width="{1 + i % 3}cm" svg:height="1cm">'
+        f'{ET.tostring(geometries[i % len(geometries)], encoding="unicode")}</draw:custom-shape>'
+        for i in range(max(1, args.size // 10))
+    ]
+    content_xml = make_document_xml(
+        "".join(f'<text:p text:style-name="P1">{shape}</text:p>' for shape in shapes),
+        '<style:style style:name="P1" style:family="paragraph"/>',
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as odt:
+        odt.writestr('mimetype', 'application/vnd.oasis.opendocument.text')
+        odt.writestr('content.xml', content_xml)
+    odt_bytes = buffer.getvalue()
+    print(f"symbols: {len(shapes)} shapes of {len(geometries)} geometries")
+
+    results = {}
+    for label, svg_symbols in (('inline', False), ('symbols', True)):
+        results[label] = make_converter(svg_symbols=svg_symbols).convert(odt_bytes, title=None)
+        results[label + ' time'] = timeit(lambda: make_converter(svg_symbols=svg_symbols).convert(odt_bytes, title=None), repeat=3)
+    report('convert (inline)', results['inline time'])
+    report('convert (symbols)', results['symbols time'], results['inline time'])
+    for label in ('inline', 'symbols'):
+        html = results[label]
+        print(f"  {label:<40} {len(html):10d} bytes {len(re.findall(r'<[a-zA-Z]', html)):8d} elements")
+
+
+@benchmark('pages')
+def bench_pages(args):
+    """Long multi-page document: pages rendered in order vs on worker processes."""
+    import io
+    import os
+    pages = max(2, args.size // 10)
+    paragraph = '<text:p text:style-name="P1">' + 'Lorem ipsum dolor sit amet. ' * 20 + '</text:p>'
+    content_xml = make_document_xml(
+        "".join('<text:soft-page-break/>' + paragraph * 10 for _ in range(pages)),
+        '<style:style style:name="P1" style:family="paragraph"/>',
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as odt:
+        odt.writestr('mimetype', 'application/vnd.oasis.opendocument.text')
+        odt.writestr('content.xml', content_xml)
+    odt_bytes = buffer.getvalue()
+    workers = max(2, os.cpu_count() or 1)
+    print(f"pages: {pages} pages, {workers} workers")
+
+    serial = make_converter()
+    baseline = timeit(lambda: serial.convert(odt_bytes, title=None), repeat=3)
+    report('convert (in order)', baseline)
+    parallel = make_converter(parallel_pages_threshold=2, process_pool_size=workers)
+    with parallel.runtime:
+        # Start the pool workers before timing
+        parallel.convert(odt_bytes, title=None)
+        report(f'convert ({workers} processes)', timeit(lambda: parallel.convert(odt_bytes, title=None), repeat=3), baseline)
+
+
+@benchmark('threads')
+def bench_threads(args):
+    """Batch of sample documents on one shared converter: throughput per thread count.
+
+    Threads only scale on a free-threaded build (python3.13t); with the GIL the numbers
+    show the threading overhead. Run it on both builds to compare.
+    """
+    import concurrent.futures
+    import os
+    names = ['sample.odt', 'sample_shapes.odt', 'sample_text_style.odt', 'sample_image_wrap.odt']
+    documents = [(DATA_DIR / name).read_bytes() for name in names]
+    documents *= max(1, args.size // 1000)
+    build = 'GIL enabled' if odt_to_html.gil_enabled() else 'free-threaded'
+    print(f"threads: {len(documents)} documents, {build}, {os.cpu_count()} CPUs")
+    converter = make_converter()
+    for document in documents[:len(names)]:
+        converter.convert(document, title=None)
+    baseline = None
+    for threads in (1, 2, 4, 8):
+        with concurrent.futures.ThreadPoolExecutor(threads) as pool:
+            t = timeit(lambda: list(pool.map(lambda document: converter.convert(document, title=None), documents)), repeat=3)
+        baseline = baseline or t
+        report(f'{threads} threads ({len(documents) / t:.1f} docs/s)', t, baseline)
+
+
+@benchmark('context')
+def bench_context(args):
+    """Per-document state: context attribute properties vs the context bound once."""
+    import io
+    converter = make_converter(css_inherit_elimination=True)
+    count = args.size * 100
+    print(f"context: {count} style lookups")
+    with converter.conversion_context() as context:
+        context.styles = {'P1': {'color': 'red'}}
+
+        def through_property():
+            for _ in range(count):
+                converter.styles.get('P1')
+
+        def bound_context():
+            styles = converter._context().styles
+            for _ in range(count):
+                styles.get('P1')
+
+        baseline = timeit(through_property)
+        report('converter.styles per lookup', baseline)
+        report('context bound once', timeit(bound_context), baseline)
+
+    paragraph = ('<text:p text:style-name="P1"><text:span text:style-name="T1">Lorem</text:span> ipsum '
+                 '<text:list><text:list-item><text:p text:style-name="P1">item</text:p></text:list-item></text:list></text:p>')
+    content_xml = make_document_xml(
+        paragraph * max(1, args.size // 10),
+        '<style:style style:name="P1" style:family="paragraph"><style:text-properties fo:color="#ff0000"/></style:style>'
+        '<style:style style:name="T1" style:family="text"><style:text-properties fo:font-weight="bold"/></style:style>',
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as odt:
+        odt.writestr('mimetype', 'application/vnd.oasis.opendocument.text')
+        odt.writestr('content.xml', content_xml)
+    odt_bytes = buffer.getvalue()
+    report('convert (styled paragraphs and lists)', timeit(lambda: converter.convert(odt_bytes, title=None), repeat=3))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run converter micro benchmarks.")
+    parser.add_argument('name', nargs='*', help=f'Benchmarks to run, one of {", ".join(BENCHMARKS)} (default: all)')
+    parser.add_argument('--size', type=int, default=10000, help='Workload size (default: 10000)')
+    args = parser.parse_args()
+    unknown = [name for name in args.name if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+    for name in args.name or BENCHMARKS:
+        BENCHMARKS[name](args)
+
+
+if __name__ == "__main__":
+    main()
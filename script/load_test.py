@@ -0,0 +1,97 @@
+"""
+Load test for the conversion HTTP service (python odt_to_html.py serve).
+
+Usage (in project root):
+    python odt_to_html.py serve --port 8000 --quiet &
+    python script/load_test.py --requests 500 --concurrency 16
+    python script/load_test.py test/data/sample.odt test/data/sample_shapes.odt --url http://127.0.0.1:8000/convert
+"""
+
+import argparse
+import http.client
+import itertools
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'test' / 'data'
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return float('nan')
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def run(url: str, documents: list[bytes], requests: int, concurrency: int) -> tuple[list[float], Counter, float]:
+    """Send ``requests`` POSTs over ``concurrency`` keep-alive connections.
+
+    Returns the latencies (seconds) of the successful requests, the count of each
+    status (or exception name) and the total wall time.
+    """
+    target = urllib.parse.urlsplit(url)
+    path = target.path or '/convert'
+    counter = itertools.count()
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+
+    def worker():
+        connection = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=300)
+        try:
+            while (index := next(counter)) < requests:
+                body = documents[index % len(documents)]
+                start = time.perf_counter()
+                try:
+                    connection.request('POST', path, body=body, headers={'Content-Type': 'application/vnd.oasis.opendocument.text'})
+                    response = connection.getresponse()
+                    response.read()
+                    status = response.status
+                    if response.getheader('Connection', '').lower() == 'close':
+                        connection.close()
+                except (OSError, http.client.HTTPException) as e:
+                    status = type(e).__name__
+                    connection.close()
+                elapsed = time.perf_counter() - start
+                with lock:
+                    statuses[status] += 1
+                    if status == 200:
+                        latencies.append(elapsed)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies), statuses, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a running conversion service.")
+    parser.add_argument('documents', nargs='*', help='ODT files to send, in turn (default: test/data/sample.odt)')
+    parser.add_argument('--url', default='http://127.0.0.1:8000/convert', help='Conversion endpoint (default: %(default)s)')
+    parser.add_argument('-n', '--requests', type=int, default=200, help='Number of requests (default: 200)')
+    parser.add_argument('-c', '--concurrency', type=int, default=8, help='Concurrent connections (default: 8)')
+    args = parser.parse_args()
+
+    paths = [Path(path) for path in args.documents] or [DATA_DIR / 'sample.odt']
+    documents = [path.read_bytes() for path in paths]
+    print(f"load test: {args.requests} requests, {args.concurrency} connections, {len(documents)} documents -> {args.url}")
+    latencies, statuses, elapsed = run(args.url, documents, args.requests, args.concurrency)
+
+    print(f"  {'throughput':<20} {len(latencies) / elapsed:10.1f} docs/s ({elapsed:.2f} s)")
+    for label, fraction in (('p50', 0.50), ('p90', 0.90), ('p99', 0.99)):
+        print(f"  {label + ' latency':<20} {percentile(latencies, fraction) * 1000:10.1f} ms")
+    print(f"  {'max latency':<20} {(latencies[-1] if latencies else float('nan')) * 1000:10.1f} ms")
+    print(f"  {'statuses':<20} " + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items(), key=str)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+Tests for the command line subcommands of the ODT to HTML converter.
+
+Run with: pytest test_odt_cli.py -v
+"""
+
+import concurrent.futures
+import concurrent.futures.process
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import odt_to_html
+from odt_to_html import (
+    ConversionService,
+    OdtToHtmlConverter,
+    OdtToHtmlConverterRuntime,
+    collect_batch_files,
+)
+from odt_test_helpers import DATA_DIR, make_config, make_odt
+
+
+class TestBatch:
+    """Tests for the batch conversion of files, directories and glob patterns."""
+
+    PARAGRAPH_ODT = make_odt('<text:p text:style-name="P1">Hello</text:p>',
+                             '<style:style style:name="P1" style:family="paragraph"/>')
+
+    @pytest.fixture
+    def tree(self, tmp_path):
+        (tmp_path / 'in' / 'sub').mkdir(parents=True)
+        for name in ('a.odt', 'sub/b.odt', 'sub/c.ODT'):
+            (tmp_path / 'in' / name).write_bytes(self.PARAGRAPH_ODT)
+        (tmp_path / 'in' / 'sub' / 'bad.odt').write_bytes(b'not a zip')
+        (tmp_path / 'in' / 'notes.txt').write_text('skipped')
+        return tmp_path
+
+    def test_collect_reports_duplicate_outputs(self, tree):
+        (tree / 'in' / 'sub' / 'c.odt').write_bytes(self.PARAGRAPH_ODT)
+        with pytest.raises(ValueError, match=r'c\.odt and .*c\.ODT both convert to .*c\.html'):
+            collect_batch_files([str(tree / 'in')], tree / 'out')
+        (tree / 'in' / 'sub' / 'c.odt').unlink()
+        (tree / 'other').mkdir()
+        (tree / 'other' / 'a.odt').write_bytes(self.PARAGRAPH_ODT)
+        with pytest.raises(ValueError, match='a.html'):
+            collect_batch_files([str(tree / 'in'), str(tree / 'other')], tree / 'out')
+        assert odt_to_html.batch_main([str(tree / 'in'), str(tree / 'other'), '-o', str(tree / 'out')]) == 1
+        assert not (tree / 'out').exists()
+
+    def test_collect_mirrors_the_tree(self, tree):
+        out = tree / 'out'
+        pairs = collect_batch_files([str(tree / 'in'), str(tree / 'in' / 'a.odt')], out)
+        assert [(str(i.relative_to(tree)), str(o.relative_to(out))) for i, o in pairs] == [
+            ('in/a.odt', 'a.html'), ('in/sub/b.odt', 'sub/b.html'),
+            ('in/sub/bad.odt', 'sub/bad.html'), ('in/sub/c.ODT', 'sub/c.html'),
+        ]
+        pairs = collect_batch_files([str(tree / 'in' / '**' / 'b.odt')], out)
+        assert [o.relative_to(out) for _, o in pairs] == [Path('sub/b.html')]
+
+    @pytest.mark.parametrize('jobs,executor', [(1, 'auto'), (2, 'process'), (2, 'thread')])
+    def test_batch_writes_outputs_and_report(self, tree, jobs, executor, capsys):
+        report = tree / 'report.jsonl'
+        argv = [str(tree / 'in'), '-o', str(tree / 'out'), '--jobs', str(jobs), '--executor', executor, '--report', str(report)]
+        assert odt_to_html.batch_main(argv) == 1
+        records = {Path(r['input']).name: r for r in map(json.loads, report.read_text().splitlines())}
+        assert set(records) == {'a.odt', 'b.odt', 'c.ODT', 'bad.odt'}
+        assert records['bad.odt']['status'] == 'error' and 'Invalid ODT file' in records['bad.odt']['error']
+        html = (tree / 'out' / 'sub' / 'b.html').read_bytes()
+        assert records['b.odt']['status'] == 'ok' and records['b.odt']['size'] == len(html)
+        assert records['b.odt']['duration'] >= 0
+        assert 'Converted 3 of 4 files' in capsys.readouterr().out
+
+    def test_workers_render_pages_without_a_pool_of_their_own(self, tmp_path):
+        odt = make_odt(''.join(f'<text:p text:style-name="PB">page {i}</text:p>' for i in range(4)),
+                       '<style:style style:name="PB" style:family="paragraph">'
+                       '<style:paragraph-properties fo:break-before="page"/></style:style>')
+        for name in ('a.odt', 'b.odt'):
+            (tmp_path / name).write_bytes(odt)
+        argv = [sys.executable, str(Path(odt_to_html.__file__)), 'batch', '-j', '2', '--executor', 'process',
+                '--parallel-pages-threshold', '2', '-o', str(tmp_path / 'out'), str(tmp_path / 'a.odt'), str(tmp_path / 'b.odt')]
+        result = subprocess.run(argv, capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert 'Converted 2 of 2 files' in result.stdout
+        serial = OdtToHtmlConverter(make_config()).convert(odt, title=None)
+        assert (tmp_path / 'out' / 'a.html').read_text(encoding='utf-8').count('page 3') == serial.count('page 3') == 1
+
+    def test_watcher_debounces_and_skips_unchanged_content(self, tree):
+        inputs, out = [str(tree / 'in')], tree / 'out'
+        watcher = odt_to_html.BatchWatcher(inputs, out, debounce=1.0)
+        watcher.snapshot(collect_batch_files(inputs, out))
+        assert watcher.poll(now=0) == []
+        a = tree / 'in' / 'a.odt'
+        a.write_bytes(make_odt('<text:p>Changed</text:p>'))
+        # saved again while settling: the debounce restarts
+        assert watcher.poll(now=10) == []
+        os.utime(a, ns=(a.stat().st_atime_ns, a.stat().st_mtime_ns + 1_000_000))
+        assert watcher.poll(now=10.5) == []
+        assert watcher.poll(now=11) == []
+        assert watcher.poll(now=11.5) == [(a, out / 'a.html')]
+        assert watcher.poll(now=20) == []
+        # rewritten with the same content: the zip CRCs match, nothing to convert
+        b = tree / 'in' / 'sub' / 'b.odt'
+        b.write_bytes(self.PARAGRAPH_ODT)
+        os.utime(b, ns=(b.stat().st_atime_ns, b.stat().st_mtime_ns + 1_000_000))
+        assert watcher.poll(now=30) == [] and watcher.poll(now=40) == []
+        # new documents are converted too
+        d = tree / 'in' / 'd.odt'
+        d.write_bytes(self.PARAGRAPH_ODT)
+        assert watcher.poll(now=50) == [] and watcher.poll(now=60) == [(d, out / 'd.html')]
+
+    def test_fingerprint(self, tree):
+        a = odt_to_html.document_fingerprint(tree / 'in' / 'a.odt')
+        assert a.size == len(self.PARAGRAPH_ODT)
+        assert odt_to_html.document_fingerprint(tree / 'in' / 'sub' / 'b.odt').digest == a.digest
+        bad = odt_to_html.document_fingerprint(tree / 'in' / 'sub' / 'bad.odt')
+        assert bad.size == len(b'not a zip') and bad.digest != a.digest
+
+    @pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason='the patched worker function needs forked workers')
+    def test_dying_worker_fails_its_files_only(self, tree, monkeypatch):
+        names = [f'{i}.odt' for i in range(6)]
+        for name in names:
+            (tree / name).write_bytes(self.PARAGRAPH_ODT)
+        monkeypatch.setattr(odt_to_html, '_convert_file_in_worker', _convert_file_or_crash)
+        pairs = [(tree / name, tree / 'out' / name.replace('.odt', '.html')) for name in ['crash.odt'] + names]
+        (tree / 'crash.odt').write_bytes(self.PARAGRAPH_ODT)
+        with OdtToHtmlConverterRuntime(make_config(process_pool_size=2)) as runtime:
+            records = {Path(record['input']).name: record for record in odt_to_html.convert_files(pairs, runtime)}
+            assert runtime.metrics.snapshot()['counters']['process_pool_restarts'] >= 1
+        assert len(records) == 7
+        assert records['crash.odt']['status'] == 'error' and 'BrokenProcessPool' in records['crash.odt']['error']
+        # the other file in flight when the worker died may fail too
+        assert sum(record['status'] == 'ok' for record in records.values()) >= 5
+
+    def test_estimate_cost(self, tree):
+        cost = odt_to_html.estimate_conversion_cost(DATA_DIR / 'sample_annotated_image.odt')
+        with zipfile.ZipFile(DATA_DIR / 'sample_annotated_image.odt') as odt:
+            assert cost.content_size == odt.getinfo('content.xml').file_size
+            pictures = [info for info in odt.infolist() if info.filename.startswith('Pictures/')]
+        assert cost.draw_entries == len(pictures) > 0
+        assert cost.media_size >= sum(info.file_size for info in pictures)
+        assert cost.weight > cost.content_size
+        bad = odt_to_html.estimate_conversion_cost(tree / 'in' / 'sub' / 'bad.odt')
+        assert bad == (len(b'not a zip'), len(b'not a zip'), 0, 0)
+        assert odt_to_html.estimate_conversion_cost(tree / 'missing.odt').weight == 0
+
+    def test_largest_documents_are_dispatched_first(self, tree, monkeypatch):
+        sizes = {'a.odt': 1, 'b.odt': 300, 'c.odt': 20, 'd.odt': 4000, 'e.odt': 50}
+        for name, paragraphs in sizes.items():
+            (tree / name).write_bytes(make_odt('<text:p>Hello</text:p>' * paragraphs))
+        started = []
+        monkeypatch.setattr(odt_to_html, 'convert_file', lambda input_path, output_path, converter: started.append(input_path.name) or {})
+        pairs = [(tree / name, tree / 'out' / name) for name in sizes]
+        with OdtToHtmlConverterRuntime(make_config(thread_pool_size=1)) as runtime:
+            # a single worker converts in order
+            list(odt_to_html.convert_files(pairs, runtime, 'thread'))
+        assert started == list(sizes)
+        submitted = []
+        with OdtToHtmlConverterRuntime(make_config(thread_pool_size=2)) as runtime:
+            pool = runtime.thread_pool
+            submit = pool.submit
+            monkeypatch.setattr(pool, 'submit', lambda fn, input_path, *args: submitted.append(input_path.name) or submit(fn, input_path, *args))
+            list(odt_to_html.convert_files(pairs, runtime, 'thread'))
+        assert submitted == ['d.odt', 'b.odt', 'e.odt', 'c.odt', 'a.odt']
+
+    def test_progress(self, tree):
+        costs = {Path(name): odt_to_html.DocumentCost(size, size, 0, 0) for name, size in (('a', 3_000_000), ('b', 1_000_000))}
+        progress = odt_to_html.BatchProgress(costs, workers=2)
+        assert progress.eta() is None
+        assert progress.format().startswith('0/2 files, 0.0/4.0 MB, ETA ?, 0/2 workers')
+        progress.update({'input': 'a', 'duration': 2.0, 'worker': '1:w0'})
+        now = progress.start + 4.0
+        assert progress.eta(now) == pytest.approx(4.0 / 3)
+        assert progress.utilization(now) == [0.5]
+        assert progress.format(now) == '1/2 files, 3.0/4.0 MB, ETA 0:01, 1/2 workers busy 50%'
+
+
+def _convert_file_or_crash(input_path: str, output_path: str) -> dict:
+    if Path(input_path).name == 'crash.odt':
+        os._exit(1)
+    return odt_to_html.convert_file(input_path, output_path, odt_to_html._worker_converter)
+
+
+class TestHttpService:
+    """Tests for the HTTP conversion service."""
+
+    @pytest.fixture
+    def server(self):
+        config = make_config(thread_pool_size=2)
+        with ConversionService(config, executor='thread', queue_depth=1) as service:
+            server = odt_to_html.make_http_server(service, port=0, max_body_size=1 << 20, quiet=True)
+            thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+            thread.start()
+            yield server
+            server.shutdown()
+            server.server_close()
+
+    def request(self, server, method, path, body=None):
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=10)
+        try:
+            connection.request(method, path, body=body)
+            response = connection.getresponse()
+            return response.status, response.read()
+        finally:
+            connection.close()
+
+    def test_convert(self, server):
+        document = (DATA_DIR / 'sample_text_style.odt').read_bytes()
+        status, body = self.request(server, 'POST', '/convert?title=Hello', document)
+        assert status == 200
+        assert body.decode('utf-8') == OdtToHtmlConverter(make_config()).convert(document, title='Hello')
+
+    def test_errors(self, server):
+        assert self.request(server, 'POST', '/convert', b'not a zip')[0] == 400
+        assert self.request(server, 'POST', '/other', b'')[0] == 404
+        # a too large document is refused from its headers, before the body is sent
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=10)
+        connection.putrequest('POST', '/convert')
+        connection.putheader('Content-Length', str((1 << 20) + 1))
+        connection.endheaders()
+        assert connection.getresponse().status == 413
+        connection.close()
+        status, body = self.request(server, 'GET', '/health')
+        health = json.loads(body)
+        assert status == 200 and health['capacity'] == 3 and health['pending'] == 0
+        assert health['metrics']['counters']['failed'] == 1
+
+    def test_saturated_service_answers_503(self, server, monkeypatch):
+        service = server.service
+        release = threading.Event()
+        monkeypatch.setattr(service.converter, 'convert', lambda file, title, context=None: release.wait(5) and '')
+        futures = [service.submit(b'', None) for _ in range(service.capacity)]
+        assert all(futures) and service.submit(b'', None) is None
+        assert self.request(server, 'POST', '/convert', b'document')[0] == 503
+        release.set()
+        concurrent.futures.wait(futures)
+        assert service.pending == 0 and service.submit(b'', None) is not None
+
+    def test_failed_submit_releases_its_slot_once(self, server, monkeypatch):
+        service = server.service
+        assert service.reserve()
+        monkeypatch.setattr(service, '_converter_for', lambda config: 1 / 0)
+        with pytest.raises((OSError, http.client.HTTPException)):
+            self.request(server, 'POST', '/convert', b'document')
+        assert service.pending == 1
+        assert [service.reserve() for _ in range(service.capacity)].count(True) == service.capacity - 1
+
+    def test_saturated_service_refuses_before_the_body(self, server, monkeypatch):
+        service = server.service
+        monkeypatch.setattr(service, 'reserve', lambda: False)
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=10)
+        connection.putrequest('POST', '/convert')
+        connection.putheader('Content-Length', str(1 << 19))
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 503 and response.getheader('Connection') == 'close'
+        connection.close()
+
+    def test_connections_are_limited(self):
+        with ConversionService(make_config(thread_pool_size=1), executor='thread') as service:
+            server = odt_to_html.make_http_server(service, port=0, quiet=True, max_connections=1)
+            thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+            thread.start()
+            try:
+                idle = socket.create_connection(('127.0.0.1', server.server_port), timeout=10)
+                status, _ = self.request(server, 'GET', '/health')
+                assert status == 503
+                idle.close()
+                for _ in range(100):
+                    status, _ = self.request(server, 'GET', '/health')
+                    if status == 200:
+                        break
+                    time.sleep(0.05)
+                assert status == 200
+            finally:
+                server.shutdown()
+                server.server_close()
+
+    def test_broken_process_pool_is_replaced(self):
+        document = (DATA_DIR / 'sample_text_style.odt').read_bytes()
+        with ConversionService(make_config(process_pool_size=1), executor='process') as service:
+            broken = service.runtime.process_pool
+            with pytest.raises(concurrent.futures.process.BrokenProcessPool):
+                broken.submit(os._exit, 1).result(timeout=60)
+            assert '</html>' in service.submit(document, None).result(timeout=60).html
+            assert service.runtime.process_pool is not broken
+            assert service.runtime.metrics.snapshot()['counters']['process_pool_restarts'] == 1
+
+
+class TestDaemon:
+    """Tests for the resident daemon and its Unix socket client."""
+
+    CLIENT = Path(__file__).parent / 'odt_to_html_client.py'
+
+    @pytest.fixture
+    def socket_path(self):
+        # Unix socket paths are limited to about a hundred bytes, keep it short
+        with tempfile.TemporaryDirectory(prefix='odt') as directory:
+            yield str(Path(directory) / 'd.sock')
+
+    @pytest.fixture
+    def daemon(self, socket_path):
+        with ConversionService(make_config(thread_pool_size=2), executor='thread') as service:
+            server = odt_to_html.make_daemon_server(service, socket_path)
+            thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+            thread.start()
+            yield server
+            server.shutdown()
+            server.server_close()
+
+    def run_client(self, socket_path, *args, cwd=None):
+        env = dict(os.environ, ODT_TO_HTML_SOCKET=socket_path)
+        return subprocess.run([sys.executable, str(self.CLIENT), *args], cwd=cwd, env=env,
+                              capture_output=True, text=True, timeout=60)
+
+    def test_round_trip(self, daemon, socket_path, tmp_path):
+        source = DATA_DIR / 'sample_text_style.odt'
+        expected = OdtToHtmlConverter(make_config()).convert(source, title=None)
+        result = self.run_client(socket_path, str(source), 'out/a.html', '--title-from-filename=0', cwd=tmp_path)
+        assert result.returncode == 0, result.stderr
+        assert 'Successfully converted' in result.stdout
+        assert (tmp_path / 'out' / 'a.html').read_text(encoding='utf-8') == expected
+        # '-' streams the HTML back
+        result = self.run_client(socket_path, str(source), '-')
+        assert result.returncode == 0 and result.stdout == expected
+        assert daemon.service.runtime.metrics.snapshot()['counters']['completed'] == 2
+
+    def test_errors_are_forwarded(self, daemon, socket_path, tmp_path):
+        result = self.run_client(socket_path, 'missing.odt', 'out.html', cwd=tmp_path)
+        assert result.returncode == 1 and 'Input file not found: missing.odt' in result.stderr
+        result = self.run_client(socket_path, '--bogus')
+        assert result.returncode == 2 and 'usage:' in result.stderr
+
+    def test_falls_back_to_in_process_conversion(self, socket_path, tmp_path):
+        Path(socket_path).write_text('not a socket')
+        result = self.run_client(socket_path, str(DATA_DIR / 'sample_text_style.odt'), 'a.html', cwd=tmp_path)
+        assert result.returncode == 0, result.stderr
+        assert (tmp_path / 'a.html').exists()
+
+    def test_socket_file(self, daemon, socket_path):
+        assert os.stat(socket_path).st_mode & 0o077 == 0
+        with pytest.raises(RuntimeError):
+            odt_to_html.make_daemon_server(daemon.service, socket_path)
+
+    def test_stale_socket_is_replaced(self, socket_path):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+        with ConversionService(make_config(thread_pool_size=1), executor='thread') as service:
+            odt_to_html.make_daemon_server(service, socket_path).server_close()
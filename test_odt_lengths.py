@@ -0,0 +1,111 @@
+"""
+Tests for ODF lengths and transforms.
+
+Run with: pytest test_odt_lengths.py -v
+"""
+
+import pickle
+
+import pytest
+
+from odt_to_html import (
+    Length,
+    OdtToHtmlConverter,
+    parse_odf_length,
+    parse_odf_transform,
+)
+from odt_test_helpers import make_config
+
+
+class TestLength:
+    """Tests for the float backed, immutable Length."""
+
+    def test_parse(self):
+        assert (Length.from_str(" 0.5cm"), Length.from_str(" 0.5cm").unit) == (Length(0.5, 'cm'), 'cm')
+        with pytest.raises(ValueError):
+            Length.from_str("cm")
+        with pytest.raises(ValueError):
+            Length.from_str("1px")
+
+    def test_arithmetic_keeps_left_unit(self):
+        a, b = Length.from_str("0.5cm"), Length.from_str("2mm")
+        assert (str(a + b), str(a - b), str(b - a), str(-a), str(a * 2), str(a / 2)) == \
+            ('0.7cm', '0.3cm', '-3mm', '-0.5cm', '1cm', '0.25cm')
+        assert f"{a} {b}" == "0.5cm 2mm"
+        for length in (+a, round(Length(1.26, 'cm'), 1), round(Length(1.26, 'cm')), abs(-a), 2 * a):
+            assert type(length) is type(a)
+        assert (str(round(Length(1.26, 'cm'), 1)), str(round(Length(1.26, 'cm')))) == ('1.3cm', '1cm')
+        for operation in (lambda: 1 + a, lambda: a / b, lambda: a * b, lambda: divmod(a, b), lambda: a // b, lambda: a ** 2,
+                          lambda: a + 1.0, lambda: 1.0 + a, lambda: a - 1.0, lambda: 1.0 - a, lambda: 2.0 / a,
+                          lambda: a % 1.0, lambda: sum([a])):
+            with pytest.raises(TypeError):
+                operation()
+
+    def test_compares_across_units(self):
+        assert Length(1, 'inch') == Length(1, 'in') == Length(72, 'pt')
+        assert Length(1, 'pt') < Length(1, 'mm') < Length(1, 'pc')
+        assert max(Length(1, 'cm'), Length(5, 'mm')).unit == 'cm'
+        assert len({Length(10, 'mm'), Length(1, 'cm')}) == 1
+
+    def test_compares_to_numbers_in_its_unit(self):
+        a = Length(5, 'cm')
+        assert a != 0.05 and not a == 0.05 and a != 5
+        assert not a < 3 and a > 3 and a <= 5 and a >= 5 and 3 < a
+        assert a < 6.0 and not a > 6.0
+
+    def test_immutable_and_picklable(self):
+        length = Length(3, 'pt')
+        with pytest.raises(AttributeError):
+            length.unit = 'mm'
+        restored = pickle.loads(pickle.dumps(length))
+        assert (restored, restored.unit, repr(restored)) == (length, 'pt', "Length(3.0, 'pt')")
+
+
+class TestOdfLength:
+    """Tests for the cached ODF length parser shared by the unit conversions."""
+
+    def test_parse_is_cached(self):
+        assert parse_odf_length("0.5cm") is parse_odf_length("0.5cm")
+
+    def test_fields(self):
+        length = parse_odf_length("--1.25in")
+        assert (length.value, length.unit, length.magnitude, length.negative) == (1.25, 'in', '1.25in', False)
+        assert (length.meters, length.px) == (pytest.approx(0.03175), 120.0)
+        length = parse_odf_length("-0cm")
+        assert (length.magnitude, length.negative) == ('0cm', True)
+        assert parse_odf_length("12em").px is None and parse_odf_length("12px").meters is None
+        assert parse_odf_length("cm") is None and parse_odf_length("1cm 2cm") is None
+
+    def test_dimension_to_px(self):
+        converter = OdtToHtmlConverter(make_config())
+        assert converter._dimension_to_px("2cm") == 2 * 37.795275591
+        assert converter._dimension_to_px("3pt") == 3 * 1.333
+        assert converter._dimension_to_px("7") == 7.0
+        assert converter._dimension_to_px("") == converter._dimension_to_px("2inch") == 100
+
+
+class TestOdfTransform:
+    """Tests for the cached draw:transform parser."""
+
+    def test_parse_is_cached(self):
+        assert parse_odf_transform('rotate (0.5)') is parse_odf_transform('rotate (0.5)')
+
+    def test_rotate_translate(self):
+        transform = parse_odf_transform('rotate (-0.5) translate (1in 0.5in)')
+        assert transform.matrix == pytest.approx((0.877583, 0.479426, -0.479426, 0.877583, 96, 48), abs=1e-6)
+        assert transform.css == 'matrix(0.877583, 0.479426, -0.479426, 0.877583, 96, 48)'
+        assert transform.translated
+
+    def test_operations_apply_left_to_right(self):
+        assert parse_odf_transform('translate (1px 2px) scale (2)').matrix == (2, 0, 0, 2, 2, 4)
+        assert parse_odf_transform('scale (2 3), translate (1px 2px)').matrix == (2, 0, 0, 3, 1, 2)
+        assert parse_odf_transform('skewX (0) skewY(0) matrix (1 0 0 1 1cm 0)').matrix == pytest.approx(
+            (1, 0, 0, 1, 37.795275591, 0))
+
+    def test_identity(self):
+        transform = parse_odf_transform('rotate (0)')
+        assert transform.identity and transform.css == 'none' and not transform.translated
+
+    @pytest.mark.parametrize('text', ['', 'rotate', 'rotate (1 2)', 'spin (1)', 'rotate (1) x', 'translate (1cm 1em)', 'scale (a)'])
+    def test_invalid(self, text):
+        assert parse_odf_transform(text) is None
@@ -0,0 +1,280 @@
+"""
+Tests for the converter runtime and the execution of conversions.
+
+Run with: pytest test_odt_runtime.py -v
+"""
+
+import asyncio
+import concurrent.futures
+import io
+import threading
+import time
+from xml.etree import ElementTree as ET
+
+import pytest
+
+import odt_to_html
+from odt_to_html import (
+    NAMESPACES,
+    ConversionCancelled,
+    OdtToHtmlConverter,
+    OdtToHtmlConverterRuntime,
+    RuntimeMetrics,
+)
+from odt_test_helpers import CUSTOM_SHAPE_XML, DATA_DIR, XMLNS, make_config, make_odt
+
+
+class TestRuntime:
+    """Tests for the runtime as a container of caches, pools and metrics."""
+
+    def test_image_data_uris_are_shared(self):
+        config = make_config()
+        runtime = OdtToHtmlConverterRuntime(config)
+        first = OdtToHtmlConverter(config, runtime).convert(DATA_DIR / 'sample_image_wrap.odt', title=None)
+        hits = runtime.resource_cache.info()['hits']
+        second = OdtToHtmlConverter(config, runtime).convert(DATA_DIR / 'sample_image_wrap.odt', title=None)
+        assert first == second and 'base64,' in first
+        info = runtime.cache_info()['resources']
+        assert info['misses'] == 1 and info['hits'] > hits
+
+    def test_image_data_uris_are_keyed_by_content(self):
+        config = make_config()
+        runtime = OdtToHtmlConverterRuntime(config)
+        converter = OdtToHtmlConverter(config, runtime)
+        uris = []
+        for data in (b'first image', b'other image', b'first image'):
+            with converter.conversion_context() as context:
+                context.resources['Pictures/1.png'] = data
+                uris.append(converter._resource_data_uri('Pictures/1.png', 'image/png'))
+        assert uris[0] == uris[2] != uris[1]
+        assert runtime.cache_info()['resources']['misses'] == 2
+
+    def test_metrics(self):
+        config = make_config()
+        runtime = OdtToHtmlConverterRuntime(config)
+        converter = OdtToHtmlConverter(config, runtime)
+        converter.convert(io.BytesIO(make_odt('')), title=None)
+        with pytest.raises(ValueError):
+            converter.convert(io.BytesIO(b'not a zip'), title=None)
+        snapshot = runtime.metrics.snapshot()
+        assert snapshot['counters'] == {'documents': 1, 'errors': 1}
+        assert snapshot['timings']['convert']['count'] == 2
+        runtime.metrics.reset()
+        assert runtime.metrics.snapshot() == {'counters': {}, 'timings': {}}
+
+    def test_metrics_time_observes_on_error(self):
+        metrics = RuntimeMetrics()
+        with pytest.raises(KeyError), metrics.time('step'):
+            raise KeyError
+        assert metrics.snapshot()['timings']['step']['count'] == 1
+
+    def test_pools_are_lazy_and_closed_on_shutdown(self):
+        with OdtToHtmlConverterRuntime(make_config(thread_pool_size=2)) as runtime:
+            assert runtime._thread_pool is None
+            assert runtime.thread_pool is runtime.thread_pool
+            assert runtime.thread_pool.submit(sum, [1, 2]).result() == 3
+        with pytest.raises(RuntimeError):
+            runtime.thread_pool
+        with pytest.raises(RuntimeError):
+            runtime.process_pool
+
+    def test_process_pool_needs_a_config(self):
+        with pytest.raises(ValueError):
+            OdtToHtmlConverterRuntime().process_pool
+
+
+class TestAsyncConversion:
+    """Tests for the asyncio conversion API."""
+
+    PAGES_ODT = make_odt('<text:p text:style-name="P1">one</text:p><text:soft-page-break/>'
+                         '<text:p text:style-name="P1">two</text:p>',
+                         '<style:style style:name="P1" style:family="paragraph"/>')
+
+    def test_convert_many_keeps_input_order(self):
+        config = make_config()
+        converter = OdtToHtmlConverter(config)
+        files = [DATA_DIR / 'sample_text_style.odt', self.PAGES_ODT, b'not a zip']
+        results = asyncio.run(converter.convert_many_async(files, return_exceptions=True))
+        assert results[0] == OdtToHtmlConverter(config).convert(files[0], title=None)
+        assert 'two' in results[1]
+        assert isinstance(results[2], ValueError)
+        with pytest.raises(ValueError):
+            asyncio.run(converter.convert_many_async(files))
+
+    def test_concurrency_is_bounded(self, monkeypatch):
+        converter = OdtToHtmlConverter(make_config(thread_pool_size=8))
+        convert, running, peak = converter.convert, [0], [0]
+        lock = threading.Lock()
+
+        def tracked_convert(*args):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            try:
+                return convert(*args)
+            finally:
+                with lock:
+                    running[0] -= 1
+
+        monkeypatch.setattr(converter, 'convert', tracked_convert)
+        results = asyncio.run(converter.convert_many_async([self.PAGES_ODT] * 10, concurrency=2))
+        assert len(results) == 10 and peak[0] <= 2
+
+    def test_cancelled_context_stops_the_conversion(self):
+        converter = OdtToHtmlConverter(make_config())
+        context = OdtToHtmlConverter.Context()
+        context.cancel()
+        with pytest.raises(ConversionCancelled):
+            converter.convert(self.PAGES_ODT, title=None, context=context)
+        assert converter.runtime.metrics.snapshot()['counters'] == {'cancelled': 1}
+
+    def test_cancelling_the_task_cancels_the_context(self, monkeypatch):
+        converter = OdtToHtmlConverter(make_config())
+        context = OdtToHtmlConverter.Context()
+        started, release = threading.Event(), threading.Event()
+
+        def blocking_convert(file, title, context):
+            started.set()
+            release.wait(5)
+
+        monkeypatch.setattr(converter, 'convert', blocking_convert)
+
+        async def main():
+            task = asyncio.ensure_future(converter.convert_async(self.PAGES_ODT, None, context))
+            while not started.is_set():
+                await asyncio.sleep(0.001)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        release.set()
+        assert context.cancelled.is_set()
+
+
+class TestConversionContext:
+    """Tests for the per-call conversion context of a reusable converter."""
+
+    AUTOMATIC_STYLES = '<style:style style:name="P1" style:family="paragraph"/>'
+
+    def document(self, index: int) -> bytes:
+        return make_odt(
+            f'<text:p text:style-name="P1">Document {index}'
+            f'<text:note text:note-class="footnote"><text:note-citation>1</text:note-citation>'
+            f'<text:note-body><text:p text:style-name="P1">Note {index}</text:p></text:note-body></text:note></text:p>',
+            self.AUTOMATIC_STYLES,
+        )
+
+    def test_reused_converter_does_not_leak_state(self):
+        converter = OdtToHtmlConverter(make_config())
+        first = converter.convert(self.document(0), title=None)
+        converter.convert(self.document(1), title=None)
+        assert converter.convert(self.document(0), title=None) == first
+        assert 'Note 1' not in first
+
+    def test_state_outside_of_a_conversion(self):
+        converter = OdtToHtmlConverter(make_config())
+        with pytest.raises(RuntimeError):
+            converter.styles
+        with converter.conversion_context() as context:
+            converter.footnotes.append({})
+        assert context.footnotes == [{}]
+
+    def test_converters_have_their_own_context(self):
+        outer, inner = OdtToHtmlConverter(make_config()), OdtToHtmlConverter(make_config())
+        with outer.conversion_context() as context:
+            # a conversion running another converter keeps its own state
+            html = inner.convert(self.document(1), title=None)
+            assert outer.footnotes is context.footnotes == []
+        assert 'Note 1' in html
+        with pytest.raises(RuntimeError):
+            inner.styles
+
+    def test_shared_across_threads(self):
+        converter = OdtToHtmlConverter(make_config())
+        documents = [self.document(i % 8) for i in range(64)]
+        expected = [OdtToHtmlConverter(make_config()).convert(document, title=None) for document in documents]
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            assert list(pool.map(lambda document: converter.convert(document, title=None), documents)) == expected
+
+
+class TestThreadSafety:
+    """Tests for sharing converters and runtimes between threads, as on free-threaded builds."""
+
+    SAMPLES = ['sample.odt', 'sample_shapes.odt', 'sample_text_style.odt', 'sample_image_wrap.odt']
+
+    def test_shared_runtime_matches_serial_conversion(self):
+        config = make_config(svg_symbols=True)
+        expected = {name: OdtToHtmlConverter(config).convert(DATA_DIR / name, title=None) for name in self.SAMPLES}
+        converter = OdtToHtmlConverter(config)
+        names = self.SAMPLES * 8
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda name: converter.convert(DATA_DIR / name, title=None), names))
+        assert results == [expected[name] for name in names]
+
+    def test_guess_mimetype_from_threads(self):
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            assert set(pool.map(odt_to_html.guess_mimetype, ['a.png', 'b.svg'] * 16)) == {'image/png', 'image/svg+xml'}
+
+    def test_import_does_not_register_namespaces(self):
+        element = ET.Element(f"{{{NAMESPACES['office']}}}text")
+        assert ET.tostring(element, encoding='unicode').startswith('<ns0:text')
+
+
+class TestParallelPages:
+    """Tests for rendering the page groups of a document in worker processes."""
+
+    AUTOMATIC_STYLES = (
+        '<style:style style:name="P1" style:family="paragraph"/>'
+        '<style:style style:name="PB" style:family="paragraph">'
+        '<style:paragraph-properties fo:break-before="page"/></style:style>'
+    )
+
+    @staticmethod
+    def page(index: int) -> str:
+        note = (f'<text:note text:id="n{index}" text:note-class="footnote"><text:note-citation>{index}</text:note-citation>'
+                f'<text:note-body><text:p>note {index}</text:p></text:note-body></text:note>')
+        shape = CUSTOM_SHAPE_XML if index % 2 else '<draw:rect svg:width="1cm" svg:height="1cm"/>'
+        return f'<text:p text:style-name="PB">page {index}{note}{shape}</text:p><text:p text:style-name="P1">more {index}</text:p>'
+
+    @pytest.fixture
+    def runtime(self):
+        with OdtToHtmlConverterRuntime(make_config(process_pool_size=2)) as runtime:
+            yield runtime
+
+    @pytest.mark.parametrize('svg_symbols', [False, True])
+    def test_matches_serial_rendering(self, runtime, svg_symbols):
+        odt = make_odt('<text:soft-page-break/>' + ''.join(self.page(i) for i in range(12)), self.AUTOMATIC_STYLES)
+        serial = OdtToHtmlConverter(make_config(svg_symbols=svg_symbols)).convert(odt, title=None)
+        context = OdtToHtmlConverter.Context()
+        config = make_config(svg_symbols=svg_symbols, parallel_pages_threshold=2, process_pool_size=2)
+        parallel = OdtToHtmlConverter(config, runtime).convert(odt, title=None, context=context)
+        assert parallel == serial
+        assert serial.count('class="anchor-page"') == 12
+        assert [note['id'] for note in context.footnotes] == [f'n{i}' for i in range(12)]
+
+    def test_workers_get_the_resources_of_their_pages(self, runtime):
+        # an image linked from the page, and an object replacement found by its frame name only
+        pages = [self.page(0), self.page(1),
+                 '<text:p text:style-name="PB"><draw:frame draw:name="Object 1" svg:width="1cm" svg:height="1cm">'
+                 '<draw:object xlink:href="./Object 1"/></draw:frame>'
+                 '<draw:frame draw:name="Image" svg:width="1cm" svg:height="1cm">'
+                 '<draw:image xlink:href="Pictures/image.png"/></draw:frame></text:p>']
+        odt = make_odt('<text:soft-page-break/>' + ''.join(pages), self.AUTOMATIC_STYLES,
+                       files={'Pictures/image.png': b'image', 'ObjectReplacements/Object 1': b'replacement'})
+        serial = OdtToHtmlConverter(make_config()).convert(odt, title=None)
+        config = make_config(parallel_pages_threshold=2, process_pool_size=2)
+        parallel = OdtToHtmlConverter(config, runtime).convert(odt, title=None)
+        assert parallel == serial
+        assert serial.count('base64,') == 2
+
+    def test_break_on_empty_page_keeps_one_page(self):
+        converter = OdtToHtmlConverter(make_config())
+        with converter.conversion_context():
+            converter.styles = {}
+            body = ET.fromstring(f'<office:text {XMLNS}><text:soft-page-break/><text:soft-page-break/>'
+                                 f'<text:p>a</text:p><text:soft-page-break/><text:p>b</text:p></office:text>')
+            groups = converter._split_page_groups(body)
+            assert [len(group) for group in groups] == [1, 2, 2]
+            assert converter._join_pages([([], ['x']), (['a'], []), ([], ['y']), (['b'], [])]).count('anchor-page"') == 2
@@ -0,0 +1,302 @@
+"""
+Tests for the drawing and shape rendering of the ODT to HTML converter.
+
+Run with: pytest test_odt_shape_rendering.py -v
+"""
+
+import itertools
+import random
+import re
+from xml.etree import ElementTree as ET
+
+import pytest
+
+import odt_to_html
+from odt_to_html import (
+    NAMESPACES,
+    Length,
+    OdtToHtmlConverter,
+    OdtToHtmlConverterRuntime,
+    compile_equations,
+    parse_formula,
+    simplify_polyline,
+)
+from odt_test_helpers import CUSTOM_SHAPE_XML, load_geometries, make_config, make_odt
+
+
+class TestFormulaEngine:
+    """Tests for the compiled enhanced geometry formula engine."""
+
+    CONSTANTS = [3.141592653589793, 0.0, 0.0, 21600.0, 21600.0, 21600.0, 21600.0, 21600.0, 21600.0]
+
+    def solve(self, *equations, modifiers=()):
+        return compile_equations(tuple(equations)).solve(self.CONSTANTS, list(modifiers))
+
+    def test_arithmetic_and_references(self):
+        values = self.solve(('f0', '$0 * 2'), ('f1', '?f0 + right / 2 - -1'), modifiers=[5400])
+        assert values == [10800.0, 21601.0]
+
+    def test_functions(self):
+        values = self.solve(('f0', 'if(-1, max(1, 2), 3)'), ('f1', 'cos(pi)'), ('f2', 'atan2(1, 1) * 4'))
+        assert values == [2.0, -1.0, pytest.approx(3.141592653589793)]
+
+    def test_errors_yield_zero(self):
+        values = self.solve(('f0', '?f1 + 1'), ('f1', '1 / 0'), ('f2', '$3'), ('f3', '__import__("os")'), ('f4', '1 +'))
+        assert values == [0.0] * 5
+
+    def test_view_box_constants(self):
+        geometry = ET.Element(f"{{{NAMESPACES['draw']}}}enhanced-geometry", {
+            f"{{{NAMESPACES['svg']}}}viewBox": "100 50 2000 1000",
+        })
+        for name, formula in (('f0', 'left'), ('f1', 'top'), ('f2', 'right'), ('f3', 'bottom'),
+                              ('f4', 'width'), ('f5', 'height'), ('f6', 'logwidth'), ('f7', 'logheight')):
+            ET.SubElement(geometry, f"{{{NAMESPACES['draw']}}}equation", {
+                f"{{{NAMESPACES['draw']}}}name": name, f"{{{NAMESPACES['draw']}}}formula": formula,
+            })
+        variables = OdtToHtmlConverter(make_config())._solve_equations(geometry)
+        assert [variables[f'f{i}'] for i in range(8)] == [100, 50, 2100, 1050, 2000, 1000, 2000, 1000]
+        assert (variables['right'], variables['width']) == (2100, 2000)
+
+    def test_formulas_are_cached(self):
+        assert parse_formula('?f0 * 2') is parse_formula('?f0 * 2')
+        assert compile_equations((('f0', '1'),)) is compile_equations((('f0', '1'),))
+
+
+class TestShapeCache:
+    """Tests for the runtime cache of rendered custom shape SVGs."""
+
+    def test_repeated_shapes_hit_the_cache(self):
+        odt = make_odt(f'<text:p text:style-name="P1">{CUSTOM_SHAPE_XML * 3}</text:p>',
+                       '<style:style style:name="P1" style:family="paragraph"/>')
+        config = make_config()
+        runtime = OdtToHtmlConverterRuntime(config)
+        html = OdtToHtmlConverter(config, runtime).convert(odt, title=None)
+        assert html.count('<path d="M 0 0 L 21600 0 L 21600 21600 L 0 21600 L 0 0 Z"') == 3
+        info = runtime.cache_info()['shapes']
+        assert (info['hits'], info['misses']) == (2, 1)
+        assert info['hit_rate'] == pytest.approx(2 / 3)
+
+
+class TestSvgSymbols:
+    """Tests for hoisting repeated shape geometry into shared SVG symbols."""
+
+    AUTOMATIC_STYLES = (
+        '<style:style style:name="P1" style:family="paragraph"/>'
+        '<style:style style:name="gr2" style:family="graphic">'
+        '<style:graphic-properties draw:fill-color="#ff0000"/></style:style>'
+    )
+    OTHER_SHAPE_XML = CUSTOM_SHAPE_XML.replace('draw:style-name="gr1"', 'draw:style-name="gr2"').replace('2cm', '3cm')
+
+    def convert(self, body: str, **kwargs) -> str:
+        odt = make_odt(f'<text:p text:style-name="P1">{body}</text:p>', self.AUTOMATIC_STYLES)
+        return OdtToHtmlConverter(make_config(**kwargs)).convert(odt, title=None)
+
+    def test_repeated_geometry_is_defined_once(self):
+        html = self.convert(CUSTOM_SHAPE_XML * 2 + self.OTHER_SHAPE_XML, svg_symbols=True)
+        assert html.count('<symbol id="odt-symbol-0" viewBox="0 0 21600 21600" preserveAspectRatio="none"'
+                          ' overflow="visible"><path d="M 0 0 L 21600 0 L 21600 21600 L 0 21600 L 0 0 Z" fill-rule="evenodd"') == 1
+        assert html.count('<use href="#odt-symbol-0"/>') == 3
+        # size and colors stay on each referencing svg
+        assert '<svg width="2cm" height="1cm" fill="#e0e0e0" stroke="#333333" stroke-width="1pt"' in html
+        assert '<svg width="3cm" height="1cm" fill="#ff0000" stroke="#333333" stroke-width="1pt"' in html
+        assert '\x00' not in html
+
+    def test_geometry_used_once_stays_inline(self):
+        body = CUSTOM_SHAPE_XML + '<draw:rect svg:width="1cm" svg:height="1cm"/>' * 2
+        html = self.convert(body, svg_symbols=True)
+        assert html.count('<symbol ') == 1
+        assert '<symbol id="odt-symbol-1" viewBox="0 0 1 1" preserveAspectRatio="none" overflow="visible"><rect ' in html
+        assert html.count('<use href="#odt-symbol-1" x="2" y="2"') == 2
+        assert self.convert(CUSTOM_SHAPE_XML, svg_symbols=True) == self.convert(CUSTOM_SHAPE_XML)
+
+    def test_rect_and_ellipse_sizes_share_a_symbol(self):
+        body = ''.join(f'<draw:{shape} svg:width="{size}cm" svg:height="1cm"/>'
+                       for shape in ('rect', 'ellipse') for size in (1, 2))
+        html = self.convert(body, svg_symbols=True)
+        assert html.count('<symbol ') == 2
+        assert '<ellipse cx="0.5" cy="0.5" rx="0.5" ry="0.5"' in html
+        # each <use> places the unit geometry inside its own box
+        uses = re.findall(r'<use href="#(odt-symbol-\d)" x="2" y="2" width="([^"]+)" height="([^"]+)"/>', html)
+        assert len(uses) == 4 and len({symbol for symbol, _, _ in uses}) == 2
+        assert len({width for _, width, _ in uses}) == 2
+
+    def test_disabled_by_default(self):
+        assert '<symbol ' not in self.convert(CUSTOM_SHAPE_XML * 2)
+
+
+class TestConvertPath:
+    """Tests for the single pass enhanced path converter."""
+
+    def test_commands_references_and_formatting(self):
+        converter = OdtToHtmlConverter(make_config())
+        path = "M ?f0 0 L 10.505 $0 1e3 007 X 0 ?f0 C 1 2 3 4 5 6 7 8 9 10 11 12 Z F N U 10800 10800 ?f0 ?f0 0 90 S N"
+        assert converter._convert_path(path, {'f0': 1234.567, '$0': -0.001}) == [
+            {'d': 'M 1234.57 0 L 10.51 -0 L 1000 7 A 1000 1227.57 0 0 0 0 1234.57 '
+                  'C 1 2 3 4 5 6 C 7 8 9 10 11 12 Z', 'fill': False, 'stroke': True},
+            {'d': 'M 12034.57 10800 A 1234.57 1234.57 0 0 1 10800 12034.57', 'fill': True, 'stroke': False},
+        ]
+
+    def test_incomplete_coordinates_are_ignored(self):
+        converter = OdtToHtmlConverter(make_config())
+        assert converter._convert_path("M 0 0 L 1 2 3 Z N M 5", {}) == [
+            {'d': 'M 0 0 L 1 2 Z', 'fill': True, 'stroke': True},
+        ]
+
+
+class TestPathSimplification:
+    """Tests for the optional Ramer-Douglas-Peucker simplification of enhanced paths."""
+
+    def test_simplify_polyline(self):
+        assert simplify_polyline([0, 1, 2, 3, 4], [0, 0.1, 0, 5, 0], 0.5) == [0, 2, 3, 4]
+        assert simplify_polyline([0, 1, 2], [0, 1, 0], 0) == [0, 1, 2]
+        assert simplify_polyline([0, 5], [0, 5], 1) == [0, 1]
+        # closed loops measure the distance to the start point
+        assert simplify_polyline([0, 1, 10, 0], [0, 0, 0, 0], 2) == [0, 2, 3]
+
+    def test_numpy_scan_matches_python(self, monkeypatch):
+        pytest.importorskip('numpy')
+        rnd = random.Random(0)
+        xs = [rnd.uniform(0, 100) for _ in range(1000)]
+        ys = [rnd.uniform(0, 100) for _ in range(1000)]
+        expected = simplify_polyline(xs, ys, 3)
+        monkeypatch.setattr(odt_to_html, 'numpy', None)
+        assert simplify_polyline(xs, ys, 3) == expected
+
+    def test_convert_path(self):
+        path = "M 0 0 L 10 0.5 20 0 F L 30 0 30 10 Z N M 0 0 20 1 40 0 L 50 0 N"
+        converter = OdtToHtmlConverter(make_config(path_simplify_tolerance=1))
+        with converter.conversion_context() as context:
+            # runs are simplified separately, from the current point for L
+            assert converter._convert_path(path, {}) == [
+                {'d': 'M 0 0 L 20 0 L 30 0 L 30 10 Z', 'fill': False, 'stroke': True},
+                {'d': 'M 0 0 L 40 0 L 50 0', 'fill': True, 'stroke': True},
+            ]
+        assert context.path_simplify_stats == {'points': 7, 'removed_points': 2, 'removed_bytes': 16}
+        assert OdtToHtmlConverter(make_config())._convert_path(path, {})[0]['d'] == (
+            'M 0 0 L 10 0.5 L 20 0 L 30 0 L 30 10 Z')
+
+    def test_tolerance_is_part_of_the_shape_cache_key(self):
+        shape = CUSTOM_SHAPE_XML.replace('draw:type="rectangle"', 'draw:type="non-primitive"').replace(
+            'L 21600 0 21600 21600', 'L 10800 1 21600 0 21600 21600')
+        odt = make_odt(f'<text:p text:style-name="P1">{shape}</text:p>',
+                       '<style:style style:name="P1" style:family="paragraph"/>')
+        runtime = OdtToHtmlConverterRuntime()
+        html = OdtToHtmlConverter(make_config(), runtime).convert(odt, title=None)
+        assert 'L 10800 1 L 21600 0' in html
+        html = OdtToHtmlConverter(make_config(path_simplify_tolerance=10), runtime).convert(odt, title=None)
+        assert 'M 0 0 L 21600 0 L 21600 21600' in html
+
+    def test_stats_are_counted_on_shape_cache_hits(self):
+        shape = CUSTOM_SHAPE_XML.replace('draw:type="rectangle"', 'draw:type="non-primitive"').replace(
+            'L 21600 0 21600 21600', 'L 10800 1 21600 0 21600 21600')
+        odt = make_odt(f'<text:p text:style-name="P1">{shape}</text:p>',
+                       '<style:style style:name="P1" style:family="paragraph"/>')
+        converter = OdtToHtmlConverter(make_config(path_simplify_tolerance=10), OdtToHtmlConverterRuntime())
+        stats = []
+        for _ in range(2):
+            context = converter.Context()
+            converter.convert(odt, title=None, context=context)
+            stats.append(context.path_simplify_stats)
+        assert converter.runtime.cache_info()['shapes']['hits'] > 0
+        assert stats[0] == stats[1] and stats[0]['removed_points'] == 1
+
+
+class TestNumpySkyline:
+    """Tests for the optional NumPy backend of the float span layout."""
+
+    @staticmethod
+    def random_boxes(seed, count, grid):
+        import random
+        rnd = random.Random(seed)
+        return [
+            tuple(Length(value / 2, 'cm') for value in (
+                rnd.randint(-5, grid), rnd.randint(-5, grid), rnd.randint(0, grid // 2), rnd.randint(0, grid // 2)))
+            for _ in range(count)
+        ]
+
+    @staticmethod
+    def as_text(paths):
+        return [[f"{x} {y}" for x, y in path] for path in paths]
+
+    @pytest.mark.parametrize('seed', range(20))
+    def test_same_results_as_python(self, seed):
+        pytest.importorskip('numpy')
+        boxes = self.random_boxes(seed, 30, 6 if seed % 2 else 200)
+        upper, lower = odt_to_html.skyline_paths(boxes)
+        upper_numpy, lower_numpy = odt_to_html.skyline_paths_numpy(boxes)
+        assert self.as_text(upper_numpy) == self.as_text(upper)
+        assert self.as_text(lower_numpy) == self.as_text(lower)
+        intervals = [(y, y + h) for x, y, w, h in boxes]
+        merged, groups = odt_to_html.merge_intervals(list(intervals))
+        merged_numpy, groups_numpy = odt_to_html.merge_intervals_numpy(list(intervals))
+        assert (self.as_text([merged_numpy]), groups_numpy) == (self.as_text([merged]), groups)
+
+    def test_float_span_layout_uses_numpy_for_many_boxes(self, monkeypatch):
+        pytest.importorskip('numpy')
+        boxes = self.random_boxes(0, odt_to_html._NUMPY_MIN_BOXES, 200)
+        boxes = [(abs(x), abs(y), w, h) for x, y, w, h in boxes]
+        wrap_modes = ['left', 'right', 'none'] * (len(boxes) // 3) + ['left'] * (len(boxes) % 3)
+        html = OdtToHtmlConverter._generate_float_span(boxes, wrap_modes)
+        monkeypatch.setattr(odt_to_html, 'numpy', None)
+        assert OdtToHtmlConverter._generate_float_span(boxes, wrap_modes) == html
+
+
+class TestPresetShapes:
+    """Tests for the precomputed preset shape library, against the generic solver."""
+
+    SAMPLES = ('sample_shapes.odt', 'sample_test_drawing.odt', 'sample_anchor.odt', 'sample.odt')
+    MODIFIERS = (0, 1234.5678, 3600, 10800, 21600, -5.005)
+
+    def generic(self, converter, geometry):
+        path = geometry.get(f"{{{NAMESPACES['draw']}}}enhanced-path")
+        return converter._convert_path(path, converter._solve_equations(geometry))
+
+    def test_sample_shapes_match_generic_output(self):
+        converter = OdtToHtmlConverter(make_config())
+        matched = set()
+        for geometry in load_geometries(*self.SAMPLES):
+            subpaths = converter._get_preset_subpaths(geometry)
+            if subpaths is not None:
+                matched.add(geometry.get(f"{{{NAMESPACES['draw']}}}type"))
+                assert subpaths == self.generic(converter, geometry)
+        assert {'smiley', 'heart', 'flowchart-internal-storage', 'quad-arrow-callout',
+                'round-rectangle', 'right-arrow', 'left-arrow', 'ellipse', 'star5'} <= matched
+
+    def test_parameterized_presets_match_generic_output(self):
+        converter = OdtToHtmlConverter(make_config())
+        for geometry in load_geometries(*self.SAMPLES):
+            count = len(geometry.get(f"{{{NAMESPACES['draw']}}}modifiers", "").split())
+            if converter._get_preset_subpaths(geometry) is None or not count:
+                continue
+            for modifiers in itertools.product(self.MODIFIERS, repeat=min(count, 2)):
+                modifiers = (modifiers * count)[:count]
+                geometry.set(f"{{{NAMESPACES['draw']}}}modifiers", " ".join(map(str, modifiers)))
+                assert converter._get_preset_subpaths(geometry) == self.generic(converter, geometry)
+
+    @pytest.mark.parametrize('draw_type', ['rectangle', 'flowchart-process'])
+    def test_unsampled_presets_match_generic_output(self, draw_type):
+        geometry = ET.Element(f"{{{NAMESPACES['draw']}}}enhanced-geometry", {
+            f"{{{NAMESPACES['draw']}}}type": draw_type,
+            f"{{{NAMESPACES['draw']}}}enhanced-path": odt_to_html._PRESET_SHAPES[draw_type].enhanced_path,
+        })
+        converter = OdtToHtmlConverter(make_config())
+        assert converter._get_preset_subpaths(geometry) == self.generic(converter, geometry)
+
+    def test_edited_geometry_falls_back_to_generic_solver(self):
+        geometry = load_geometries('sample_test_drawing.odt')[0]
+        assert OdtToHtmlConverter._get_preset_subpaths(geometry) is not None
+        geometry.set(f"{{{NAMESPACES['draw']}}}modifiers", "3600 0")
+        assert OdtToHtmlConverter._get_preset_subpaths(geometry) is None
+        geometry.set(f"{{{NAMESPACES['draw']}}}modifiers", "3600")
+        geometry.set(f"{{{NAMESPACES['svg']}}}viewBox", "0 0 100 100")
+        assert OdtToHtmlConverter._get_preset_subpaths(geometry) is None
+
+    def test_edited_equations_fall_back_to_generic_solver(self):
+        geometry = next(geometry for geometry in load_geometries(*self.SAMPLES)
+                        if geometry.get(f"{{{NAMESPACES['draw']}}}type") == 'right-arrow')
+        assert OdtToHtmlConverter._get_preset_subpaths(geometry) is not None
+        equation = next(geometry.iter(f"{{{NAMESPACES['draw']}}}equation"))
+        equation.set(f"{{{NAMESPACES['draw']}}}formula", '$1 / 2')
+        assert OdtToHtmlConverter._get_preset_subpaths(geometry) is None
+        converter = OdtToHtmlConverter(make_config())
+        assert converter._get_custom_shape_subpaths(geometry, None)[1] == self.generic(converter, geometry)
@@ -0,0 +1,208 @@
+"""
+Tests for the style handling of the ODT to HTML converter.
+
+Run with: pytest test_odt_styles.py -v
+"""
+
+import io
+import pickle
+import zipfile
+import zlib
+
+import pytest
+
+from odt_to_html import (
+    LruCache,
+    OdtToHtmlConverter,
+    OdtToHtmlConverterRuntime,
+    TextDecoration,
+)
+from odt_test_helpers import DATA_DIR, make_config, make_odt
+
+
+class TestTextDecoration:
+    """Tests for the interned, immutable TextDecoration."""
+
+    def test_instances_are_interned(self):
+        assert TextDecoration() is TextDecoration()
+        assert TextDecoration(underline=True) is TextDecoration(None, True)
+
+    def test_immutable(self):
+        with pytest.raises(AttributeError):
+            TextDecoration().underline = True
+
+    def test_inherit_fills_unset_fields(self):
+        base = TextDecoration(line_through=True, underline=True)
+        child = TextDecoration(underline=False)
+        inherited = child.inherit(base)
+        assert inherited is TextDecoration(line_through=True, underline=False)
+        # the style's own decoration is left untouched
+        assert child.line_through is None
+
+    def test_wrap_and_nowrap(self):
+        decoration = TextDecoration(line_through=True, underline=True)
+        assert decoration.wrap('x') == '<span style="text-decoration:line-through underline">x</span>'
+        assert decoration.nowrap('<br>') == '</span><br><span style="text-decoration:line-through underline">'
+        assert TextDecoration(underline=False).wrap('x') == 'x'
+
+    def test_pickle_keeps_interning(self):
+        decoration = TextDecoration(line_through=True)
+        assert pickle.loads(pickle.dumps(decoration)) is decoration
+
+
+class TestStylesCache:
+    """Tests for the runtime cache of parsed styles.xml."""
+
+    def test_identical_styles_xml_is_parsed_once(self):
+        config = make_config()
+        runtime = OdtToHtmlConverterRuntime(config)
+        first = OdtToHtmlConverter(config, runtime).convert(DATA_DIR / 'sample_text_style.odt', title=None)
+        second = OdtToHtmlConverter(config, runtime).convert(DATA_DIR / 'sample_text_style.odt', title=None)
+        assert first == second
+        assert runtime.styles_cache.info()['hits'] == 1
+        assert runtime.styles_cache.info()['misses'] == 1
+
+    @staticmethod
+    def styles(color: str, comment: str = 'a' * 64) -> str:
+        return (f'<!--{comment}--><style:style style:name="P1" style:family="paragraph">'
+                f'<style:text-properties fo:color="{color}"/></style:style>')
+
+    @staticmethod
+    def forge_crc(data: bytes, target: int, positions: list[int]) -> bytes:
+        """Flip the lowest bit of some of the given bytes so that the CRC32 of data becomes target."""
+        base = zlib.crc32(data)
+        # CRC32 is affine, the CRC change of each flip is independent of the others: solve over GF(2)
+        rows = []
+        for position in positions:
+            flipped = bytearray(data)
+            flipped[position] ^= 1
+            rows.append((zlib.crc32(flipped) ^ base, 1 << len(rows)))
+        wanted, chosen = base ^ target, 0
+        for bit in range(32):
+            pivot = next((row for row in rows if row[0] >> bit & 1), None)
+            if pivot is None:
+                continue
+            rows.remove(pivot)
+            rows = [(v ^ pivot[0], m ^ pivot[1]) if v >> bit & 1 else (v, m) for v, m in rows]
+            if wanted >> bit & 1:
+                wanted, chosen = wanted ^ pivot[0], chosen ^ pivot[1]
+        assert wanted == 0
+        forged = bytearray(data)
+        for index, position in enumerate(positions):
+            if chosen >> index & 1:
+                forged[position] ^= 1
+        return bytes(forged)
+
+    def test_forged_crc_does_not_hit_another_documents_styles(self):
+        body = '<text:p text:style-name="P1">Hello</text:p>'
+        red = make_odt(body, styles=self.styles('#ff0000'))
+        with zipfile.ZipFile(io.BytesIO(red)) as odt:
+            target = odt.getinfo('styles.xml').CRC
+        with zipfile.ZipFile(io.BytesIO(make_odt(body, styles=self.styles('#0000ff')))) as odt:
+            blue_xml = odt.read('styles.xml')
+        start = blue_xml.index(b'<!--') + 4
+        forged = self.forge_crc(blue_xml, target, list(range(start, start + 64)))
+        blue = make_odt(body, styles=self.styles('#0000ff', forged[start:start + 64].decode('ascii')))
+        with zipfile.ZipFile(io.BytesIO(blue)) as odt:
+            assert (odt.getinfo('styles.xml').CRC, odt.getinfo('styles.xml').file_size) == (target, len(blue_xml))
+
+        config = make_config()
+        runtime = OdtToHtmlConverterRuntime(config)
+        assert 'color: #ff0000' in OdtToHtmlConverter(config, runtime).convert(red, title=None)
+        assert 'color: #0000ff' in OdtToHtmlConverter(config, runtime).convert(blue, title=None)
+
+    def test_cache_is_bounded(self):
+        cache = LruCache(maxsize=2)
+        for key in range(3):
+            cache.put(key, key)
+        assert len(cache) == 2
+        assert cache.get(0) is None
+        assert cache.get(2) == 2
+
+
+class TestStylePruning:
+    """Tests for skipping styles the body doesn't reference."""
+
+    STYLES = (
+        '<style:style style:name="Standard" style:family="paragraph">'
+        '<style:text-properties fo:font-size="12pt"/></style:style>'
+        '<style:style style:name="Unused" style:family="paragraph">'
+        '<style:text-properties fo:font-size="30pt"/></style:style>'
+    )
+    AUTOMATIC_STYLES = (
+        '<style:style style:name="P1" style:family="paragraph" style:parent-style-name="Standard">'
+        '<style:text-properties fo:color="#ff0000"/></style:style>'
+        '<style:style style:name="P2" style:family="paragraph">'
+        '<style:text-properties fo:color="#00ff00"/></style:style>'
+    )
+
+    def test_only_referenced_styles_and_ancestors_are_resolved(self):
+        odt = make_odt('<text:p text:style-name="P1">Hello</text:p>', self.AUTOMATIC_STYLES, self.STYLES)
+        context = OdtToHtmlConverter.Context()
+        html = OdtToHtmlConverter(make_config()).convert(odt, title=None, context=context)
+        assert set(context.styles) == {'P1', 'Standard'}
+        # inherited from the parent style in styles.xml
+        assert 'font-size: 12pt' in html
+        assert 'color: #ff0000' in html
+
+
+class TestCssInheritElimination:
+    """Tests for omitting inline CSS already inherited from the enclosing element."""
+
+    AUTOMATIC_STYLES = (
+        '<style:style style:name="P1" style:family="paragraph">'
+        '<style:text-properties fo:font-size="12pt" fo:color="#ff0000"/></style:style>'
+        '<style:style style:name="T1" style:family="text">'
+        '<style:text-properties fo:font-size="12pt" fo:font-weight="bold"/></style:style>'
+        '<style:style style:name="T2" style:family="text">'
+        '<style:text-properties style:text-position="sub 58%"/></style:style>'
+    )
+    BODY = (
+        '<text:p text:style-name="P1">'
+        '<text:span text:style-name="T1">bold</text:span>'
+        '<text:span text:style-name="T2">a<text:span text:style-name="T2">b</text:span></text:span>'
+        '</text:p>'
+    )
+
+    def convert(self, **kwargs) -> str:
+        odt = make_odt(self.BODY, self.AUTOMATIC_STYLES)
+        return OdtToHtmlConverter(make_config(**kwargs)).convert(odt, title=None)
+
+    def test_disabled_by_default(self):
+        assert '<span style="font-weight: bold; font-size: 12pt">' in self.convert()
+
+    def test_inherited_declarations_are_omitted(self):
+        html = self.convert(css_inherit_elimination=True)
+        assert '<p style="font-size: 12pt; color: #ff0000">' in html
+        assert '<span style="font-weight: bold">bold</span>' in html
+        # relative values compound, so they are kept on nested elements
+        assert html.count('font-size: 0.8em') == 2
+
+
+class TestFontStacks:
+    """Tests for font stacks resolved when styles are parsed."""
+
+    def test_font_stack_in_emitted_css(self):
+        odt = make_odt(
+            '<text:p text:style-name="P1">Hello</text:p>',
+            '<style:style style:name="P1" style:family="paragraph">'
+            '<style:text-properties style:font-name="Liberation Serif"/></style:style>',
+        )
+        context = OdtToHtmlConverter.Context()
+        html = OdtToHtmlConverter(make_config()).convert(odt, title=None, context=context)
+        assert "font-family: 'Liberation Serif', 'Times New Roman', 'Georgia', serif" in html
+        assert context.styles['P1']['font-family'] == OdtToHtmlConverter._FONT_STACK_MAP['Liberation Serif']
+
+    @pytest.mark.parametrize('generic,css', [('roman', 'serif'), ('swiss', 'sans-serif'), ('modern', 'monospace'),
+                                             ('script', 'cursive'), ('decorative', 'fantasy'), ('system', 'system-ui'),
+                                             ('unknown', None)])
+    def test_odf_generic_family_becomes_css_generic(self, generic, css):
+        odt = make_odt(
+            '<text:p text:style-name="P1">Hello</text:p>',
+            '<style:style style:name="P1" style:family="paragraph">'
+            '<style:text-properties style:font-name="Foo"/></style:style>',
+            f'<style:font-face style:name="Foo" svg:font-family="Foo" style:font-family-generic="{generic}"/>',
+        )
+        context = OdtToHtmlConverter.Context()
+        OdtToHtmlConverter(make_config()).convert(odt, title=None, context=context)
+        assert context.styles['P1']['font-family'] == (f"'Foo', {css}" if css else "'Foo'")